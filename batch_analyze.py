@@ -0,0 +1,45 @@
+"""
+EYE DISTANCE MONITOR - ANALISIS BATCH
+
+Menganalisis rekaman sesi (video atau direktori gambar) tanpa display
+untuk audit ergonomi. Hasil per frame ditulis ke CSV atau .npz.
+
+Contoh:
+    python batch_analyze.py sesi1.mp4 sesi2.mp4 frames_sesi3/ -o hasil.csv
+    python batch_analyze.py rekaman/*.mp4 -o hasil.npz --workers 4
+"""
+
+import argparse
+import sys
+
+from modules.batch_analyzer import run_batch
+
+
+def main():
+    """Entry point CLI analisis batch"""
+    parser = argparse.ArgumentParser(description="Analisis batch jarak mata dari rekaman")
+    parser.add_argument('inputs', nargs='+', help="File video atau direktori gambar")
+    parser.add_argument('-o', '--output', default='hasil_analisis.csv',
+                        help="File output (.csv atau .npz)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument('--focal-length', type=float, default=None,
+                        help="Focal length (pixel) jika kalibrasi sudah diketahui")
+    args = parser.parse_args()
+
+    print(f"Menganalisis {len(args.inputs)} sumber...")
+    try:
+        stats = run_batch(args.inputs, args.output, args.workers, args.focal_length)
+    except Exception as e:
+        print(f"Error analisis batch: {e}")
+        sys.exit(1)
+
+    print(f"\nSelesai: {stats['frames']} frame dalam {stats['elapsed']:.1f} s "
+          f"({stats['fps']:.1f} FPS total)")
+    for pid, fps in stats['workers'].items():
+        print(f"  Worker {pid}: {fps:.1f} FPS")
+    print(f"Hasil ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
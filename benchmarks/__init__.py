@@ -0,0 +1,4 @@
+"""
+Package initialization untuk benchmarks
+Jalankan dari root project, contoh: python -m benchmarks.running_modes
+"""
@@ -0,0 +1,94 @@
+"""
+Benchmark backend blur ImageProcessor.apply_blur
+
+Untuk setiap backend diukur:
+- biaya per megapixel (ms/MP, median dari beberapa pengulangan)
+- error visual terhadap Gaussian referensi (mean absolute error & PSNR)
+- sisa detail (energi Laplacian relatif terhadap gambar asli), makin kecil
+  makin tertutup layarnya
+
+Gambar uji memakai SyntheticScreenSource ditambah teks agar ada detail tajam.
+
+Contoh:
+    python -m benchmarks.blur_backends
+    python -m benchmarks.blur_backends --resolutions 1920x1080 3840x2160 --repeat 10
+"""
+
+import argparse
+import time
+import cv2
+import numpy as np
+
+from modules import ImageProcessor
+from utils.screen import SyntheticScreenSource
+from config import settings
+
+
+def make_test_image(width, height):
+    """Gambar layar sintetis dengan teks kecil (detail frekuensi tinggi)"""
+    image = SyntheticScreenSource(width, height).capture().copy()
+    for y in range(30, height, 30):
+        cv2.putText(image, 'Lorem ipsum dolor sit amet 0123456789', (10, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 1)
+    return image
+
+
+def detail_energy(image):
+    """Variansi Laplacian grayscale (ukuran ketajaman)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def measure(backend, image, repeat):
+    """
+    Returns:
+        Tuple: (median_ms, blurred_image)
+    """
+    blurred = ImageProcessor.apply_blur(image, backend)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        blurred = ImageProcessor.apply_blur(image, backend)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), blurred
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend blur")
+    parser.add_argument('--resolutions', nargs='+', default=['1280x720', '1920x1080', '2560x1440'])
+    parser.add_argument('--backends', nargs='+', default=list(ImageProcessor.BLUR_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Kernel: {settings.BLUR_KERNEL_SIZE}, batas error: {settings.BLUR_MAX_ERROR}\n")
+
+    for resolution in args.resolutions:
+        width, height = (int(v) for v in resolution.split('x'))
+        image = make_test_image(width, height)
+        megapixels = width * height / 1e6
+        original_detail = detail_energy(image)
+
+        _, reference = measure('gaussian', image, 1)
+
+        print(f"== {resolution} ({megapixels:.2f} MP) ==")
+        print(f"{'Backend':<10} {'ms':>8} {'ms/MP':>8} {'MAE':>7} {'PSNR':>7} {'detail':>8}  status")
+
+        candidates = []
+        for backend in args.backends:
+            ms, blurred = measure(backend, image, args.repeat)
+            mae = float(np.mean(cv2.absdiff(blurred, reference)))
+            psnr = cv2.PSNR(blurred, reference)
+            detail = detail_energy(blurred) / original_detail
+            ok = mae <= settings.BLUR_MAX_ERROR
+            if ok:
+                candidates.append((ms, backend))
+
+            print(f"{backend:<10} {ms:>8.2f} {ms / megapixels:>8.2f} {mae:>7.2f} "
+                  f"{psnr:>6.1f}dB {detail:>8.4f}  {'OK' if ok else 'ERROR > batas'}")
+
+        if candidates:
+            print(f"Backend tercepat dalam batas error: {min(candidates)[1]}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Benchmark latensi per tahap pipeline frame (tanpa kamera, tanpa display)
+
+Tahap yang diukur:
+    capture -> flip -> cvtcolor -> detect_face -> iris -> distance -> overlay [-> display]
+ditambah end-to-end per frame. Sumber frame: foto wajah (--image) yang digeser
+sedikit tiap frame pada beberapa resolusi, rekaman video berisi wajah (--video),
+atau frame sintetis tanpa wajah jika keduanya tidak diberikan (detect_face
+hanya mengukur jalur "tidak ada wajah"). Tahap iris, distance dan overlay
+hanya diukur pada frame dengan wajah terdeteksi. Tahap display (imshow +
+waitKey) hanya diukur dengan --display.
+
+Hasil dapat disimpan sebagai baseline JSON dan dibandingkan pada run berikutnya;
+tahap dengan p50 melebihi baseline lebih dari --tolerance, atau p95 lebih dari
+--p95-tolerance, ditandai REGRESI (exit code 1).
+
+Contoh:
+    python -m benchmarks.pipeline --image wajah.jpg --save-baseline benchmarks/baseline.json
+    python -m benchmarks.pipeline --image wajah.jpg --baseline benchmarks/baseline.json
+    python -m benchmarks.pipeline --video sesi.mp4 --frames 300
+"""
+
+import argparse
+import json
+import sys
+import time
+import cv2
+import numpy as np
+
+from modules import FaceDetector, DistanceCalculator, ImageProcessor
+from config import settings
+
+STAGES = ('capture', 'flip', 'cvtcolor', 'detect_face', 'iris', 'distance',
+          'overlay', 'display', 'end_to_end')
+
+
+class SyntheticCapture:
+    """Sumber frame sintetis: noise statis + kotak bergerak, disalin tiap read()"""
+
+    def __init__(self, width, height):
+        rng = np.random.default_rng(0)
+        self._base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        self._index = 0
+
+    def read(self):
+        frame = self._base.copy()
+        offset = (self._index * 7) % (frame.shape[1] // 2)
+        cv2.rectangle(frame, (offset, 40), (offset + 80, 120), (255, 255, 255), -1)
+        self._index += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+class ImageCapture:
+    """
+    Sumber frame dari foto wajah pada resolusi tertentu, digeser beberapa pixel
+    setiap frame (varian disiapkan di awal) agar tracker bekerja seperti pada kamera
+    """
+
+    SHIFTS = ((0, 0), (3, 1), (6, 2), (3, 3), (0, 2), (-3, 1), (-6, 0), (-3, -1))
+
+    def __init__(self, path, width, height):
+        image = cv2.imread(path)
+        if image is None:
+            raise RuntimeError(f"Gagal membaca gambar: {path}")
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        self._frames = [cv2.warpAffine(image, np.float32([[1, 0, dx], [0, 1, dy]]), (width, height),
+                                       borderMode=cv2.BORDER_REPLICATE)
+                        for dx, dy in self.SHIFTS]
+        self._index = 0
+
+    def read(self):
+        frame = self._frames[self._index % len(self._frames)].copy()
+        self._index += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+class VideoCapture:
+    """Sumber frame dari rekaman, diputar ulang dari awal jika habis"""
+
+    def __init__(self, path):
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Gagal membuka video: {path}")
+
+    def read(self):
+        success, frame = self._cap.read()
+        if not success:
+            self._cap.release()
+            self._cap = cv2.VideoCapture(self.path)
+            success, frame = self._cap.read()
+        return success, frame
+
+    def release(self):
+        self._cap.release()
+
+
+def summarize(samples_ms):
+    """
+    Returns:
+        Dict: p50/p95/p99 (ms) dan throughput (operasi per detik)
+    """
+    samples = np.asarray(samples_ms)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    mean = samples.mean()
+    return {
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'throughput': float(1000.0 / mean) if mean > 0 else float('inf'),
+    }
+
+
+def run_pipeline(capture, detector, num_frames, display=False):
+    """
+    Menjalankan pipeline dan mencatat latensi setiap tahap
+
+    Returns:
+        Tuple: (dict nama tahap -> ringkasan statistik, jumlah frame dengan wajah,
+                jumlah frame)
+    """
+    distance_calc = DistanceCalculator()
+    distance_calc.focal_length = 600.0
+    distance_calc.is_calibrated = True
+
+    timings = {stage: [] for stage in STAGES}
+    clock = time.perf_counter
+    detected = 0
+
+    for _ in range(num_frames):
+        frame_start = clock()
+
+        t = clock()
+        success, raw = capture.read()
+        timings['capture'].append((clock() - t) * 1000)
+        if not success:
+            break
+
+        t = clock()
+        frame = cv2.flip(raw, 1)
+        timings['flip'].append((clock() - t) * 1000)
+
+        t = clock()
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        timings['cvtcolor'].append((clock() - t) * 1000)
+
+        t = clock()
+        results = detector.detect_face(rgb_frame)
+        timings['detect_face'].append((clock() - t) * 1000)
+
+        if results is not None:
+            detected += 1
+            h, w = frame.shape[:2]
+
+            t = clock()
+            ipd, left_center, right_center = detector.get_iris_positions(results.landmarks[0], w, h)
+            timings['iris'].append((clock() - t) * 1000)
+
+            t = clock()
+            distance = distance_calc.calculate_distance(ipd)
+            is_safe = distance >= settings.DISTANCE_THRESHOLD
+            timings['distance'].append((clock() - t) * 1000)
+
+            t = clock()
+            frame = ImageProcessor.add_distance_info(frame, distance, is_safe)
+            frame = ImageProcessor.draw_iris_visualization(frame, left_center, right_center)
+            timings['overlay'].append((clock() - t) * 1000)
+
+        if display:
+            t = clock()
+            cv2.imshow('Benchmark', frame)
+            cv2.waitKey(1)
+            timings['display'].append((clock() - t) * 1000)
+
+        timings['end_to_end'].append((clock() - frame_start) * 1000)
+
+    stages = {stage: summarize(samples) for stage, samples in timings.items() if samples}
+    return stages, detected, len(timings['end_to_end'])
+
+
+def compare_with_baseline(report, baseline, tolerance, p95_tolerance):
+    """
+    Membandingkan p50 dan p95 setiap tahap dengan baseline
+
+    Returns:
+        List: (skenario, tahap, persentil, nilai_baseline, nilai_sekarang) untuk tahap yang regresi
+    """
+    regressions = []
+    for scenario, stages in report.items():
+        for stage, stats in stages.items():
+            reference = baseline.get(scenario, {}).get(stage)
+            if reference is None:
+                continue
+            for key, limit in (('p50', tolerance), ('p95', p95_tolerance)):
+                if key in reference and stats[key] > reference[key] * (1 + limit):
+                    regressions.append((scenario, stage, key, reference[key], stats[key]))
+    return regressions
+
+
+def print_report(scenario, stages, detected, frames):
+    print(f"== {scenario} == (wajah terdeteksi {detected}/{frames} frame)")
+    print(f"{'Tahap':<12} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>10}")
+    for stage in STAGES:
+        if stage in stages:
+            s = stages[stage]
+            print(f"{stage:<12} {s['p50']:>7.3f}ms {s['p95']:>7.3f}ms {s['p99']:>7.3f}ms "
+                  f"{s['throughput']:>10.1f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latensi per tahap pipeline frame")
+    parser.add_argument('--resolutions', nargs='+', default=['640x480', '1280x720', '1920x1080'])
+    parser.add_argument('--image', help="Foto wajah untuk skenario per resolusi "
+                                         "(tanpa ini: frame sintetis tanpa wajah)")
+    parser.add_argument('--video', nargs='*', default=[], help="Rekaman video tambahan (berisi wajah)")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--display', action='store_true', help="Ukur juga imshow + waitKey")
+    parser.add_argument('--save-baseline', help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument('--baseline', help="Bandingkan dengan baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Kenaikan p50 relatif yang dianggap regresi (default 0.15)")
+    parser.add_argument('--p95-tolerance', type=float, default=0.25,
+                        help="Kenaikan p95 relatif yang dianggap regresi (default 0.25)")
+    args = parser.parse_args()
+
+    scenarios = []
+    for resolution in args.resolutions:
+        width, height = (int(v) for v in resolution.split('x'))
+        if args.image:
+            scenarios.append((f"face-{resolution}",
+                              lambda w=width, h=height: ImageCapture(args.image, w, h)))
+        else:
+            scenarios.append((f"synthetic-{resolution}",
+                              lambda w=width, h=height: SyntheticCapture(w, h)))
+    if not args.image and not args.video:
+        print("Peringatan: tanpa --image / --video tidak ada wajah di frame, detect_face hanya "
+              "mengukur jalur tanpa wajah dan tahap iris/distance/overlay tidak terukur\n")
+    for path in args.video:
+        scenarios.append((f"video-{path}", lambda p=path: VideoCapture(p)))
+
+    report = {}
+    for name, make_capture in scenarios:
+        capture = make_capture()
+        detector = FaceDetector()
+        try:
+            run_pipeline(capture, detector, args.warmup)
+            report[name], detected, frames = run_pipeline(capture, detector, args.frames, args.display)
+        finally:
+            detector.close()
+            capture.release()
+        print_report(name, report[name], detected, frames)
+
+    if args.display:
+        cv2.destroyAllWindows()
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline disimpan ke {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance, args.p95_tolerance)
+        if regressions:
+            print("REGRESI terdeteksi:")
+            for scenario, stage, key, before, after in regressions:
+                print(f"  {scenario} / {stage} {key}: {before:.3f}ms -> {after:.3f}ms "
+                      f"(+{(after / before - 1) * 100:.0f}%)")
+            sys.exit(1)
+        print("Tidak ada regresi terhadap baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Perbandingan latensi FaceLandmarker: IMAGE vs VIDEO vs LIVE_STREAM
+
+Frame dibaca dulu ke memori (video file atau kamera) agar latensi capture
+tidak ikut terukur, lalu setiap mode dijalankan pada frame yang sama dengan
+pacing sesuai FPS kamera.
+
+Pada LIVE_STREAM latensi diukur dari submit hingga callback untuk frame yang
+sama, dan hanya frame yang benar-benar menghasilkan callback yang dihitung
+(frame yang di-skip MediaPipe karena graph masih sibuk tidak ikut dihitung).
+
+Contoh:
+    python -m benchmarks.running_modes --video sesi.mp4 --frames 300
+    python -m benchmarks.running_modes --camera 0 --frames 200
+"""
+
+import argparse
+import threading
+import time
+import cv2
+import numpy as np
+
+from modules import FaceDetector
+from config import settings
+
+
+def load_frames(source, num_frames):
+    """
+    Membaca frame RGB dari video file atau index kamera
+
+    Args:
+        source: Path video atau index kamera (int)
+        num_frames: Jumlah frame maksimal
+
+    Returns:
+        List frame RGB
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Gagal membuka sumber video: {source}")
+
+    frames = []
+    while len(frames) < num_frames:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def run_mode(mode, frames, fps):
+    """
+    Menjalankan satu running mode pada semua frame
+
+    Returns:
+        Dict: statistik latensi (ms), jumlah frame yang menghasilkan hasil
+              dan jumlah frame dengan wajah
+    """
+    detector = FaceDetector(running_mode=mode)
+    interval = 1.0 / fps if fps > 0 else 0.0
+    live_stream = detector.running_mode == 'LIVE_STREAM'
+    latencies = []
+    detected = 0
+    processed = 0
+    lock = threading.Lock()
+    all_results = threading.Event()
+
+    def on_result(results, timestamp_ms, latency_ms):
+        # Satu callback per frame yang diproses (timestamp = frame yang disubmit)
+        nonlocal detected, processed
+        with lock:
+            latencies.append(latency_ms)
+            processed += 1
+            if results is not None:
+                detected += 1
+            if processed >= len(frames):
+                all_results.set()
+
+    if live_stream:
+        detector.result_listener = on_result
+
+    try:
+        for rgb_frame in frames:
+            start = time.monotonic()
+            results = detector.detect_face(rgb_frame)
+            if not live_stream:
+                latencies.append(detector.last_latency_ms)
+                processed += 1
+                if results is not None:
+                    detected += 1
+
+            # Pacing sesuai FPS kamera agar mode LIVE_STREAM realistis
+            remaining = interval - (time.monotonic() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+        if live_stream:
+            # Tunggu callback frame terakhir yang masih diproses
+            all_results.wait(timeout=1.0)
+    finally:
+        detector.close()
+
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        'mean': latencies.mean(),
+        'p50': np.percentile(latencies, 50),
+        'p95': np.percentile(latencies, 95),
+        'processed': processed,
+        'detected': detected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perbandingan latensi running mode FaceLandmarker")
+    parser.add_argument('--video', help="Path file video (default: kamera)")
+    parser.add_argument('--camera', type=int, default=settings.CAMERA_INDEX)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fps', type=float, default=30.0, help="Pacing frame (0 = secepatnya)")
+    parser.add_argument('--modes', nargs='+', default=list(FaceDetector.RUNNING_MODES))
+    args = parser.parse_args()
+
+    frames = load_frames(args.video if args.video else args.camera, args.frames)
+    print(f"{len(frames)} frame dimuat\n")
+
+    print(f"{'Mode':<12} {'mean':>8} {'p50':>8} {'p95':>8} {'diproses':>10} {'wajah':>8}")
+    for mode in args.modes:
+        stats = run_mode(mode, frames, args.fps)
+        print(f"{mode:<12} {stats['mean']:>7.2f}ms {stats['p50']:>7.2f}ms "
+              f"{stats['p95']:>7.2f}ms {stats['processed']:>6}/{len(frames)} "
+              f"{stats['detected']:>5}/{stats['processed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,29 +6,172 @@ Memisahkan konfigurasi dari logic untuk maintainability
 # ========== KONSTANTA KALIBRASI  ==========
 KNOWN_DISTANCE = 60.0  # Jarak kalibrasi dalam cm
 KNOWN_WIDTH = 6.3      # Lebar rata-rata IPD manusia dalam cm
-CALIBRATION_FRAMES = 30  # Jumlah frame untuk kalibrasi focal length
+CALIBRATION_FRAMES = 30  # Jumlah frame maksimal untuk kalibrasi focal length
+CALIBRATION_MIN_FRAMES = 8         # Frame minimal sebelum kalibrasi boleh selesai lebih awal
+CALIBRATION_TOLERANCE = 0.01       # Setengah lebar interval kepercayaan relatif (1% = ~0.6 cm di 60 cm)
+CALIBRATION_CONFIDENCE_Z = 1.96    # Kuantil normal z (95% dua sisi), dikonversi ke kuantil Student-t n-1 lewat ekspansi Cornish-Fisher
+CALIBRATION_MIN_SECONDS = 0.4      # Rentang waktu minimal sampel sebelum boleh selesai lebih awal (~13 frame di 30 FPS)
+CALIBRATION_OUTLIER_K = 3.0        # Batas outlier dalam kelipatan sigma robust (MAD)
+CALIBRATION_CACHE_ENABLED = True                # Simpan/muat focal length dari disk
+CALIBRATION_CACHE_FILE = 'calibration_cache.json'
+DRIFT_CHECK_FRAMES = 10            # Frame awal untuk cek drift terhadap cache (0 = nonaktif)
+CALIBRATION_DRIFT_TOLERANCE = 0.3  # Deviasi relatif focal length yang dianggap drift
 
 # ========== THRESHOLD & WARNING ==========
 DISTANCE_THRESHOLD = 50.0  # Jarak minimum aman dalam cm
 
+# Hysteresis: blur aktif jika jarak < ENTER selama ENTER_DWELL,
+# nonaktif jika jarak > EXIT selama EXIT_DWELL
+BLUR_ENTER_THRESHOLD = DISTANCE_THRESHOLD
+BLUR_EXIT_THRESHOLD = DISTANCE_THRESHOLD + 3.0
+BLUR_ENTER_DWELL = 0.3     # Detik
+BLUR_EXIT_DWELL = 1.0      # Detik
+
+# ========== TEMPORAL FILTER (IPD) ==========
+DISTANCE_FILTER = 'one_euro'   # 'one_euro', 'kalman', atau None
+ONE_EURO_MIN_CUTOFF = 1.0      # Hz, makin kecil makin halus saat diam
+ONE_EURO_BETA = 0.01           # Respons terhadap kecepatan perubahan IPD (px/s)
+ONE_EURO_D_CUTOFF = 1.0        # Hz, cutoff turunan
+KALMAN_PROCESS_NOISE = 400.0   # Variansi percepatan IPD (px/s²)²
+KALMAN_MEASUREMENT_NOISE = 4.0 # Variansi pengukuran IPD (px²)
+
 # ========== MEDIAPIPE CONFIGURATION  ==========
-MAX_NUM_FACES = 1
+# Naikkan ke 2+ untuk meja bersama / pair programming; setiap wajah tambahan
+# membuat MediaPipe terus menjalankan face detection dan ROI sesekali mencari di frame penuh
+MAX_NUM_FACES = 1        # Jumlah wajah maksimal
 MIN_DETECTION_CONFIDENCE = 0.5
 MIN_TRACKING_CONFIDENCE = 0.5
 REFINE_LANDMARKS = True  # Aktifkan deteksi iris
+# Running mode FaceLandmarker: 'IMAGE' (deteksi penuh tiap frame),
+# 'VIDEO' (detect_for_video + tracking), 'LIVE_STREAM' (detect_async + callback)
+RUNNING_MODE = 'VIDEO'
+MODEL_WARMUP = True      # Inferensi dummy saat startup (di background thread)
+STARTUP_REPORT = True    # Tampilkan rincian waktu startup
+
+# ========== REGION OF INTEREST (ROI) ==========
+# Hanya berlaku pada RUNNING_MODE 'IMAGE': pada VIDEO / LIVE_STREAM tracker MediaPipe
+# sudah melewati face detection, dan crop yang berpindah merusak prior tracking-nya
+ROI_ENABLED = True      # Inferensi pada crop di sekitar wajah terakhir
+ROI_MARGIN = 0.5        # Perluasan bounding box (relatif terhadap ukuran wajah) per sisi
+ROI_MIN_SIZE = 64       # Ukuran minimal sisi bounding box wajah dalam pixel
+ROI_TARGET_SIZE = 256   # Sisi terpanjang crop setelah downscale (None = tanpa downscale)
+ROI_FULL_SEARCH_INTERVAL = 15  # Frame antar pencarian frame penuh jika wajah < MAX_NUM_FACES (> 1)
+
+# ========== MULTI-FACE TRACKING ==========
+TRACK_MAX_JUMP = 1.5    # Perpindahan maksimal antar frame (kelipatan IPD wajah)
+TRACK_TTL = 1.0         # Detik track dipertahankan tanpa deteksi
 
 # ========== LANDMARK INDICES  ==========
 LEFT_IRIS = [474, 475, 476, 477]
 RIGHT_IRIS = [469, 470, 471, 472]
 
+# ========== INFERENCE SCHEDULER ==========
+SCHEDULER_ENABLED = True
+SCHEDULER_MOTION_SIZE = (32, 24)        # Ukuran frame untuk sinyal gerakan (w, h)
+SCHEDULER_MOTION_THRESHOLD = 4.0        # Rata-rata selisih intensitas (0-255) dianggap bergerak
+SCHEDULER_SAFE_MARGIN = 10.0            # cm di atas threshold, di bawahnya selalu inferensi
+SCHEDULER_MIN_RECHECK_INTERVAL = 0.25   # Detik antar inferensi di batas margin aman
+SCHEDULER_MAX_RECHECK_INTERVAL = 1.0    # Detik antar inferensi saat jauh dari threshold
+
+# ========== PRESENCE GATE ==========
+PRESENCE_GATE_ENABLED = True
+PRESENCE_LOST_FRAMES = 5                  # Inferensi tanpa wajah berturut-turut sebelum gate ditutup
+PRESENCE_DOWNSCALE_WIDTH = 160            # Lebar frame untuk Haar cascade
+PRESENCE_MIN_FACE_SIZE = 20               # Ukuran wajah minimal (pixel, pada frame kecil)
+PRESENCE_MIN_INTERVAL = 0.2               # Interval pemeriksaan awal saat kursi kosong (detik)
+PRESENCE_MAX_INTERVAL = 2.0               # Interval maksimal setelah back-off
+PRESENCE_LANDMARKER_PROBE_INTERVAL = 5.0  # Landmarker tetap dicoba sesekali (wajah menyamping)
+
 # ========== CAMERA SETTINGS ==========
 CAMERA_INDEX = 0
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
+CAMERA_THREADED = True     # Capture di background thread (ring buffer, drop-oldest)
+CAMERA_BUFFER_SIZE = 3     # Jumlah slot ring buffer (minimal 3)
+CAMERA_READ_TIMEOUT = 1.0  # Detik menunggu frame baru sebelum memakai ulang frame terakhir
+
+# ========== CPU / FPS GOVERNOR ==========
+GOVERNOR_ENABLED = False         # Opt-in: level rendah menurunkan resolusi IPD (akurasi jarak)
+GOVERNOR_CPU_BUDGET = 0.50       # Pecahan satu core untuk seluruh proses (MediaPipe 640x480 ~30-50%)
+GOVERNOR_MIN_CAPTURE_WIDTH = 480 # Lebar capture minimal; level di bawahnya diabaikan (error kuantisasi IPD)
+GOVERNOR_TARGET_FPS = 15         # FPS loop deteksi minimal
+GOVERNOR_FPS_TOLERANCE = 0.9     # FPS < target × toleransi dianggap di bawah target
+GOVERNOR_HEADROOM = 0.6          # Naik level jika CPU < anggaran × headroom
+GOVERNOR_INTERVAL = 5.0          # Detik per jendela pengukuran
+GOVERNOR_COOLDOWN = 10.0         # Detik minimal antar perubahan level
+GOVERNOR_LOG_FILE = 'governor_audit.log'  # Audit perubahan (JSON per baris), None untuk nonaktif
+GOVERNOR_LEVELS = [              # Level 0 = kualitas tertinggi, batas bawah = level terakhir
+    {'resolution': (FRAME_WIDTH, FRAME_HEIGHT), 'roi_size': ROI_TARGET_SIZE,
+     'recheck': (SCHEDULER_MIN_RECHECK_INTERVAL, SCHEDULER_MAX_RECHECK_INTERVAL)},
+    {'resolution': (FRAME_WIDTH, FRAME_HEIGHT), 'roi_size': 192, 'recheck': (0.5, 2.0)},
+    {'resolution': (480, 360), 'roi_size': 160, 'recheck': (0.5, 2.0)},
+    {'resolution': (480, 360), 'roi_size': 128, 'recheck': (1.0, 3.0)},
+]
+
+# ========== PREPROCESSING SETTINGS ==========
+# 'frame': flip frame saat disalin dari ring buffer kamera
+# 'landmarks': frame tidak di-flip, koordinat x landmark dibalik (x -> 1 - x)
+#              dan preview membalik gambar hanya saat dirender
+MIRROR_STRATEGY = 'frame'
 
 # ========== VISUAL SETTINGS ==========
 BLUR_KERNEL_SIZE = (35, 35)  # Gaussian kernel size
+# Backend blur: 'gaussian' (exact), 'pyramid', 'box' (integral image), 'stack'
+BLUR_BACKEND = 'pyramid'
+BLUR_MAX_ERROR = 8.0         # Batas mean absolute error vs Gaussian referensi (benchmark)
 WARNING_COLOR = (0, 0, 255)  # BGR: Merah
 SAFE_COLOR = (0, 255, 0)     # BGR: Hijau
 IRIS_COLOR = (255, 0, 0)     # BGR: Biru
-LINE_COLOR = (255, 255, 0)   # BGR: Cyan
\ No newline at end of file
+LINE_COLOR = (255, 255, 0)   # BGR: Cyan
+
+# ========== SCREEN BLUR OVERLAY ==========
+SCREEN_SOURCE = 'pyautogui'   # 'pyautogui' atau 'synthetic' (headless)
+SCREEN_CAPTURE_FPS = 5        # Frekuensi capture layar saat blur aktif
+BLUR_PYRAMID_LEVELS = 2       # Jumlah pyrDown backend 'pyramid' (kernel diskalakan)
+SCREEN_CHANGE_THRESHOLD = 1.0 # Selisih rata-rata thumbnail untuk dianggap berubah
+
+# ========== BATCH ANALYSIS ==========
+BATCH_WORKERS = None        # Jumlah proses worker (None = jumlah CPU)
+BATCH_IMAGE_FPS = 30.0      # FPS untuk timestamp direktori gambar
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# ========== METRICS / INSTRUMENTATION ==========
+METRICS_ENABLED = True
+METRICS_FILE = 'metrics.json'    # File yang di-scrape agent lokal (None = tidak ditulis)
+METRICS_FORMAT = 'json'          # 'json' atau 'prometheus'
+METRICS_FLUSH_INTERVAL = 10.0    # Detik antar flush ke file
+METRICS_WINDOW = 60.0            # Jendela rolling persentil dalam detik
+SHOW_METRICS_OVERLAY = False     # Overlay FPS/latensi pada preview (toggle: 'm')
+
+# ========== DAEMON / PREVIEW ==========
+PREVIEW_FPS = 15.0            # Laju render jendela preview
+CONTROL_ENABLED = True        # Socket kontrol lokal pada mode daemon
+CONTROL_HOST = '127.0.0.1'
+CONTROL_PORT = 8765
+
+# ========== MULTI CAMERA ==========
+MULTI_CAMERA_QUEUE_SIZE = 64        # Maksimal status antrian worker -> supervisor
+MULTI_CAMERA_REPORT_INTERVAL = 1.0  # Detik antar baris status agregat
+
+# ========== EVENT LOG ==========
+EVENT_LOG_ENABLED = True
+EVENT_LOG_FILE = 'session_events.bin'     # Record biner tetap, dibaca dengan read_event_log()
+EVENT_LOG_BUFFER_RECORDS = 1024           # Record di memori sebelum flush paksa
+EVENT_LOG_FLUSH_INTERVAL = 5.0            # Detik antar flush ke file
+EVENT_LOG_MAX_BYTES = 16 * 1024 * 1024    # Ukuran file sebelum dirotasi
+EVENT_LOG_BACKUP_COUNT = 3                # Jumlah file rotasi yang disimpan
+
+# ========== DISTANCE HISTORY ==========
+HISTORY_ENABLED = True
+HISTORY_FILE = 'distance_history.dat'        # File memory-mapped (ukuran tetap)
+HISTORY_RAW_CAPACITY = 8 * 3600 * 30         # Sampel mentah (~8 jam pada 30 FPS, ~21 MB)
+HISTORY_AGGREGATE_CAPACITIES = (             # Jumlah bucket per resolusi
+    2 * 86400,   # per detik: 2 hari
+    31 * 1440,   # per menit: 31 hari
+    366 * 24,    # per jam: 1 tahun
+)
+HISTORY_MAX_SAMPLE_GAP = 1.0                 # Durasi maksimal satu sampel (detik), celah lebih lama tidak dihitung
+HISTORY_FLUSH_INTERVAL = 30.0                # Detik antar msync ke disk
+
+# ========== ASYNC PIPELINE ==========
+ASYNC_QUEUE_SIZE = 2  # Kapasitas antrian antar tahap (kecil agar latensi tetap rendah)
\ No newline at end of file
@@ -8,14 +8,23 @@ Materi yang diimplementasikan:
 
 """
 
-import numpy as np
-import pyautogui
+import argparse
+import asyncio
+import json
+import time
 import cv2
 import sys
 
-# Import modul-modul yang sudah dibuat
-from modules import FaceDetector, DistanceCalculator, ImageProcessor
-from utils import Camera
+# Import modul-modul yang sudah dibuat (MediaPipe & pyautogui di-load lazy)
+from modules import (FaceDetector, DistanceCalculator, InferenceScheduler, BlurOverlay,
+                     MultiCameraSupervisor, AsyncPipeline, PresenceGate, BudgetGovernor,
+                     MonitorStateMachine, BlurCompositor)
+from modules.async_pipeline import AlertSink, MetricsSink, PreviewSink, MonitorSink, RecorderSink
+from utils import (Camera, Metrics, ControlChannel, CalibrationStore, FramePreprocessor, EventLog,
+                   DistanceHistory)
+from utils.event_log import status_fields
+from utils.preview import PreviewSubscriber
+from utils.startup import StartupProfiler, BackgroundLoader
 from config import settings
 
 def print_instructions():
@@ -25,176 +34,425 @@ def print_instructions():
     print("=" * 60)
     print("\nINSTRUKSI:")
     print("1. Posisikan wajah pada jarak ~60 cm untuk kalibrasi")
-    print("2. Tunggu hingga kalibrasi selesai (30 frame)")
+    print(f"2. Tunggu hingga kalibrasi selesai (maksimal {settings.CALIBRATION_FRAMES} frame)")
     print("3. Jika jarak < 50 cm, layar akan blur (WARNING!)")
-    print("4. Tekan 'q' untuk keluar dari program")
+    print("4. Tekan 'c' untuk kalibrasi ulang (hasil kalibrasi disimpan ke cache)")
+    print("5. Tekan 'm' untuk menampilkan/menyembunyikan overlay FPS & latensi")
+    print("6. Tekan 'q' untuk keluar dari program")
     print("=" * 60)
     print("\nMemulai program...\n")
-    
-def apply_fullscreen_blur(camera, face_detector, distance_calc, img_processor):
-    """
-    Menerapkan blur fullscreen hingga jarak mata aman lagi
-    """
-    print("Aktivasi blur seluruh layar karena jarak terlalu dekat!")
-
-    # Buat window fullscreen
-    cv2.namedWindow('Fullscreen Blur', cv2.WND_PROP_FULLSCREEN)
-    cv2.setWindowProperty('Fullscreen Blur', cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
-
-    try:
-        while camera.is_opened():
-            # Ambil screenshot seluruh layar
-            screenshot = pyautogui.screenshot()
-
-            # Konversi ke array numpy
-            screenshot = np.array(screenshot)
-
-            # Konversi dari RGB ke BGR
-            screenshot = cv2.cvtColor(screenshot, cv2.COLOR_RGB2BGR)
 
-            # Terapkan Gaussian Blur
-            blurred_screenshot = cv2.GaussianBlur(screenshot, settings.BLUR_KERNEL_SIZE, 0)
 
-            # Tampilkan gambar yang di-blur
-            cv2.imshow('Fullscreen Blur', blurred_screenshot)
+def parse_args(argv=None):
+    """Argumen command line aplikasi"""
+    parser = argparse.ArgumentParser(description="Monitor jarak mata ke layar")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Jalankan di background tanpa preview, kontrol lewat signal/socket")
+    parser.add_argument('--recalibrate', action='store_true',
+                        help="Abaikan cache kalibrasi dan kalibrasi ulang kamera ini")
+    parser.add_argument('--clear-calibration', action='store_true',
+                        help="Hapus seluruh cache kalibrasi sebelum mulai")
+    parser.add_argument('--cameras', type=int, nargs='+', metavar='INDEX',
+                        help="Monitor beberapa kamera sekaligus (satu proses per kamera)")
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help="Jalankan pipeline asyncio (capture, inferensi, evaluasi, sink terpisah)")
+    return parser.parse_args(argv)
 
-            # Baca frame dari kamera untuk periksa jarak
-            success, frame = camera.read_frame()
-            if not success:
-                break
 
-            # Konversi BGR ke RGB untuk MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, _ = frame.shape
-
-            # Deteksi wajah
-            results = face_detector.detect_face(rgb_frame)
-
-            if results and results.multi_face_landmarks:
-                face_landmarks = results.multi_face_landmarks[0]
-                iris_distance_px, _, _ = face_detector.get_iris_positions(face_landmarks.landmark, w, h)
-
-                if distance_calc.is_calibrated:
-                    distance = distance_calc.calculate_distance(iris_distance_px)
-                    is_safe = distance >= settings.DISTANCE_THRESHOLD
-
-                    if is_safe:
-                        print("Jarak aman, menonaktifkan blur layar.")
-                        break
-
-            # Cek key press untuk exit manual
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                print("Exit manual dari blur layar.")
+def run_multi_camera(args):
+    """
+    Mode multi-kamera: satu proses worker per kamera, status diagregasi
+    menjadi satu stream (JSON per baris di stdout)
+    """
+    if args.clear_calibration:
+        CalibrationStore().invalidate()
+    
+    supervisor = MultiCameraSupervisor(args.cameras)
+    supervisor.start()
+    print(f"Monitoring {len(args.cameras)} kamera: {args.cameras}")
+    
+    show_preview = not args.daemon
+    tile_buffers = {}
+    last_report = 0.0
+    
+    try:
+        while True:
+            status = supervisor.poll_status()
+            if status['alive'] == 0:
+                print("Semua worker kamera berhenti")
                 break
+            
+            now = time.monotonic()
+            if now - last_report >= settings.MULTI_CAMERA_REPORT_INTERVAL:
+                last_report = now
+                print(json.dumps(status))
+            
+            if show_preview:
+                # Frame dibaca dari shared memory ke buffer yang dipakai ulang
+                tiles = []
+                for index in args.cameras:
+                    frame = supervisor.latest_frame(index, tile_buffers.get(index))
+                    if frame is not None:
+                        tile_buffers[index] = frame
+                        tiles.append(frame)
+                if tiles:
+                    cv2.imshow('Monitor Jarak Mata - Multi Kamera', cv2.hconcat(tiles))
+                if cv2.waitKey(int(1000 / settings.PREVIEW_FPS)) & 0xFF == ord('q'):
+                    break
+            else:
+                time.sleep(1.0 / settings.PREVIEW_FPS)
+    
+    except KeyboardInterrupt:
+        print("\nProgram dihentikan (Ctrl+C)")
+    
+    finally:
+        print("\nMenghentikan worker kamera...")
+        supervisor.stop()
+        cv2.destroyAllWindows()
 
-    except Exception as e:
-        print(f"Error dalam fullscreen blur: {e}")
 
+def run_async(args, camera, face_detector, distance_calc, scheduler, presence_gate,
+              monitor, blur_compositor, metrics, event_log, history, control, on_calibrated):
+    """
+    Mode asyncio: capture, inferensi, evaluasi jarak dan sink sebagai task terpisah
+    (lihat modules/async_pipeline.py). Kamera dan detector ditutup oleh pipeline
+    """
+    # Frame diantrikan antar task, jadi tidak memakai buffer FramePreprocessor
+    camera.mirror = True
+    
+    pipeline = AsyncPipeline(camera, face_detector, distance_calc, scheduler, metrics,
+                             control=control, on_calibrated=on_calibrated,
+                             presence_gate=presence_gate)
+    pipeline.add_sink(AlertSink())
+    pipeline.add_sink(MetricsSink(metrics))
+    pipeline.add_sink(RecorderSink(event_log))
+    pipeline.add_sink(RecorderSink(history))
+    pipeline.add_sink(MonitorSink(monitor, blur_compositor))
+    if not args.daemon:
+        pipeline.add_sink(PreviewSink(PreviewSubscriber(), pipeline))
+    
+    try:
+        asyncio.run(pipeline.run())
+    except KeyboardInterrupt:
+        print("\nProgram dihentikan (Ctrl+C)")
     finally:
-        # Tutup window blur
-        cv2.destroyWindow('Fullscreen Blur')
-        print("Blur layar dinonaktifkan.")
+        blur_compositor.close()
+        cv2.destroyAllWindows()
+        print("Program selesai. Terima kasih!\n")
 
 
-def main():
+def main(argv=None):
     """Fungsi utama aplikasi"""
+    profiler = StartupProfiler()
+    args = parse_args(argv)
+    
+    if args.cameras:
+        run_multi_camera(args)
+        return
     
     # Tampilkan instruksi
     print_instructions()
     
     # ========== INISIALISASI MODUL-MODUL ==========
+    def build_detector():
+        # Load model + inferensi warm-up di background (MATERI 7)
+        with profiler.phase('load model (background)'):
+            detector = FaceDetector()
+        if settings.MODEL_WARMUP:
+            with profiler.phase('warm-up inferensi (background)'):
+                detector.warmup()
+        return detector
+    
+    detector_loader = BackgroundLoader(build_detector, name='ModelLoader')
+    
     try:
-        # Inisialisasi kamera
-        camera = Camera()
+        # Inisialisasi kamera (paralel dengan load model)
+        with profiler.phase('buka kamera'):
+            camera = Camera()
+        
+        # Buffer frame BGR/RGB dipakai ulang, mirror sesuai MIRROR_STRATEGY
+        preprocessor = FramePreprocessor(camera)
         
         # Inisialisasi detector wajah (MATERI 7)
-        face_detector = FaceDetector()
+        with profiler.phase('menunggu model'):
+            face_detector = detector_loader.result()
         
         # Inisialisasi calculator jarak (MATERI 10)
         distance_calc = DistanceCalculator()
         
-        # Image processor untuk filtering (MATERI 2)
-        img_processor = ImageProcessor()
+        # Scheduler untuk melewati inferensi redundan
+        scheduler = InferenceScheduler()
+        
+        # Instrumentasi FPS / latensi per tahap
+        metrics = Metrics()
+        
+        # Pemeriksaan kehadiran murah (Haar) saat kursi kosong
+        presence_gate = PresenceGate()
+        
+        # State machine monitor (calibrating / safe / too_close / no_face / paused);
+        # blur layar di thread compositor sendiri, mengikuti perubahan state
+        monitor = MonitorStateMachine()
+        blur_compositor = BlurCompositor(BlurOverlay(), metrics)
+        monitor.add_listener(blur_compositor.on_state_change)
+        
+        # Governor anggaran CPU/FPS (resolusi, crop ROI, interval re-check);
+        # CPU compositor blur tidak dihitung dan level ditahan selama blur aktif
+        governor = BudgetGovernor(camera, face_detector, scheduler, distance_calc, metrics=metrics,
+                                  blur_compositor=blur_compositor)
+        
+        # Log sampel jarak & transisi state (biner, dirotasi per ukuran)
+        event_log = EventLog()
+        
+        # Riwayat jarak jangka panjang (memory-mapped, rollup detik/menit/jam)
+        history = DistanceHistory()
+        
+        # Cache kalibrasi per kamera / device / resolusi
+        calibration_store = CalibrationStore()
+        if args.clear_calibration:
+            calibration_store.invalidate()
+        frame_w, frame_h = camera.get_frame_dimensions()
+        calibration_key = CalibrationStore.make_key(
+            camera.camera_index, camera.get_device_id(), frame_w, frame_h
+        )
+        cached = None
+        if settings.CALIBRATION_CACHE_ENABLED and not args.recalibrate:
+            cached = calibration_store.load(calibration_key)
+        if cached is not None:
+            distance_calc.load_calibration(cached['focal_length'])
+            print(f"Kalibrasi dimuat dari cache (focal length {cached['focal_length']:.2f} pixel)")
         
         print("Semua modul berhasil diinisialisasi!")
+        profiler.mark('siap (inisialisasi selesai)')
+        if settings.STARTUP_REPORT:
+            profiler.report()
         print("Kamera aktif. Mulai deteksi...\n")
         
     except Exception as e:
         print(f"Error saat inisialisasi: {e}")
         sys.exit(1)
     
+    # Kanal kontrol (signal + socket lokal) untuk mode daemon
+    control = None
+    if args.daemon:
+        try:
+            control = ControlChannel(listen=settings.CONTROL_ENABLED)
+            control.install_signal_handlers()
+            print(f"Mode daemon aktif. Kontrol: {control.host}:{control.port}")
+        except OSError as e:
+            print(f"Error membuka socket kontrol: {e}")
+            control = ControlChannel(listen=False)
+            control.install_signal_handlers()
+    
+    def on_calibrated(focal_length):
+        if settings.CALIBRATION_CACHE_ENABLED:
+            # Cache disimpan untuk resolusi awal (governor bisa mengubah resolusi)
+            if governor.frame_width:
+                focal_length *= frame_w / governor.frame_width
+            calibration_store.save(calibration_key, focal_length)
+    
+    if args.async_mode:
+        run_async(args, camera, face_detector, distance_calc, scheduler, presence_gate,
+                  monitor, blur_compositor, metrics, event_log, history, control, on_calibrated)
+        return
+    
+    # Preview hanya sebagai subscriber opsional (tidak ada di mode daemon)
+    preview = None if args.daemon else PreviewSubscriber(mirror=preprocessor.display_mirrored)
+    
+    # Hasil pengukuran terakhir, dipakai ulang saat inferensi dilewati
+    measurement = None
+    last_distance = None
+    paused = False
+    running = True
+    
     try:
-        while camera.is_opened():
+        while running and camera.is_opened():
+            loop_start = time.perf_counter()
+            
+            # ========== PERINTAH KONTROL ==========
+            if control is not None:
+                for command in control.poll():
+                    if command == 'stop':
+                        print("\nProgram dihentikan lewat kontrol")
+                        running = False
+                    elif command == 'recalibrate':
+                        distance_calc.recalibrate()
+                        last_distance = None
+                        scheduler.reset()
+                    elif command in ('pause', 'resume'):
+                        paused = command == 'pause'
+                        scheduler.reset()
+                        presence_gate.reset()
+                    elif command.startswith('preview'):
+                        show = (preview is None) if command == 'preview toggle' else command == 'preview on'
+                        if show and preview is None:
+                            preview = PreviewSubscriber(mirror=preprocessor.display_mirrored)
+                        elif not show and preview is not None:
+                            preview.close()
+                            preview = None
+                if not running:
+                    break
+            
             # Baca frame dari webcam
-            success, frame = camera.read_frame()
+            with metrics.timer('capture'):
+                success, frame = preprocessor.read()
             
             if not success:
                 print("Gagal membaca frame dari kamera")
                 break
             
-            # Konversi BGR ke RGB untuk MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Resolusi bisa diubah governor: sesuaikan kalibrasi & ROI
+            governor.observe_frame(frame)
             
             # Dimensi frame
             h, w, _ = frame.shape
+            status = {'state': 'paused', 'fps': metrics.fps,
+                      'latency_ms': metrics.latency('detect_face')}
             
             # ========== FACE DETECTION ==========
-            results = face_detector.detect_face(rgb_frame)
+            # fresh: measurement berasal dari inferensi frame ini (bukan hasil lama)
+            fresh = False
+            if paused:
+                measurement = None
+            elif not presence_gate.should_run(frame):
+                # Kursi kosong: landmarker tidak dijalankan
+                measurement = None
+                metrics.count('presence_skipped_total')
+            elif scheduler.should_run(frame, last_distance):
+                # Konversi BGR ke RGB untuk MediaPipe
+                with metrics.timer('cvtcolor'):
+                    rgb_frame = preprocessor.to_rgb(frame)
+                with metrics.timer('detect_face'):
+                    results = preprocessor.fix_landmarks(face_detector.detect_face(rgb_frame))
 
-            if results and results.multi_face_landmarks:
-                # Ambil landmark wajah pertama
-                face_landmarks = results.multi_face_landmarks[0]
-                
-                # Ekstraksi posisi iris 
-                iris_distance_px, left_center, right_center = \
-                    face_detector.get_iris_positions(face_landmarks.landmark, w, h)
+                if not face_detector.result_is_new:
+                    # LIVE_STREAM: belum ada hasil baru, pakai measurement sebelumnya
+                    metrics.count('inference_pending_total')
+                elif results is not None:
+                    # Ekstraksi posisi iris semua wajah sekaligus (vectorized)
+                    measurement = results.iris_positions(w, h)
+                    fresh = True
+                    presence_gate.face_seen()
+                else:
+                    measurement = None
+                    presence_gate.face_lost()
+                    last_distance = None
+                    distance_calc.reset_filter()
+                    metrics.count('face_lost_total')
+            else:
+                metrics.count('inference_skipped_total')
+
+            if measurement is not None:
+                iris_distances_px, left_centers, right_centers = measurement
+                if 'pengukuran pertama' not in profiler.milestones:
+                    profiler.mark('pengukuran pertama')
+                    if settings.STARTUP_REPORT:
+                        print(f"Waktu hingga pengukuran pertama: "
+                              f"{profiler.milestones['pengukuran pertama'] * 1000:.0f} ms")
                 
                 if not distance_calc.is_calibrated:
-                    # Kalibrasi focal length
-                    distance_calc.calibrate(iris_distance_px)
+                    # Kalibrasi focal length dengan wajah terdekat (IPD terbesar)
+                    # Frame yang dilewati scheduler tidak dihitung ulang sebagai sampel
+                    status['ipd'] = float(iris_distances_px.max())
+                    done = fresh and distance_calc.calibrate(status['ipd'])
                     
-                    # Tampilkan progress kalibrasi
+                    # Progress kalibrasi (bisa selesai sebelum frame maksimal)
                     current, total, percentage = distance_calc.get_calibration_progress()
-                    cv2.putText(frame, f'Kalibrasi: {current}/{total} ({percentage:.0f}%)',
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 
-                               (255, 255, 0), 2)
+                    status['state'] = 'calibrating'
+                    status['calibration'] = (current, total, percentage)
                     
-                    if current == total:
-                        print(f"Kalibrasi selesai!")
-                        print(f"   Focal Length: {distance_calc.focal_length:.2f} pixel\n")
+                    if done:
+                        print(f"Kalibrasi selesai dalam {current} frame!")
+                        print(f"   Focal Length: {distance_calc.focal_length:.2f} pixel "
+                              f"(±{distance_calc.calibration_precision * 100:.1f}%, "
+                              f"{distance_calc.calibration_outliers} outlier dibuang)\n")
+                        on_calibrated(distance_calc.focal_length)
                 
                 # ========== ESTIMASI JARAK ==========
                 else:
-                    distance = distance_calc.calculate_distance(iris_distance_px)
-                    
-                    # Cek apakah jarak aman
-                    is_safe = distance >= settings.DISTANCE_THRESHOLD
-                    
-                    if not is_safe:
-                        # Aktivasi blur seluruh layar
-                        apply_fullscreen_blur(camera, face_detector, distance_calc, img_processor)
-                        # Setelah blur selesai, lanjutkan loop
-                    
-                    # Tambahkan informasi jarak ke frame
-                    frame = img_processor.add_distance_info(frame, distance, is_safe)
-                    
-                    # Visualisasi posisi iris
-                    frame = img_processor.draw_iris_visualization(
-                        frame, left_center, right_center
+                    # Jarak per wajah dari IPD tersaring + hysteresis per wajah
+                    # (too_close menjadi state TOO_CLOSE, blur diurus compositor)
+                    face_distances, too_close, tracks = distance_calc.update_faces(
+                        iris_distances_px, (left_centers + right_centers) / 2
                     )
+                    if face_distances is None:
+                        # Drift terhadap focal length cache, kalibrasi ulang mulai frame berikutnya
+                        print("Focal length cache tidak cocok (drift), kalibrasi ulang...")
+                        last_distance = None
+                        status.update(state='calibrating', ipd=float(iris_distances_px.max()),
+                                      calibration=distance_calc.get_calibration_progress())
+                    else:
+                        # Wajah terdekat menentukan jarak yang dilaporkan dan scheduling
+                        nearest = int(face_distances.argmin())
+                        distance = float(face_distances[nearest])
+                        last_distance = distance
+                        status.update(state='measuring', distance=distance, is_safe=not too_close,
+                                      ipd=float(iris_distances_px[nearest]),
+                                      left_centers=left_centers, right_centers=right_centers,
+                                      face_distances=face_distances,
+                                      track_ids=[t.track_id for t in tracks])
             
-            else:
-                # Feedback jika wajah tidak terdeteksi
-                cv2.putText(frame, 'Wajah tidak terdeteksi', (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            elif not paused:
+                status['state'] = 'no_face'
             
-            # Tampilkan frame hasil processing
-            cv2.imshow('Monitor Jarak Mata - Informatika', frame)
+            # ========== STATE MONITOR ==========
+            # Transisi diteruskan ke listener (compositor blur), loop tidak pernah tertahan
+            monitor.update(status_fields(status)[0])
             
-            # Break loop jika 'q' ditekan
-            if cv2.waitKey(5) & 0xFF == ord('q'):
-                print("\nProgram dihentikan oleh user")
-                break
+            metrics.tick_frame()
+            metrics.maybe_flush()
+            event_log.record_status(status)
+            event_log.maybe_flush()
+            history.record_status(status)
+            history.maybe_flush()
+            
+            if control is not None:
+                control.update_status({
+                    'state': status['state'],
+                    'monitor_state': monitor.state,
+                    'distance_cm': float(status['distance']) if 'distance' in status else None,
+                    'is_safe': status.get('is_safe'),
+                    'faces': len(status.get('track_ids', ())),
+                    'calibrated': distance_calc.is_calibrated,
+                    'fps': round(metrics.fps, 2),
+                    'preview': preview is not None,
+                })
+            
+            # ========== PREVIEW (OPSIONAL) ==========
+            if preview is not None:
+                preview.publish(frame, status)
+                with metrics.timer('display'):
+                    key = preview.render_if_due()
+                
+                # Break loop jika 'q' ditekan
+                if key == ord('q'):
+                    print("\nProgram dihentikan oleh user")
+                    break
+                if key == ord('c'):
+                    print("Kalibrasi ulang...")
+                    distance_calc.recalibrate()
+                    last_distance = None
+                    scheduler.reset()
+            
+            # ========== BLUR LAYAR ==========
+            # Hanya menampilkan frame terbaru dari thread compositor (murah)
+            blur_compositor.present()
+            
+            loop_seconds = time.perf_counter() - loop_start
+            
+            # Kursi kosong: capture di-pause dan tidur hingga pemeriksaan
+            # kehadiran berikutnya (CPU idle), lalu capture dilanjutkan untuk pemeriksaan itu
+            idle = presence_gate.idle_delay()
+            if idle > 0:
+                if preview is not None:
+                    idle = min(idle, preview.interval)
+                if blur_compositor.active:
+                    idle = min(idle, blur_compositor.blur_overlay.capture_interval)
+                camera.pause()
+                time.sleep(idle)
+                camera.resume()
+            
+            # Evaluasi anggaran CPU/FPS (per GOVERNOR_INTERVAL)
+            governor.tick(loop_seconds, idle)
     
     except KeyboardInterrupt:
         print("\nProgram dihentikan (Ctrl+C)")
@@ -205,8 +463,15 @@ def main():
     finally:
         # ========== CLEANUP ==========
         print("\nMembersihkan resources...")
+        metrics.gauge('camera_dropped_frames', camera.dropped_frames)
+        metrics.flush()
+        blur_compositor.close()
+        event_log.close()
+        history.close()
         camera.release()
         face_detector.close()
+        if control is not None:
+            control.close()
         cv2.destroyAllWindows()
         print("Program selesai. Terima kasih!\n")
 
@@ -1,8 +1,21 @@
 """
 Package initialization untuk modules
 """
-from .face_detector import FaceDetector
+from .face_detector import FaceDetector, FaceLandmarksResult
 from .distance_calculator import DistanceCalculator
 from .image_processor import ImageProcessor
+from .inference_scheduler import InferenceScheduler
+from .blur_overlay import BlurOverlay
+from .filters import OneEuroFilter, ConstantVelocityKalman, HysteresisGate
+from .face_tracker import FaceTracker
+from .multi_camera import MultiCameraSupervisor
+from .async_pipeline import AsyncPipeline
+from .presence_gate import PresenceGate
+from .governor import BudgetGovernor
+from .monitor import MonitorStateMachine
+from .blur_compositor import BlurCompositor
 
-__all__ = ['FaceDetector', 'DistanceCalculator', 'ImageProcessor']
\ No newline at end of file
+__all__ = ['FaceDetector', 'FaceLandmarksResult', 'DistanceCalculator', 'ImageProcessor',
+           'InferenceScheduler', 'BlurOverlay', 'OneEuroFilter', 'ConstantVelocityKalman',
+           'HysteresisGate', 'FaceTracker', 'MultiCameraSupervisor', 'AsyncPipeline',
+           'PresenceGate', 'BudgetGovernor', 'MonitorStateMachine', 'BlurCompositor']
\ No newline at end of file
@@ -0,0 +1,465 @@
+"""
+Modul pipeline asyncio
+Capture, inferensi, evaluasi jarak dan sink output berjalan sebagai task
+terpisah yang dihubungkan antrian terbatas (backpressure)
+"""
+
+import asyncio
+import inspect
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from config import settings
+from utils.event_log import status_fields
+
+
+class AlertSink:
+    """Sink yang mencetak transisi state (terlalu dekat / aman / wajah hilang)"""
+
+    def __init__(self):
+        self._last_state = None
+
+    def handle(self, status):
+        state = status['state']
+        if state == 'measuring':
+            state = 'safe' if status['is_safe'] else 'too_close'
+        if state == self._last_state:
+            return
+        self._last_state = state
+
+        if state == 'too_close':
+            print(f"PERINGATAN: jarak terlalu dekat ({status['distance']:.1f} cm)")
+        elif state == 'safe':
+            print(f"Jarak aman ({status['distance']:.1f} cm)")
+        elif state == 'no_face':
+            print("Wajah tidak terdeteksi")
+
+
+class MetricsSink:
+    """
+    Sink yang menghitung FPS dan menulis file metrics di executor (tanpa blocking loop)
+
+    Snapshot diambil di thread event loop (tempat metrik dicatat); executor
+    hanya menulis snapshot yang sudah diserialisasi ke file
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._flushing = None
+
+    async def handle(self, status):
+        self.metrics.tick_frame()
+        if self._flushing is None or self._flushing.done():
+            snapshot = self.metrics.prepare_flush()
+            if snapshot is not None:
+                loop = asyncio.get_running_loop()
+                self._flushing = loop.run_in_executor(None, self.metrics.write, snapshot)
+
+    async def close(self):
+        if self._flushing is not None:
+            await self._flushing
+
+
+class RecorderSink:
+    """
+    Sink yang mencatat status ke EventLog atau DistanceHistory
+
+    Flush dijalankan langsung (bukan di executor) karena buffer recorder tidak
+    thread-safe; satu write berurutan / msync per flush_interval
+    """
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def handle(self, status):
+        self.recorder.record_status(status)
+        self.recorder.maybe_flush()
+
+    def close(self):
+        self.recorder.close()
+
+
+class PreviewSink:
+    """
+    Sink yang meneruskan frame ke PreviewSubscriber
+
+    Tombol 'q' menghentikan pipeline, 'c' kalibrasi ulang
+    """
+
+    def __init__(self, preview, pipeline):
+        self.preview = preview
+        self.pipeline = pipeline
+
+    def handle(self, status):
+        self.preview.publish(status['frame'], status)
+        key = self.preview.render_if_due()
+        if key == ord('q'):
+            print("\nProgram dihentikan oleh user")
+            self.pipeline.stop()
+        elif key == ord('c'):
+            print("Kalibrasi ulang...")
+            self.pipeline.recalibrate()
+
+    def idle_cap(self):
+        """Batas idle presence gate: preview tetap dirender sesuai interval"""
+        return self.preview.interval
+
+    def close(self):
+        self.preview.close()
+
+
+class MonitorSink:
+    """
+    Sink yang memperbarui MonitorStateMachine dan menampilkan frame
+    BlurCompositor (capture + blur layar berjalan di thread compositor)
+    """
+
+    def __init__(self, monitor, blur_compositor):
+        self.monitor = monitor
+        self.blur_compositor = blur_compositor
+
+    def handle(self, status):
+        self.monitor.update(status_fields(status)[0])
+        self.blur_compositor.present()
+
+    def idle_cap(self):
+        """Batas idle presence gate: frame blur tetap ditampilkan selama blur aktif"""
+        if self.blur_compositor.active:
+            return self.blur_compositor.blur_overlay.capture_interval
+        return None
+
+
+class AsyncPipeline:
+    """
+    Kelas untuk menjalankan monitor sebagai pipeline asyncio
+
+    capture -> [antrian frame] -> inferensi -> [antrian hasil] -> evaluasi jarak
+    -> [antrian per sink] -> sink
+
+    - Capture dan inferensi blocking dijalankan di executor thread masing-masing
+      (detector tidak thread-safe, jadi inferensi memakai satu worker). Pada mode
+      LIVE_STREAM detect_face hanya mengirim frame ke detect_async sehingga
+      pemanggilan di executor langsung kembali
+    - Antrian frame dan hasil terbatas: jika inferensi lambat, capture menunggu
+      (frame lama dibuang oleh ring buffer Camera, bukan menumpuk di memori)
+    - Antrian sink juga terbatas tetapi membuang status terlama jika penuh,
+      sehingga sink lambat (disk, GUI) tidak menahan deteksi
+    """
+
+    def __init__(self, camera, face_detector, distance_calc, scheduler=None, metrics=None,
+                 control=None, on_calibrated=None, queue_size=None, presence_gate=None):
+        """
+        Args:
+            camera: Objek Camera
+            face_detector: Objek FaceDetector
+            distance_calc: Objek DistanceCalculator
+            scheduler: InferenceScheduler (opsional)
+            metrics: Metrics (opsional, untuk latensi per tahap)
+            control: ControlChannel (opsional, perintah dipoll di task sendiri)
+            on_calibrated: Callback(focal_length) saat kalibrasi selesai
+            queue_size: Kapasitas tiap antrian (default settings.ASYNC_QUEUE_SIZE)
+            presence_gate: PresenceGate (opsional, menahan inferensi saat kursi kosong)
+        """
+        if queue_size is None:
+            queue_size = settings.ASYNC_QUEUE_SIZE
+
+        self.camera = camera
+        self.face_detector = face_detector
+        self.distance_calc = distance_calc
+        self.scheduler = scheduler
+        self.presence_gate = presence_gate
+        self.metrics = metrics
+        self.control = control
+        self.on_calibrated = on_calibrated
+        self.queue_size = queue_size
+
+        self.sinks = []
+        self.paused = False
+        self.dropped_events = 0  # Status yang dibuang karena antrian sink penuh
+
+        self._last_distance = None
+        self._sink_queues = []
+        self._stop = None  # asyncio.Event, dibuat di dalam event loop
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='Capture')
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='Inference')
+
+    def add_sink(self, sink):
+        """
+        Menambahkan sink output
+
+        Args:
+            sink: Objek dengan method handle(status) (boleh coroutine),
+                  opsional close() dan idle_cap() (batas detik idle presence gate)
+        """
+        self.sinks.append(sink)
+
+    def stop(self):
+        """Meminta pipeline berhenti (aman dipanggil dari sink maupun signal handler)"""
+        if self._stop is not None:
+            self._stop.set()
+
+    def recalibrate(self):
+        """Mengulang kalibrasi dan membuang jarak terakhir agar scheduler tidak memakai nilai basi"""
+        self.distance_calc.recalibrate()
+        self._last_distance = None
+        if self.scheduler is not None:
+            self.scheduler.reset()
+
+    def _detect(self, frame):
+        """
+        Inferensi blocking (dijalankan di executor inferensi)
+
+        Returns:
+            Tuple: (measurement atau None, latensi ms, hasil baru) - hasil baru False
+            jika LIVE_STREAM belum menerima callback baru (measurement diabaikan)
+        """
+        start = time.perf_counter()
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = self.face_detector.detect_face(rgb_frame)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if results is None:
+            return None, latency_ms, self.face_detector.result_is_new
+        h, w, _ = frame.shape
+        return results.iris_positions(w, h), latency_ms, True
+
+    async def _capture_task(self, frame_queue):
+        """Membaca frame kamera dan mengirimnya ke antrian (menunggu jika penuh)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            success, frame = await loop.run_in_executor(self._capture_executor,
+                                                        self.camera.read_frame)
+            if not success:
+                print("Gagal membaca frame dari kamera")
+                return
+            await frame_queue.put((time.monotonic(), frame))
+
+    async def _inference_task(self, frame_queue, result_queue):
+        """Menjalankan detector pada frame yang dipilih scheduler"""
+        loop = asyncio.get_running_loop()
+        measurement = None
+        while True:
+            timestamp, frame = await frame_queue.get()
+            fresh = False
+
+            if self.paused:
+                measurement = None
+            elif self.presence_gate is not None and not self.presence_gate.should_run(frame):
+                measurement = None
+                if self.metrics is not None:
+                    self.metrics.count('presence_skipped_total')
+            elif self.scheduler is None or self.scheduler.should_run(frame, self._last_distance):
+                detected, latency_ms, fresh = await loop.run_in_executor(
+                    self._inference_executor, self._detect, frame
+                )
+                if self.metrics is not None:
+                    self.metrics.observe('detect_face', latency_ms)
+                if fresh:
+                    measurement = detected
+                elif self.metrics is not None:
+                    # LIVE_STREAM: belum ada hasil baru, pakai measurement sebelumnya
+                    self.metrics.count('inference_pending_total')
+                if fresh and self.presence_gate is not None:
+                    if measurement is not None:
+                        self.presence_gate.face_seen()
+                    else:
+                        self.presence_gate.face_lost()
+            elif self.metrics is not None:
+                self.metrics.count('inference_skipped_total')
+
+            await result_queue.put((timestamp, frame, measurement, fresh))
+
+            if self.presence_gate is not None:
+                # Kursi kosong: pause capture kamera dan tunggu pemeriksaan berikutnya
+                idle = self.presence_gate.idle_delay()
+                if idle > 0:
+                    # Sink GUI (preview, blur) tidak boleh membeku selama idle
+                    for sink in self.sinks:
+                        idle_cap = getattr(sink, 'idle_cap', None)
+                        cap = idle_cap() if idle_cap is not None else None
+                        if cap is not None:
+                            idle = min(idle, cap)
+                    self.camera.pause()
+                    try:
+                        await asyncio.sleep(idle)
+                    finally:
+                        self.camera.resume()
+                    # Buang frame yang menumpuk sebelum pause (sudah basi)
+                    while not frame_queue.empty():
+                        frame_queue.get_nowait()
+
+    def _evaluate(self, timestamp, frame, measurement, fresh):
+        """
+        Kalibrasi / estimasi jarak untuk satu hasil inferensi
+
+        Returns:
+            Dict status (format sama dengan loop sinkron di main.py)
+        """
+        status = {'state': 'paused', 'frame': frame, 'timestamp': timestamp,
+                  'fps': self.metrics.fps if self.metrics is not None else 0.0,
+                  'latency_ms': self.metrics.latency('detect_face') if self.metrics is not None else 0.0}
+
+        if measurement is None:
+            if fresh:
+                self._last_distance = None
+                self.distance_calc.reset_filter()
+                if self.metrics is not None:
+                    self.metrics.count('face_lost_total')
+            if not self.paused:
+                status['state'] = 'no_face'
+            return status
+
+        iris_distances_px, left_centers, right_centers = measurement
+
+        if not self.distance_calc.is_calibrated:
+            # Kalibrasi focal length dengan wajah terdekat (IPD terbesar)
+            # Frame yang dilewati scheduler tidak dihitung ulang sebagai sampel
+            status['ipd'] = float(iris_distances_px.max())
+            done = fresh and self.distance_calc.calibrate(status['ipd'], timestamp)
+            current, total, percentage = self.distance_calc.get_calibration_progress()
+            status['state'] = 'calibrating'
+            status['calibration'] = (current, total, percentage)
+
+            if done:
+                print(f"Kalibrasi selesai dalam {current} frame!")
+                print(f"   Focal Length: {self.distance_calc.focal_length:.2f} pixel "
+                      f"(±{self.distance_calc.calibration_precision * 100:.1f}%, "
+                      f"{self.distance_calc.calibration_outliers} outlier dibuang)\n")
+                if self.on_calibrated is not None:
+                    self.on_calibrated(self.distance_calc.focal_length)
+            return status
+
+        face_distances, too_close, tracks = self.distance_calc.update_faces(
+            iris_distances_px, (left_centers + right_centers) / 2, timestamp
+        )
+        if face_distances is None:
+            # Drift terhadap focal length cache, kalibrasi ulang mulai frame berikutnya
+            print("Focal length cache tidak cocok (drift), kalibrasi ulang...")
+            self._last_distance = None
+            status.update(state='calibrating', ipd=float(iris_distances_px.max()),
+                          calibration=self.distance_calc.get_calibration_progress())
+            return status
+
+        nearest = int(face_distances.argmin())
+        distance = float(face_distances[nearest])
+        self._last_distance = distance
+
+        status.update(state='measuring', distance=distance, is_safe=not too_close,
+                      ipd=float(iris_distances_px[nearest]),
+                      left_centers=left_centers, right_centers=right_centers,
+                      face_distances=face_distances,
+                      track_ids=[t.track_id for t in tracks])
+        return status
+
+    async def _evaluate_task(self, result_queue):
+        """Evaluasi jarak lalu fan-out status ke antrian setiap sink"""
+        while True:
+            status = self._evaluate(*await result_queue.get())
+
+            if self.control is not None:
+                self.control.update_status({
+                    'state': status['state'],
+                    'distance_cm': status.get('distance'),
+                    'is_safe': status.get('is_safe'),
+                    'faces': len(status.get('track_ids', ())),
+                    'calibrated': self.distance_calc.is_calibrated,
+                    'fps': round(status['fps'], 2),
+                })
+
+            for queue in self._sink_queues:
+                if queue.full():
+                    # Sink tertinggal: buang status terlama, deteksi tidak ikut menunggu
+                    queue.get_nowait()
+                    self.dropped_events += 1
+                queue.put_nowait(status)
+
+    async def _sink_task(self, sink, queue):
+        """Meneruskan status ke satu sink"""
+        while True:
+            status = await queue.get()
+            result = sink.handle(status)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _control_task(self):
+        """Polling perintah ControlChannel"""
+        while True:
+            for command in self.control.poll():
+                if command == 'stop':
+                    print("\nProgram dihentikan lewat kontrol")
+                    self.stop()
+                elif command == 'recalibrate':
+                    self.recalibrate()
+                elif command in ('pause', 'resume'):
+                    self.paused = command == 'pause'
+                    if self.scheduler is not None:
+                        self.scheduler.reset()
+                    if self.presence_gate is not None:
+                        self.presence_gate.reset()
+            await asyncio.sleep(0.1)
+
+    async def run(self):
+        """
+        Menjalankan pipeline hingga stop() dipanggil, kamera gagal, atau
+        salah satu task error; lalu shutdown bersih (kamera dan detector ditutup)
+        """
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+
+        if self.control is None:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(signum, self.stop)
+                except (NotImplementedError, RuntimeError):
+                    pass  # Windows / bukan main thread: KeyboardInterrupt biasa
+
+        frame_queue = asyncio.Queue(self.queue_size)
+        result_queue = asyncio.Queue(self.queue_size)
+        self._sink_queues = [asyncio.Queue(self.queue_size) for _ in self.sinks]
+
+        tasks = [
+            asyncio.create_task(self._capture_task(frame_queue), name='capture'),
+            asyncio.create_task(self._inference_task(frame_queue, result_queue), name='inference'),
+            asyncio.create_task(self._evaluate_task(result_queue), name='evaluate'),
+        ]
+        for sink, queue in zip(self.sinks, self._sink_queues):
+            tasks.append(asyncio.create_task(self._sink_task(sink, queue),
+                                             name=type(sink).__name__))
+        if self.control is not None:
+            tasks.append(asyncio.create_task(self._control_task(), name='control'))
+
+        stop_waiter = asyncio.create_task(self._stop.wait())
+        try:
+            await asyncio.wait(tasks + [stop_waiter], return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    print(f"\nError pada task {task.get_name()}: {task.exception()}")
+        finally:
+            await self._shutdown(tasks + [stop_waiter])
+
+    async def _shutdown(self, tasks):
+        """Membatalkan task, menutup sink, lalu melepas kamera dan detector"""
+        print("\nMembersihkan resources...")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for sink in self.sinks:
+            close = getattr(sink, 'close', None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+
+        # Tunggu read_frame / inferensi yang masih berjalan sebelum resource dilepas
+        self._capture_executor.shutdown(wait=True)
+        self._inference_executor.shutdown(wait=True)
+
+        if self.metrics is not None:
+            self.metrics.gauge('camera_dropped_frames', self.camera.dropped_frames)
+            self.metrics.flush()
+        self.camera.release()
+        self.face_detector.close()
+        if self.control is not None:
+            self.control.close()
@@ -0,0 +1,189 @@
+"""
+Modul analisis batch rekaman sesi (headless, tanpa imshow)
+Pipeline: FaceDetector -> iris_positions (semua wajah) -> DistanceCalculator.update_faces
+File didistribusikan ke process pool; setiap file memakai FaceDetector baru
+(mode IMAGE untuk direktori gambar, VIDEO untuk file video) agar state tracking
+dan timestamp MediaPipe tidak terbawa antar file
+"""
+
+import os
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+from config import settings
+from utils.frame_sources import iter_frames
+from .face_detector import FaceDetector
+from .distance_calculator import DistanceCalculator
+
+# Kolom output per frame (ipd_px / distance_cm: wajah terdekat,
+# too_close: hysteresis wajah mana pun)
+COLUMNS = ('source', 'frame', 'timestamp', 'faces', 'ipd_px', 'distance_cm', 'too_close')
+
+def analyze_source(path, focal_length=None):
+    """
+    Menganalisis satu video / direktori gambar
+
+    Tanpa focal_length, frame pertama dengan wajah (maksimal CALIBRATION_FRAMES) dipakai
+    untuk kalibrasi (asumsi pengguna pada KNOWN_DISTANCE di awal rekaman),
+    kolom distance_cm bernilai NaN selama kalibrasi. Semua wajah dilacak
+    (filter IPD dan hysteresis per wajah), baris frame memuat wajah terdekat
+
+    Args:
+        path: Path video atau direktori gambar
+        focal_length: Focal length hasil kalibrasi sebelumnya (opsional)
+
+    Returns:
+        Dict: kolom hasil (array NumPy), jumlah frame, durasi, dan pid worker
+    """
+    # Gambar dalam direktori tidak selalu berurutan secara temporal: deteksi penuh per gambar
+    detector = FaceDetector(running_mode='IMAGE' if os.path.isdir(path) else 'VIDEO')
+
+    distance_calc = DistanceCalculator()
+    if focal_length is not None:
+        distance_calc.focal_length = focal_length
+        distance_calc.is_calibrated = True
+
+    indices = []
+    timestamps = []
+    face_counts = []
+    ipds = []
+    distances = []
+    too_close_flags = []
+
+    start = time.perf_counter()
+    try:
+        for index, timestamp, frame in iter_frames(path):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            h, w = frame.shape[:2]
+            results = detector.detect_face(rgb_frame)
+
+            faces = 0
+            ipd = np.nan
+            distance = np.nan
+            too_close = False
+            if results is not None:
+                iris_distances_px, left_centers, right_centers = results.iris_positions(w, h)
+                faces = len(iris_distances_px)
+                if distance_calc.is_calibrated:
+                    face_distances, too_close, _ = distance_calc.update_faces(
+                        iris_distances_px, (left_centers + right_centers) / 2, timestamp
+                    )
+                    if face_distances is None:
+                        # Drift terhadap focal length cache: frame ini tanpa jarak
+                        ipd = iris_distances_px.max()
+                    else:
+                        nearest = int(face_distances.argmin())
+                        ipd = iris_distances_px[nearest]
+                        distance = face_distances[nearest]
+                else:
+                    # Kalibrasi dengan wajah terdekat (IPD terbesar)
+                    ipd = iris_distances_px.max()
+                    distance_calc.calibrate(float(ipd), timestamp)
+            else:
+                distance_calc.reset_filter()
+
+            # Index asli (bukan urutan baris): file yang tidak terbaca tidak menggeser kolom frame
+            indices.append(index)
+            timestamps.append(timestamp)
+            face_counts.append(faces)
+            ipds.append(ipd)
+            distances.append(distance)
+            too_close_flags.append(too_close)
+    finally:
+        detector.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'source': path,
+        'frame': np.array(indices, dtype=np.int64),
+        'timestamp': np.array(timestamps, dtype=np.float64),
+        'faces': np.array(face_counts, dtype=np.int32),
+        'ipd_px': np.array(ipds, dtype=np.float32),
+        'distance_cm': np.array(distances, dtype=np.float32),
+        'too_close': np.array(too_close_flags, dtype=bool),
+        'frames': len(timestamps),
+        'elapsed': elapsed,
+        'worker': os.getpid(),
+        'focal_length': distance_calc.focal_length,
+    }
+
+
+def write_results(results, output_path):
+    """
+    Menulis hasil semua file ke CSV, atau .npz (columnar) sesuai ekstensi
+
+    Args:
+        results: List dict dari analyze_source
+        output_path: Path file output (.csv atau .npz)
+    """
+    if output_path.lower().endswith('.npz'):
+        columns = {
+            'source': np.concatenate([np.full(r['frames'], r['source']) for r in results]),
+            'frame': np.concatenate([r['frame'] for r in results]),
+            'timestamp': np.concatenate([r['timestamp'] for r in results]),
+            'faces': np.concatenate([r['faces'] for r in results]),
+            'ipd_px': np.concatenate([r['ipd_px'] for r in results]),
+            'distance_cm': np.concatenate([r['distance_cm'] for r in results]),
+            'too_close': np.concatenate([r['too_close'] for r in results]),
+        }
+        np.savez_compressed(output_path, **columns)
+        return
+
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for r in results:
+            for i in range(r['frames']):
+                writer.writerow((r['source'], r['frame'][i], f"{r['timestamp'][i]:.3f}",
+                                 r['faces'][i], f"{r['ipd_px'][i]:.2f}",
+                                 f"{r['distance_cm'][i]:.2f}", int(r['too_close'][i])))
+
+
+def run_batch(paths, output_path, workers=None, focal_length=None):
+    """
+    Menjalankan analisis semua path pada process pool
+
+    Args:
+        paths: List video / direktori gambar
+        output_path: Path output (.csv atau .npz)
+        workers: Jumlah proses (default settings.BATCH_WORKERS / jumlah CPU)
+        focal_length: Focal length tetap untuk semua file (opsional)
+
+    Returns:
+        Dict: statistik throughput keseluruhan dan per worker
+    """
+    if workers is None:
+        workers = settings.BATCH_WORKERS or os.cpu_count()
+    workers = max(1, min(workers, len(paths)))
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_source, path, focal_length): path for path in paths}
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"  {result['source']}: {result['frames']} frame, "
+                  f"{result['frames'] / max(result['elapsed'], 1e-9):.1f} FPS (worker {result['worker']})")
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    # Urutkan sesuai urutan input agar output deterministik
+    order = {path: i for i, path in enumerate(paths)}
+    results.sort(key=lambda r: order[r['source']])
+    write_results(results, output_path)
+
+    per_worker = {}
+    for r in results:
+        frames, busy = per_worker.get(r['worker'], (0, 0.0))
+        per_worker[r['worker']] = (frames + r['frames'], busy + r['elapsed'])
+
+    total_frames = sum(r['frames'] for r in results)
+    return {
+        'frames': total_frames,
+        'elapsed': elapsed,
+        'fps': total_frames / max(elapsed, 1e-9),
+        'workers': {pid: frames / max(busy, 1e-9) for pid, (frames, busy) in per_worker.items()},
+    }
@@ -0,0 +1,190 @@
+"""
+FILTERING (SCREEN BLUR)
+Modul compositor blur layar penuh di thread terpisah
+"""
+
+import threading
+import time
+import cv2
+from . import monitor
+
+class BlurCompositor:
+    """
+    Kelas untuk menampilkan blur layar penuh tanpa menahan loop deteksi
+
+    - Thread compositor melakukan capture + blur layar (bagian yang mahal)
+      dengan laju sendiri (SCREEN_CAPTURE_FPS lewat BlurOverlay) selama aktif,
+      dan tidur saat tidak aktif
+    - Loop utama hanya memanggil present() yang murah: membuat / menutup jendela
+      fullscreen dan menampilkan frame blur terbaru. Operasi jendela HighGUI
+      tetap di thread utama karena tidak aman dipanggil dari beberapa thread
+    - Aktif/nonaktif mengikuti MonitorStateMachine (on_state_change):
+      aktif saat TOO_CLOSE, tetap aktif saat NO_FACE setelah TOO_CLOSE,
+      nonaktif saat SAFE / PAUSED / CALIBRATING
+    - BlurOverlay hanya disentuh thread compositor: setiap aktivasi menaikkan
+      nomor generasi, thread compositor yang me-reset overlay, dan frame dari
+      generasi lama tidak pernah dipublikasikan
+    - BlurOverlay menulis blur bergantian ke dua buffer; present() menampilkan
+      frame sambil memegang lock sehingga buffer tersebut tidak ditimpa
+    """
+
+    WINDOW_NAME = 'Fullscreen Blur'
+
+    def __init__(self, blur_overlay, metrics=None):
+        """
+        Args:
+            blur_overlay: Objek BlurOverlay (capture + blur layar)
+            metrics: Metrics (opsional, jumlah, durasi aktivasi, dan latensi blur per frame)
+        """
+        self.blur_overlay = blur_overlay
+        self.metrics = metrics
+        # Timer dibuat di thread pemanggil agar registry metrik tidak berubah dari thread compositor
+        self._frame_timer = metrics.timer('blur_frame') if metrics is not None else None
+
+        self._active = threading.Event()
+        self._lock = threading.Lock()
+        self._frame = None          # Frame blur terbaru dari thread compositor
+        self._frame_seq = 0
+        self._generation = 0        # Naik setiap aktivasi (reset overlay di thread compositor)
+        self._shown_seq = 0
+        self._window_open = False
+        self._blur_start = None
+        self._running = True
+
+        # Statistik
+        self.activations = 0
+        self.compose_errors = 0
+        self.cpu_seconds = 0.0  # CPU thread compositor (time.thread_time), untuk governor
+
+        self._thread = threading.Thread(target=self._compose_loop,
+                                        name='BlurCompositor', daemon=True)
+        self._thread.start()
+
+    @property
+    def active(self):
+        return self._active.is_set()
+
+    def _compose_loop(self):
+        """Loop thread compositor: capture + blur layar selama aktif"""
+        applied_generation = 0
+        while self._running:
+            if not self._active.wait(timeout=0.5) or not self._running:
+                continue
+            with self._lock:
+                generation = self._generation
+            if generation != applied_generation:
+                # Aktivasi baru: capture dan blur ulang, jangan pakai layar aktivasi sebelumnya
+                self.blur_overlay.reset()
+                applied_generation = generation
+            start = time.monotonic()
+            cpu_start = time.thread_time()
+            try:
+                if self._frame_timer is not None:
+                    with self._frame_timer:
+                        blurred = self.blur_overlay.get_frame(start)
+                else:
+                    blurred = self.blur_overlay.get_frame(start)
+            except Exception as e:
+                # Sumber layar gagal (misalnya display tidak tersedia): coba lagi nanti
+                self.compose_errors += 1
+                if self.compose_errors == 1:
+                    print(f"Error dalam fullscreen blur: {e}")
+                blurred = None
+            self.cpu_seconds += time.thread_time() - cpu_start
+            if blurred is not None and self.active:
+                with self._lock:
+                    # Frame generasi lama (blur dinonaktifkan / diaktifkan ulang selama capture) dibuang
+                    if generation == self._generation and blurred is not self._frame:
+                        self._frame = blurred
+                        self._frame_seq += 1
+            elapsed = time.monotonic() - start
+            time.sleep(max(0.0, self.blur_overlay.capture_interval - elapsed))
+
+    def on_state_change(self, old_state, new_state, now):
+        """Listener MonitorStateMachine"""
+        if new_state == monitor.TOO_CLOSE:
+            self.activate(now)
+        elif new_state == monitor.NO_FACE and old_state == monitor.TOO_CLOSE:
+            pass  # Tetap blur sampai wajah terlihat lagi dan jaraknya aman
+        elif self.active:
+            if new_state == monitor.SAFE:
+                print("Jarak aman, menonaktifkan blur layar.")
+            self.deactivate(now)
+
+    def activate(self, now=None):
+        """Mulai blur layar"""
+        if self.active:
+            return
+        if now is None:
+            now = time.monotonic()
+        print("Aktivasi blur seluruh layar karena jarak terlalu dekat!")
+        with self._lock:
+            self._generation += 1
+            self._frame = None
+        self._blur_start = now
+        self.activations += 1
+        if self.metrics is not None:
+            self.metrics.count('blur_activations_total')
+        self._active.set()
+
+    def deactivate(self, now=None):
+        """Hentikan blur layar (jendela ditutup pada present() berikutnya)"""
+        if not self.active:
+            return
+        if now is None:
+            now = time.monotonic()
+        self._active.clear()
+        if self.metrics is not None:
+            self.metrics.count('blur_seconds_total', now - self._blur_start)
+
+    def present(self):
+        """
+        Dipanggil dari thread utama setiap iterasi loop (murah jika tidak aktif)
+
+        Returns:
+            Kode tombol dari waitKey jika jendela blur sedang tampil, selain itu None.
+            'q' pada jendela blur menutup blur sampai aktivasi berikutnya
+        """
+        if not self.active:
+            if self._window_open:
+                self._close_window()
+            return None
+
+        if not self._window_open:
+            cv2.namedWindow(self.WINDOW_NAME, cv2.WND_PROP_FULLSCREEN)
+            cv2.setWindowProperty(self.WINDOW_NAME, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+            self._window_open = True
+            self._shown_seq = 0
+
+        with self._lock:
+            # imshow menyalin frame; selama lock dipegang compositor tidak bisa
+            # mempublikasikan frame baru, jadi buffer ini belum akan ditimpa
+            if self._frame is not None and self._frame_seq != self._shown_seq:
+                cv2.imshow(self.WINDOW_NAME, self._frame)
+                self._shown_seq = self._frame_seq
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            print("Exit manual dari blur layar.")
+            self.deactivate()
+            self._close_window()
+        return key
+
+    def _close_window(self):
+        self._window_open = False
+        with self._lock:
+            self._frame = None
+        try:
+            cv2.destroyWindow(self.WINDOW_NAME)
+        except cv2.error:
+            pass
+        print("Blur layar dinonaktifkan.")
+
+    def close(self):
+        """Hentikan thread compositor dan tutup jendela"""
+        self.deactivate()
+        self._running = False
+        self._active.set()  # Bangunkan thread agar bisa keluar
+        self._thread.join(timeout=1.0)
+        if self._window_open:
+            self._close_window()
@@ -0,0 +1,111 @@
+"""
+FILTERING (SCREEN BLUR)
+Modul engine overlay blur layar penuh dengan capture berfrekuensi rendah
+"""
+
+import time
+import cv2
+import numpy as np
+from config import settings
+from utils.screen import create_screen_source
+from .image_processor import ImageProcessor
+
+class BlurOverlay:
+    """
+    Kelas untuk menghasilkan gambar layar yang di-blur secara efisien
+
+    - Layar di-capture maksimal SCREEN_CAPTURE_FPS kali per detik
+    - Blur memakai backend ImageProcessor.apply_blur (default 'pyramid':
+      blur pada level pyramid yang lebih kecil lalu di-upscale)
+    - Jika layar tidak berubah, hasil blur sebelumnya dipakai ulang
+    - Hasil blur ditulis bergantian ke dua buffer resolusi penuh (double buffer),
+      sehingga frame yang dikembalikan get_frame tetap utuh selama blur berikutnya
+      ditulis (misalnya saat ditampilkan thread lain)
+    """
+
+    def __init__(self, source=None, capture_fps=None, backend=None):
+        """
+        Args:
+            source: Objek sumber layar dengan method capture()
+                    (default dibuat dari settings.SCREEN_SOURCE saat blur pertama
+                    kali dibutuhkan, sehingga pyautogui tidak di-load saat startup)
+            capture_fps: Frekuensi capture layar (default dari settings)
+            backend: Backend blur (default settings.BLUR_BACKEND)
+        """
+        if capture_fps is None:
+            capture_fps = settings.SCREEN_CAPTURE_FPS
+        if backend is None:
+            backend = settings.BLUR_BACKEND
+
+        self.source = source
+        self.capture_interval = 1.0 / capture_fps
+        self.backend = backend
+
+        self._last_capture_time = None
+        self._thumbnail = None  # Thumbnail layar terakhir untuk deteksi perubahan
+        self._output = None     # Hasil blur terakhir resolusi penuh
+        self._buffers = [None, None]  # Double buffer output blur
+        self._buffer_index = 0
+
+        # Statistik
+        self.captures = 0
+        self.blurs = 0
+
+    def _screen_changed(self, screen):
+        """
+        Deteksi perubahan layar menggunakan thumbnail kecil
+
+        Returns:
+            Boolean: True jika layar berubah dibanding capture sebelumnya
+        """
+        thumbnail = cv2.resize(screen, (64, 36), interpolation=cv2.INTER_AREA)
+        changed = (self._thumbnail is None or
+                   float(np.mean(cv2.absdiff(thumbnail, self._thumbnail))) >
+                   settings.SCREEN_CHANGE_THRESHOLD)
+        self._thumbnail = thumbnail
+        return changed
+
+    def _blur(self, screen):
+        """Blur screenshot dengan backend terpilih ke buffer yang tidak sedang dipakai"""
+        index = 1 - self._buffer_index
+        buffer = self._buffers[index]
+        if buffer is None or buffer.shape != screen.shape:
+            buffer = np.empty_like(screen)
+        self._buffers[index] = ImageProcessor.apply_blur(screen, self.backend, dst=buffer)
+        self._buffer_index = index
+        self._output = self._buffers[index]
+        self.blurs += 1
+
+    def get_frame(self, now=None):
+        """
+        Mendapatkan gambar layar yang sudah di-blur
+
+        Args:
+            now: Waktu saat ini (default time.monotonic())
+
+        Returns:
+            Image array BGR (dipakai ulang selama layar tidak berubah, jangan dimodifikasi;
+            buffer-nya ditimpa lagi pada blur kedua setelah frame ini)
+        """
+        if now is None:
+            now = time.monotonic()
+
+        due = (self._last_capture_time is None or
+               now - self._last_capture_time >= self.capture_interval)
+
+        if due:
+            self._last_capture_time = now
+            if self.source is None:
+                self.source = create_screen_source(settings.SCREEN_SOURCE)
+            screen = self.source.capture()
+            self.captures += 1
+            changed = self._screen_changed(screen)
+            if changed or self._output is None:
+                self._blur(screen)
+
+        return self._output
+
+    def reset(self):
+        """Paksa capture dan blur ulang pada pemanggilan berikutnya"""
+        self._last_capture_time = None
+        self._thumbnail = None
@@ -2,7 +2,28 @@
 Modul untuk menghitung estimasi jarak menggunakan depth estimation monocular
 """
 
+import time
+import numpy as np
 from config import settings
+from .face_tracker import FaceTracker
+
+def _student_t_quantile(z, df):
+    """
+    Kuantil Student-t dari kuantil normal z (ekspansi Cornish-Fisher,
+    error < 0.01 untuk df >= 5 pada z = 1.96)
+
+    Args:
+        z: Kuantil normal standar (misalnya 1.96 untuk 95% dua sisi)
+        df: Derajat kebebasan
+
+    Returns:
+        Kuantil t (> z, mendekati z untuk df besar)
+    """
+    z3, z5, z7 = z ** 3, z ** 5, z ** 7
+    return (z + (z3 + z) / (4 * df)
+            + (5 * z5 + 16 * z3 + 3 * z) / (96 * df ** 2)
+            + (3 * z7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * df ** 3))
+
 
 class DistanceCalculator:
     """
@@ -15,14 +36,36 @@ class DistanceCalculator:
         self.focal_length = None
         self.calibration_count = 0
         self.is_calibrated = False
+        
+        # Sampel focal length kalibrasi (maksimal CALIBRATION_FRAMES) dan presisi hasilnya
+        self._calibration_samples = np.empty(settings.CALIBRATION_FRAMES)
+        self.calibration_precision = None  # Setengah lebar interval kepercayaan relatif
+        self.calibration_outliers = 0
+        self._calibration_start = None     # Waktu sampel kalibrasi pertama
+        
+        # Pelacakan wajah: filter temporal IPD & hysteresis terlalu dekat per wajah
+        self.tracker = FaceTracker()
+        
+        # Pemeriksaan drift untuk focal length yang dimuat dari cache
+        self._drift_samples = []
+        self._drift_check_pending = False
+        self.drift_detected = False
     
-    def calibrate(self, pixel_width):
+    def calibrate(self, pixel_width, timestamp=None):
         """
         CAMERA CALIBRATION
         Kalibrasi focal length kamera menggunakan reference distance
         
+        Sampel disaring dengan median/MAD (landmark yang meleset tidak ikut
+        dirata-rata), lalu kalibrasi berhenti begitu interval kepercayaan
+        focal length cukup sempit (CALIBRATION_TOLERANCE), minimal
+        CALIBRATION_MIN_FRAMES frame dalam CALIBRATION_MIN_SECONDS detik dan
+        maksimal CALIBRATION_FRAMES frame. Frame berurutan sangat berkorelasi,
+        sehingga rentang waktu minimal mencegah berhenti sebelum pengguna diam
+        
         Args:
             pixel_width: Lebar objek dalam pixel (IPD dalam pixel)
+            timestamp: Waktu pengukuran dalam detik (default time.monotonic())
         
         Returns:
             Boolean: True jika kalibrasi selesai
@@ -34,22 +77,64 @@ class DistanceCalculator:
         # f = (P × D) / W (Materi 10: Camera Model)
         temp_focal = (pixel_width * settings.KNOWN_DISTANCE) / settings.KNOWN_WIDTH
         
-        # Smoothing dengan exponential moving average untuk stabilitas
-        if self.focal_length is None:
-            self.focal_length = temp_focal
-        else:
-            # Alpha = 0.9 untuk smoothing (mengurangi noise dari jittering)
-            self.focal_length = 0.9 * self.focal_length + 0.1 * temp_focal
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.calibration_count == 0:
+            self._calibration_start = timestamp
         
+        self._calibration_samples[self.calibration_count] = temp_focal
         self.calibration_count += 1
         
-        # Kalibrasi selesai setelah N frames
-        if self.calibration_count >= settings.CALIBRATION_FRAMES:
+        self.focal_length, self.calibration_precision, self.calibration_outliers = \
+            self._estimate_focal(self._calibration_samples[:self.calibration_count])
+        
+        # Selesai jika sudah cukup presisi, atau batas frame tercapai
+        converged = (self.calibration_count >= settings.CALIBRATION_MIN_FRAMES and
+                     timestamp - self._calibration_start >= settings.CALIBRATION_MIN_SECONDS and
+                     self.calibration_precision <= settings.CALIBRATION_TOLERANCE)
+        if converged or self.calibration_count >= settings.CALIBRATION_FRAMES:
             self.is_calibrated = True
             return True
         
         return False
     
+    @staticmethod
+    def _estimate_focal(samples):
+        """
+        Estimasi focal length robust dari sampel kalibrasi
+        
+        Outlier: |x - median| > CALIBRATION_OUTLIER_K × 1.4826 × MAD
+        (1.4826 × MAD = estimasi standar deviasi untuk distribusi normal)
+        
+        Interval kepercayaan memakai kuantil Student-t dengan n-1 derajat
+        kebebasan (sampel sedikit); CALIBRATION_CONFIDENCE_Z hanya kuantil normal
+        masukan yang dikonversi oleh _student_t_quantile
+        
+        Args:
+            samples: Array focal length per frame
+        
+        Returns:
+            Tuple: (focal_length, precision, outliers) - precision adalah setengah
+                   lebar interval kepercayaan relatif terhadap focal length
+                   (inf jika sampel inlier kurang dari 2)
+        """
+        median = np.median(samples)
+        sigma = 1.4826 * np.median(np.abs(samples - median))
+        if sigma > 0:
+            inliers = samples[np.abs(samples - median) <= settings.CALIBRATION_OUTLIER_K * sigma]
+        else:
+            # Lebih dari separuh sampel identik: pakai sampel yang sama dengan median
+            inliers = samples[samples == median]
+        
+        focal_length = float(np.mean(inliers))
+        if len(inliers) < 2:
+            return focal_length, np.inf, len(samples) - len(inliers)
+        
+        standard_error = np.std(inliers, ddof=1) / np.sqrt(len(inliers))
+        t = _student_t_quantile(settings.CALIBRATION_CONFIDENCE_Z, len(inliers) - 1)
+        precision = float(t * standard_error / focal_length)
+        return focal_length, precision, len(samples) - len(inliers)
+    
     def calculate_distance(self, pixel_width):
         """
         DEPTH ESTIMATION
@@ -75,8 +160,118 @@ class DistanceCalculator:
         """
         Mendapatkan progress kalibrasi
         
+        Kalibrasi bisa selesai sebelum total_frames (lihat calibrate),
+        total_frames adalah batas maksimal
+        
         Returns:
             Tuple: (current_count, total_frames, percentage)
         """
         percentage = (self.calibration_count / settings.CALIBRATION_FRAMES) * 100
-        return self.calibration_count, settings.CALIBRATION_FRAMES, percentage
\ No newline at end of file
+        return self.calibration_count, settings.CALIBRATION_FRAMES, percentage
+    
+    def update_faces(self, pixel_widths, centers, timestamp=None):
+        """
+        TEMPORAL FILTERING & MULTI-FACE DEPTH ESTIMATION
+        Setiap wajah dilacak identitasnya dan memiliki filter IPD (One-Euro /
+        Kalman) serta hysteresis terlalu dekat sendiri
+        
+        Args:
+            pixel_widths: Array (N,) IPD mentah per wajah dalam pixel
+            centers: Array (N, 2) titik tengah kedua iris per wajah
+            timestamp: Waktu pengukuran dalam detik (default time.monotonic())
+        
+        Returns:
+            Tuple: (distances[N], too_close, tracks)
+            - distances: None jika drift terhadap focal length cache terdeteksi
+              (kalibrasi di-reset, frame ini tidak punya jarak)
+            - too_close: True jika ada wajah yang terlalu dekat
+            - tracks: List FaceTrack sesuai urutan wajah input
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        
+        pixel_widths = np.asarray(pixel_widths)
+        if self._drift_check_pending and self._check_drift(float(pixel_widths.max())):
+            # Cek drift memakai wajah terdekat (IPD terbesar)
+            return None, self.too_close, []
+        
+        tracks = self.tracker.update(pixel_widths, centers, timestamp, self.focal_length)
+        distances = np.array([t.distance for t in tracks])
+        return distances, self.tracker.any_too_close(), tracks
+    
+    @property
+    def too_close(self):
+        """State hysteresis terakhir (True = terlalu dekat, wajah mana pun)"""
+        return self.tracker.any_too_close()
+    
+    def reset_filter(self):
+        """Reset filter IPD semua wajah (misalnya saat wajah hilang), state hysteresis dipertahankan"""
+        self.tracker.reset_filters()
+    
+    def load_calibration(self, focal_length):
+        """
+        Memakai focal length tersimpan (cache) tanpa kalibrasi ulang
+        
+        Beberapa frame pertama dibandingkan dengan focal length tersimpan
+        (asumsi pengguna pada ~KNOWN_DISTANCE saat program dimulai)
+        
+        Args:
+            focal_length: Focal length dalam pixel
+        """
+        self.focal_length = focal_length
+        self.calibration_count = settings.CALIBRATION_FRAMES
+        self.is_calibrated = True
+        self._drift_samples = []
+        self._drift_check_pending = settings.DRIFT_CHECK_FRAMES > 0
+        self.drift_detected = False
+    
+    def _check_drift(self, pixel_width):
+        """
+        Mengumpulkan sampel IPD awal dan membandingkan focal length implisitnya
+        dengan focal length tersimpan
+        
+        Returns:
+            Boolean: True jika drift terdeteksi (state kalibrasi sudah di-reset)
+        """
+        self._drift_samples.append(pixel_width)
+        if len(self._drift_samples) < settings.DRIFT_CHECK_FRAMES:
+            return False
+        
+        self._drift_check_pending = False
+        samples = sorted(self._drift_samples)
+        median_ipd = samples[len(samples) // 2]
+        implied_focal = (median_ipd * settings.KNOWN_DISTANCE) / settings.KNOWN_WIDTH
+        deviation = abs(implied_focal - self.focal_length) / self.focal_length
+        
+        if deviation > settings.CALIBRATION_DRIFT_TOLERANCE:
+            self.drift_detected = True
+            self.recalibrate()
+            return True
+        return False
+    
+    def rescale(self, factor):
+        """
+        Menyesuaikan kalibrasi saat resolusi capture berubah
+        
+        IPD dalam pixel sebanding dengan lebar frame, sehingga focal length
+        (dan sampel kalibrasi / drift yang sedang dikumpulkan) cukup dikali faktor skala
+        
+        Args:
+            factor: Lebar frame baru / lebar frame lama
+        """
+        if self.focal_length is not None:
+            self.focal_length *= factor
+        self._calibration_samples[:self.calibration_count] *= factor
+        self._drift_samples = [sample * factor for sample in self._drift_samples]
+        self.tracker.reset()
+    
+    def recalibrate(self):
+        """Menghapus hasil kalibrasi dan memulai kalibrasi dari awal"""
+        self.focal_length = None
+        self.calibration_count = 0
+        self.is_calibrated = False
+        self.calibration_precision = None
+        self.calibration_outliers = 0
+        self._calibration_start = None
+        self._drift_check_pending = False
+        self.tracker.reset()
\ No newline at end of file
@@ -3,104 +3,437 @@ OBJECT DETECTION (FACE & EYE DETECTION)
 Modul untuk deteksi wajah dan ekstraksi landmark iris menggunakan MediaPipe
 """
 
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
+import threading
+import time
+import cv2
 import numpy as np
 from config import settings
 
+# Modul MediaPipe di-import saat FaceDetector pertama kali dibuat (lazy),
+# agar import package modules tidak membayar waktu load MediaPipe
+mp = None
+vision = None
+mp_python = None
+
+
+def _load_mediapipe():
+    """Import MediaPipe sekali (boleh dipanggil dari background thread)"""
+    global mp, vision, mp_python
+    if mp is None:
+        import mediapipe
+        from mediapipe.tasks import python as tasks_python
+        from mediapipe.tasks.python import vision as tasks_vision
+        mp_python = tasks_python
+        vision = tasks_vision
+        mp = mediapipe
+
+# Index landmark iris dalam bentuk array (2, 4): baris 0 = kiri, baris 1 = kanan
+IRIS_INDEX = np.array([settings.LEFT_IRIS, settings.RIGHT_IRIS])
+
+
+class _Landmark:
+    """Landmark tunggal untuk adapter API lama (multi_face_landmarks)"""
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class _FaceLandmarks:
+    """Wrapper landmark satu wajah untuk adapter API lama"""
+    __slots__ = ('landmark',)
+
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+
+class FaceLandmarksResult:
+    """
+    Hasil deteksi wajah berbasis satu array NumPy
+    landmarks: array float32 berukuran (N_faces, 478, 3), koordinat normalized
+    """
+    __slots__ = ('landmarks', '_legacy')
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+        self._legacy = None
+
+    @classmethod
+    def from_mediapipe(cls, face_landmarks):
+        """
+        Membuat hasil dari output FaceLandmarker (list of list NormalizedLandmark)
+
+        Args:
+            face_landmarks: result.face_landmarks dari MediaPipe
+
+        Returns:
+            FaceLandmarksResult
+        """
+        num_faces = len(face_landmarks)
+        num_points = len(face_landmarks[0])
+        flat = np.fromiter(
+            (v for face in face_landmarks for lm in face for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=num_faces * num_points * 3
+        )
+        return cls(flat.reshape(num_faces, num_points, 3))
+
+    @property
+    def num_faces(self):
+        """Jumlah wajah yang terdeteksi"""
+        return self.landmarks.shape[0]
+
+    @property
+    def multi_face_landmarks(self):
+        """
+        Adapter lazy untuk API lama (results.multi_face_landmarks[i].landmark[j].x)
+        Objek hanya dibuat saat properti ini diakses
+        """
+        if self._legacy is None:
+            self._legacy = [
+                _FaceLandmarks([_Landmark(x, y, z) for x, y, z in face.tolist()])
+                for face in self.landmarks
+            ]
+        return self._legacy
+
+    def iris_positions(self, frame_width, frame_height):
+        """
+        Ekstraksi pusat iris dan IPD untuk semua wajah sekaligus (vectorized)
+
+        Args:
+            frame_width: Lebar frame dalam pixel
+            frame_height: Tinggi frame dalam pixel
+
+        Returns:
+            Tuple: (iris_distance_pixel[N], left_centers[N, 2], right_centers[N, 2])
+        """
+        # (N, 2, 4, 2) -> rata-rata 4 titik -> (N, 2, 2) dalam pixel
+        centers = self.landmarks[:, IRIS_INDEX, :2].mean(axis=2) * (frame_width, frame_height)
+        left_centers = centers[:, 0]
+        right_centers = centers[:, 1]
+        iris_distance_pixel = np.linalg.norm(left_centers - right_centers, axis=-1)
+        return iris_distance_pixel, left_centers, right_centers
+
+
 class FaceDetector:
     """
     Kelas untuk mendeteksi wajah dan mengekstrak posisi iris
     Menggunakan MediaPipe Face Landmarker dengan landmark points
     """
 
-    def __init__(self):
-        """Inisialisasi MediaPipe Face Landmarker detector"""
+    RUNNING_MODES = ('IMAGE', 'VIDEO', 'LIVE_STREAM')
+
+    def __init__(self, running_mode=None):
+        """
+        Inisialisasi MediaPipe Face Landmarker detector
+
+        Args:
+            running_mode: 'IMAGE', 'VIDEO', atau 'LIVE_STREAM' (default dari settings)
+                - IMAGE: deteksi penuh setiap frame
+                - VIDEO: detect_for_video, tracker melewati tahap face detection
+                - LIVE_STREAM: detect_async, hasil diterima lewat callback
+        """
+        if running_mode is None:
+            running_mode = settings.RUNNING_MODE
+        running_mode = running_mode.upper()
+        if running_mode not in self.RUNNING_MODES:
+            raise ValueError(f"Running mode tidak dikenal: {running_mode}")
+        self.running_mode = running_mode
+
+        # State untuk mode VIDEO / LIVE_STREAM
+        self._last_timestamp_ms = -1
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        self._latest_result_ms = None    # Timestamp frame hasil async terakhir
+        self._consumed_result_ms = None  # Timestamp hasil async terakhir yang sudah dikembalikan
+        self.last_latency_ms = None  # Latensi hasil terakhir (submit -> hasil)
+        # False jika detect_face terakhir tidak membawa hasil baru (LIVE_STREAM:
+        # belum ada callback sejak pemanggilan sebelumnya), hasilnya harus diabaikan
+        self.result_is_new = True
+        # Mode LIVE_STREAM: dipanggil dari thread MediaPipe untuk setiap hasil,
+        # Callable(results, timestamp_ms, latency_ms) - misalnya untuk benchmark
+        self.result_listener = None
+
+        # Bounding box pencarian (x0, y0, x1, y1) dari wajah frame sebelumnya.
+        # Hanya mode IMAGE: tracker VIDEO / LIVE_STREAM memakai landmark frame
+        # sebelumnya sebagai prior, sehingga crop yang berpindah / berubah ukuran
+        # (dan fallback ke frame penuh) membuat tracker salah inisialisasi
+        self.roi_enabled = settings.ROI_ENABLED and running_mode == 'IMAGE'
+        self.roi = None
+        self._roi_frames = 0  # Frame berturut-turut dengan ROI saat wajah < MAX_NUM_FACES
+        self.roi_target_size = settings.ROI_TARGET_SIZE  # Bisa diubah saat runtime (governor)
+
         # Setup MediaPipe Face Landmarker (Materi 7: Deep Learning based Detection)
-        base_options = python.BaseOptions(model_asset_path='face_landmarker.task')
+        _load_mediapipe()
+        base_options = mp_python.BaseOptions(model_asset_path='face_landmarker.task')
+        extra_options = {}
+        if running_mode == 'LIVE_STREAM':
+            extra_options['result_callback'] = self._on_result
         options = vision.FaceLandmarkerOptions(
             base_options=base_options,
+            running_mode=getattr(vision.RunningMode, running_mode),
             num_faces=settings.MAX_NUM_FACES,
             min_face_detection_confidence=settings.MIN_DETECTION_CONFIDENCE,
             min_face_presence_confidence=settings.MIN_TRACKING_CONFIDENCE,
             min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE,
             output_face_blendshapes=False,
-            output_facial_transformation_matrixes=False
+            output_facial_transformation_matrixes=False,
+            **extra_options
         )
         self.detector = vision.FaceLandmarker.create_from_options(options)
-    
+
+    def _next_timestamp_ms(self):
+        """
+        Timestamp monotonic dalam milidetik, dijamin naik strictly
+        (syarat detect_for_video dan detect_async)
+        """
+        timestamp_ms = int(time.monotonic() * 1000)
+        if timestamp_ms <= self._last_timestamp_ms:
+            timestamp_ms = self._last_timestamp_ms + 1
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Callback mode LIVE_STREAM, dipanggil dari thread MediaPipe"""
+        if result.face_landmarks:
+            landmarks_result = FaceLandmarksResult.from_mediapipe(result.face_landmarks)
+        else:
+            landmarks_result = None
+
+        latency_ms = time.monotonic() * 1000 - timestamp_ms
+        with self._result_lock:
+            self._latest_result = landmarks_result
+            self._latest_result_ms = timestamp_ms
+            self.last_latency_ms = latency_ms
+
+        if self.result_listener is not None:
+            self.result_listener(landmarks_result, timestamp_ms, latency_ms)
+
+    def _crop_frame(self, rgb_frame):
+        """
+        REGION OF INTEREST
+        Memotong frame di sekitar wajah terakhir dan (opsional) memperkecilnya
+
+        Args:
+            rgb_frame: Frame RGB ukuran penuh
+
+        Returns:
+            Tuple: (image, crop_box) - crop_box (x0, y0, x1, y1) dalam pixel,
+                   atau None jika memakai frame penuh
+        """
+        if self.roi is None:
+            return rgb_frame, None
+
+        x0, y0, x1, y1 = self.roi
+        crop = rgb_frame[y0:y1, x0:x1]
+
+        target = self.roi_target_size
+        crop_h, crop_w = crop.shape[:2]
+        if target and max(crop_h, crop_w) > target:
+            # Downscale: koordinat normalized tidak berubah oleh resize
+            scale = target / max(crop_h, crop_w)
+            crop = cv2.resize(crop, (max(1, round(crop_w * scale)), max(1, round(crop_h * scale))),
+                              interpolation=cv2.INTER_AREA)
+        else:
+            # mp.Image membutuhkan array contiguous
+            crop = np.ascontiguousarray(crop)
+
+        return crop, self.roi
+
+    @staticmethod
+    def _map_to_frame(landmarks, crop_box, frame_size):
+        """
+        Memetakan landmark normalized terhadap crop ke normalized terhadap frame penuh
+        (in-place), sehingga get_iris_positions memakai dimensi frame penuh
+
+        Args:
+            landmarks: Array (N_faces, 478, 3)
+            crop_box: (x0, y0, x1, y1) dalam pixel frame penuh
+            frame_size: (width, height) frame penuh
+        """
+        x0, y0, x1, y1 = crop_box
+        frame_w, frame_h = frame_size
+        crop_w = x1 - x0
+        crop_h = y1 - y0
+        landmarks[..., 0] = (x0 + landmarks[..., 0] * crop_w) / frame_w
+        landmarks[..., 1] = (y0 + landmarks[..., 1] * crop_h) / frame_h
+        # z memakai skala yang sama dengan x (konvensi MediaPipe)
+        landmarks[..., 2] *= crop_w / frame_w
+
+    def _update_roi(self, results, frame_size):
+        """
+        Menyimpan bounding box wajah (diperluas ROI_MARGIN) untuk frame berikutnya
+
+        Args:
+            results: FaceLandmarksResult dalam koordinat frame penuh, atau None
+            frame_size: (width, height) frame penuh
+        """
+        if not self.roi_enabled or results is None:
+            # Wajah hilang: kembali ke pencarian frame penuh
+            self.roi = None
+            return
+
+        if settings.MAX_NUM_FACES > 1 and results.num_faces < settings.MAX_NUM_FACES:
+            # Multi wajah: wajah baru di luar ROI tidak akan terlihat,
+            # cari di frame penuh secara berkala
+            self._roi_frames += 1
+            if self._roi_frames >= settings.ROI_FULL_SEARCH_INTERVAL:
+                self._roi_frames = 0
+                self.roi = None
+                return
+        else:
+            self._roi_frames = 0
+
+        # Bounding box gabungan semua wajah
+        frame_w, frame_h = frame_size
+        xy = results.landmarks[..., :2].reshape(-1, 2)
+        x_min, y_min = xy.min(axis=0) * (frame_w, frame_h)
+        x_max, y_max = xy.max(axis=0) * (frame_w, frame_h)
+
+        # Perluas bounding box agar gerakan antar frame tetap tercakup
+        size = max(x_max - x_min, y_max - y_min, settings.ROI_MIN_SIZE)
+        margin = size * settings.ROI_MARGIN
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+        half = size / 2 + margin
+
+        x0 = max(0, int(cx - half))
+        y0 = max(0, int(cy - half))
+        x1 = min(frame_w, int(cx + half) + 1)
+        y1 = min(frame_h, int(cy + half) + 1)
+
+        if (x1 - x0) * (y1 - y0) >= 0.8 * frame_w * frame_h:
+            # ROI hampir seluas frame, tidak ada keuntungan crop
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    def _infer(self, image):
+        """
+        Menjalankan FaceLandmarker sinkron (mode IMAGE / VIDEO)
+
+        Returns:
+            FaceLandmarksResult (normalized terhadap image) atau None
+        """
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+
+        start = time.monotonic()
+        if self.running_mode == 'VIDEO':
+            result = self.detector.detect_for_video(mp_image, self._next_timestamp_ms())
+        else:
+            result = self.detector.detect(mp_image)
+        self.last_latency_ms = (time.monotonic() - start) * 1000
+
+        if not result.face_landmarks:
+            return None
+
+        return FaceLandmarksResult.from_mediapipe(result.face_landmarks)
+
     def detect_face(self, rgb_frame):
         """
         Deteksi wajah pada frame RGB
 
+        Jika ROI aktif, inferensi dijalankan pada crop di sekitar wajah terakhir
+        lalu landmark dipetakan kembali ke koordinat frame penuh. Jika wajah
+        tidak ditemukan di crop, deteksi diulang pada frame penuh.
+
+        Pada mode LIVE_STREAM (selalu frame penuh) frame dikirim secara
+        asynchronous dan yang dikembalikan adalah hasil terbaru yang sudah
+        selesai (bisa tertinggal beberapa frame). Setiap hasil hanya dikembalikan
+        sekali: jika belum ada callback baru, result_is_new bernilai False dan
+        nilai kembalian (None) bukan berarti wajah hilang
+
         Args:
             rgb_frame: Frame dalam format RGB (MediaPipe requirement)
 
         Returns:
-            Mock results object compatible with old API atau None
+            FaceLandmarksResult atau None jika tidak ada wajah
         """
         # Proses deteksi menggunakan neural network (Materi 7)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-        result = self.detector.detect(mp_image)
+        if self.running_mode == 'LIVE_STREAM':
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+            self.detector.detect_async(mp_image, self._next_timestamp_ms())
+            with self._result_lock:
+                self.result_is_new = (self._latest_result_ms is not None and
+                                      self._latest_result_ms != self._consumed_result_ms)
+                if not self.result_is_new:
+                    return None
+                self._consumed_result_ms = self._latest_result_ms
+                return self._latest_result
+
+        frame_h, frame_w = rgb_frame.shape[:2]
+        frame_size = (frame_w, frame_h)
+        image, crop_box = self._crop_frame(rgb_frame)
+
+        self.result_is_new = True
+        results = self._infer(image)
+        if results is not None and crop_box is not None:
+            self._map_to_frame(results.landmarks, crop_box, frame_size)
+        elif results is None and crop_box is not None:
+            # Wajah hilang dari ROI: fallback ke frame penuh
+            results = self._infer(rgb_frame)
+
+        self._update_roi(results, frame_size)
+        return results
+
+    def warmup(self, frame_size=None):
+        """
+        Inferensi dummy untuk membayar inisialisasi graph MediaPipe di awal
+        (bukan pada frame kamera pertama)
+
+        Args:
+            frame_size: (width, height) frame dummy (default FRAME_WIDTH x FRAME_HEIGHT)
+        """
+        if frame_size is None:
+            frame_size = (settings.FRAME_WIDTH, settings.FRAME_HEIGHT)
+        width, height = frame_size
+        self.detect_face(np.zeros((height, width, 3), dtype=np.uint8))
+        self.reset_tracking()
+
+    def reset_tracking(self):
+        """
+        Reset ROI dan hasil async terakhir
+
+        Tracker internal MediaPipe (VIDEO / LIVE_STREAM) dan timestamp monotonic-nya
+        tidak ikut di-reset; untuk sumber frame yang benar-benar baru buat FaceDetector baru
+        """
+        self.roi = None
+        with self._result_lock:
+            self._latest_result = None
+            self._latest_result_ms = None
+            self._consumed_result_ms = None
 
-        # Convert to old API format for compatibility
-        if result.face_landmarks:
-            # Create mock landmark objects
-            landmarks = []
-            for lm in result.face_landmarks[0]:
-                class Landmark:
-                    def __init__(self, x, y, z):
-                        self.x = x
-                        self.y = y
-                        self.z = z
-                landmarks.append(Landmark(lm.x, lm.y, lm.z))
-
-            class FaceLandmarks:
-                def __init__(self, landmarks):
-                    self.landmark = landmarks
-
-            class MockResults:
-                def __init__(self, face_landmarks):
-                    self.multi_face_landmarks = face_landmarks
-
-            mock_results = MockResults([FaceLandmarks(landmarks)])
-            return mock_results
-        else:
-            return None
-    
     def get_iris_positions(self, landmarks, frame_width, frame_height):
         """
         FEATURE EXTRACTION
         Ekstraksi koordinat pusat iris kiri dan kanan
         
         Args:
-            landmarks: Array landmark dari MediaPipe (normalized 0-1)
+            landmarks: Array (478, 3) landmark wajah (normalized 0-1),
+                       atau list landmark format lama
             frame_width: Lebar frame dalam pixel
             frame_height: Tinggi frame dalam pixel
         
         Returns:
             Tuple: (iris_distance_pixel, left_center, right_center)
         """
-        # Konversi normalized coordinates ke pixel coordinates
-        # Hitung pusat iris kiri dari 4 landmark points (averaging)
-        left_iris_center = np.mean([
-            [landmarks[i].x * frame_width, landmarks[i].y * frame_height]
-            for i in settings.LEFT_IRIS
-        ], axis=0)
-        
-        # Hitung pusat iris kanan dari 4 landmark points
-        right_iris_center = np.mean([
-            [landmarks[i].x * frame_width, landmarks[i].y * frame_height]
-            for i in settings.RIGHT_IRIS
-        ], axis=0)
-        
+        if not isinstance(landmarks, np.ndarray):
+            # Format lama: list objek dengan atribut x, y, z
+            landmarks = np.array([[lm.x, lm.y, lm.z] for lm in landmarks],
+                                 dtype=np.float32)
+
+        # Hitung pusat iris kiri & kanan dari 4 landmark points (averaging),
+        # lalu konversi normalized coordinates ke pixel coordinates
+        centers = landmarks[IRIS_INDEX, :2].mean(axis=1) * (frame_width, frame_height)
+        left_iris_center, right_iris_center = centers[0], centers[1]
+
         # Hitung jarak Euclidean antar iris (Interpupillary Distance dalam pixel)
         # Rumus: d = sqrt((x2-x1)² + (y2-y1)²) - Distance Metrics
         iris_distance_pixel = np.linalg.norm(left_iris_center - right_iris_center)
-        
+
         return iris_distance_pixel, left_iris_center, right_iris_center
-    
+
     def close(self):
         """Release MediaPipe resources"""
         self.detector.close()
\ No newline at end of file
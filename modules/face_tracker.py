@@ -0,0 +1,139 @@
+"""
+Modul pelacakan identitas wajah antar frame
+Setiap wajah memiliki filter IPD dan state hysteresis sendiri
+"""
+
+import numpy as np
+from config import settings
+from .filters import create_filter, HysteresisGate
+
+class FaceTrack:
+    """State satu wajah yang dilacak"""
+    __slots__ = ('track_id', 'center', 'ipd_filter', 'gate', 'filtered_ipd',
+                 'distance', 'last_seen')
+
+    def __init__(self, track_id, center, timestamp):
+        self.track_id = track_id
+        self.center = center
+        self.ipd_filter = create_filter(settings.DISTANCE_FILTER)
+        self.gate = HysteresisGate()
+        self.filtered_ipd = None
+        self.distance = None
+        self.last_seen = timestamp
+
+    @property
+    def too_close(self):
+        return self.gate.too_close
+
+
+class FaceTracker:
+    """
+    Kelas untuk mencocokkan wajah pada frame baru dengan track sebelumnya
+
+    Pencocokan greedy berdasarkan jarak titik tengah kedua iris (matriks jarak
+    dihitung sekaligus dengan NumPy), dibatasi TRACK_MAX_JUMP x IPD.
+    Track yang tidak terlihat lebih dari TRACK_TTL detik dihapus.
+    """
+
+    def __init__(self, max_jump=None, ttl=None):
+        """
+        Args:
+            max_jump: Perpindahan maksimal antar frame, dalam satuan IPD (default dari settings)
+            ttl: Umur track tanpa deteksi dalam detik (default dari settings)
+        """
+        self.max_jump = settings.TRACK_MAX_JUMP if max_jump is None else max_jump
+        self.ttl = settings.TRACK_TTL if ttl is None else ttl
+        self.tracks = []
+        self._next_id = 1
+
+    def _assign(self, centers, ipds):
+        """
+        Returns:
+            List index track (atau None) untuk setiap wajah input
+        """
+        assignment = [None] * len(centers)
+        if not self.tracks or len(centers) == 0:
+            return assignment
+
+        track_centers = np.array([t.center for t in self.tracks])
+        # Matriks jarak (N_faces, N_tracks)
+        cost = np.linalg.norm(centers[:, None, :] - track_centers[None, :, :], axis=-1)
+        limit = (self.max_jump * ipds)[:, None]
+
+        used_tracks = set()
+        for flat in np.argsort(cost, axis=None):
+            face, track = divmod(int(flat), cost.shape[1])
+            if cost[face, track] > limit[face, 0]:
+                continue
+            if assignment[face] is None and track not in used_tracks:
+                assignment[face] = track
+                used_tracks.add(track)
+        return assignment
+
+    def update(self, ipds, centers, timestamp, focal_length):
+        """
+        Memperbarui track dengan deteksi frame ini
+
+        Args:
+            ipds: Array (N,) IPD mentah per wajah dalam pixel
+            centers: Array (N, 2) titik tengah kedua iris per wajah
+            timestamp: Waktu dalam detik
+            focal_length: Focal length hasil kalibrasi
+
+        Returns:
+            List FaceTrack sesuai urutan wajah input
+        """
+        ipds = np.asarray(ipds, dtype=np.float64)
+        centers = np.asarray(centers, dtype=np.float64)
+        assignment = self._assign(centers, ipds)
+
+        matched = []
+        for face, track_index in enumerate(assignment):
+            if track_index is None:
+                track = FaceTrack(self._next_id, centers[face], timestamp)
+                self._next_id += 1
+                self.tracks.append(track)
+            else:
+                track = self.tracks[track_index]
+            matched.append(track)
+
+        # Filter temporal per wajah (biaya linear terhadap jumlah wajah)
+        filtered = np.empty(len(matched))
+        for face, track in enumerate(matched):
+            value = ipds[face]
+            if track.ipd_filter is not None:
+                value = track.ipd_filter.update(value, timestamp)
+            filtered[face] = value
+
+        # Jarak semua wajah sekaligus (similar triangles)
+        with np.errstate(divide='ignore'):
+            distances = (settings.KNOWN_WIDTH * focal_length) / filtered
+
+        for face, track in enumerate(matched):
+            track.center = centers[face]
+            track.filtered_ipd = filtered[face]
+            track.distance = float(distances[face])
+            track.last_seen = timestamp
+            track.gate.update(track.distance, timestamp)
+
+        # Hapus track yang sudah lama tidak terlihat
+        self.tracks = [t for t in self.tracks if timestamp - t.last_seen <= self.ttl]
+        return matched
+
+    def any_too_close(self):
+        """True jika ada track aktif dalam state terlalu dekat"""
+        return any(t.gate.too_close for t in self.tracks)
+
+    def reset_filters(self):
+        """
+        Reset filter IPD semua track (wajah hilang): pengukuran berikutnya tidak
+        dihaluskan dengan IPD lama, state hysteresis tetap dipertahankan
+        """
+        for track in self.tracks:
+            if track.ipd_filter is not None:
+                track.ipd_filter.reset()
+            track.filtered_ipd = None
+
+    def reset(self):
+        """Menghapus semua track"""
+        self.tracks = []
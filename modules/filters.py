@@ -0,0 +1,202 @@
+"""
+Modul filter temporal untuk sinyal IPD dan hysteresis keputusan jarak
+Mengurangi jitter landmark agar mode blur tidak keluar-masuk terus-menerus
+"""
+
+import math
+from config import settings
+
+class OneEuroFilter:
+    """
+    One Euro Filter (Casiez et al., 2012)
+    Low-pass adaptif: cutoff naik saat sinyal bergerak cepat (lag kecil),
+    turun saat sinyal diam (jitter tersaring kuat)
+    """
+
+    def __init__(self, min_cutoff=None, beta=None, d_cutoff=None):
+        """
+        Args:
+            min_cutoff: Cutoff minimum dalam Hz (default dari settings)
+            beta: Koefisien kecepatan (default dari settings)
+            d_cutoff: Cutoff untuk turunan dalam Hz (default dari settings)
+        """
+        self.min_cutoff = settings.ONE_EURO_MIN_CUTOFF if min_cutoff is None else min_cutoff
+        self.beta = settings.ONE_EURO_BETA if beta is None else beta
+        self.d_cutoff = settings.ONE_EURO_D_CUTOFF if d_cutoff is None else d_cutoff
+        self.reset()
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        """Menghapus state filter"""
+        self._x = None
+        self._dx = 0.0
+        self._t = None
+
+    def update(self, value, timestamp):
+        """
+        Args:
+            value: Nilai pengukuran
+            timestamp: Waktu pengukuran dalam detik
+
+        Returns:
+            Nilai tersaring
+        """
+        if self._x is None:
+            self._x = value
+            self._t = timestamp
+            return value
+
+        dt = timestamp - self._t
+        if dt <= 0:
+            return self._x
+        self._t = timestamp
+
+        # Turunan tersaring
+        dx = (value - self._x) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._dx = a_d * dx + (1 - a_d) * self._dx
+
+        # Cutoff adaptif terhadap kecepatan
+        cutoff = self.min_cutoff + self.beta * abs(self._dx)
+        a = self._alpha(cutoff, dt)
+        self._x = a * value + (1 - a) * self._x
+        return self._x
+
+
+class ConstantVelocityKalman:
+    """
+    Kalman filter 1D dengan model kecepatan konstan
+    State: [posisi, kecepatan], pengukuran: posisi
+    """
+
+    def __init__(self, process_noise=None, measurement_noise=None):
+        """
+        Args:
+            process_noise: Variansi percepatan (default dari settings)
+            measurement_noise: Variansi pengukuran (default dari settings)
+        """
+        self.q = settings.KALMAN_PROCESS_NOISE if process_noise is None else process_noise
+        self.r = settings.KALMAN_MEASUREMENT_NOISE if measurement_noise is None else measurement_noise
+        self.reset()
+
+    def reset(self):
+        """Menghapus state filter"""
+        self._x = None
+        self._v = 0.0
+        # Kovarians 2x2 disimpan sebagai skalar terpisah (simetris)
+        self._p00 = self._p01 = self._p11 = 0.0
+        self._t = None
+
+    def update(self, value, timestamp):
+        """
+        Args:
+            value: Nilai pengukuran
+            timestamp: Waktu pengukuran dalam detik
+
+        Returns:
+            Estimasi posisi tersaring
+        """
+        if self._x is None:
+            self._x = value
+            self._v = 0.0
+            self._p00, self._p01, self._p11 = self.r, 0.0, self.r
+            self._t = timestamp
+            return value
+
+        dt = timestamp - self._t
+        if dt <= 0:
+            return self._x
+        self._t = timestamp
+
+        # Prediksi: x = x + v*dt, P = F P F^T + Q (white-noise acceleration)
+        x = self._x + self._v * dt
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + self.q * dt ** 4 / 4
+        p01 = self._p01 + dt * self._p11 + self.q * dt ** 3 / 2
+        p11 = self._p11 + self.q * dt ** 2
+
+        # Update dengan pengukuran posisi
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        residual = value - x
+        self._x = x + k0 * residual
+        self._v = self._v + k1 * residual
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        return self._x
+
+
+class HysteresisGate:
+    """
+    Keputusan "terlalu dekat" dengan dua threshold dan dwell time
+
+    - Masuk state terlalu dekat jika jarak < enter_threshold selama enter_dwell detik
+    - Keluar jika jarak > exit_threshold selama exit_dwell detik
+    """
+
+    def __init__(self, enter_threshold=None, exit_threshold=None,
+                 enter_dwell=None, exit_dwell=None):
+        self.enter_threshold = (settings.BLUR_ENTER_THRESHOLD
+                                if enter_threshold is None else enter_threshold)
+        self.exit_threshold = (settings.BLUR_EXIT_THRESHOLD
+                               if exit_threshold is None else exit_threshold)
+        self.enter_dwell = settings.BLUR_ENTER_DWELL if enter_dwell is None else enter_dwell
+        self.exit_dwell = settings.BLUR_EXIT_DWELL if exit_dwell is None else exit_dwell
+        self.too_close = False
+        self._pending_since = None
+
+    def update(self, distance, timestamp):
+        """
+        Args:
+            distance: Jarak (tersaring) dalam cm
+            timestamp: Waktu dalam detik
+
+        Returns:
+            Boolean: True jika dalam state terlalu dekat
+        """
+        if self.too_close:
+            crossing = distance > self.exit_threshold
+            dwell = self.exit_dwell
+        else:
+            crossing = distance < self.enter_threshold
+            dwell = self.enter_dwell
+
+        if not crossing:
+            self._pending_since = None
+        elif self._pending_since is None:
+            self._pending_since = timestamp
+
+        if crossing and timestamp - self._pending_since >= dwell:
+            self.too_close = not self.too_close
+            self._pending_since = None
+
+        return self.too_close
+
+    def reset(self):
+        """Kembali ke state aman"""
+        self.too_close = False
+        self._pending_since = None
+
+
+def create_filter(name):
+    """
+    Membuat filter IPD berdasarkan nama di settings
+
+    Args:
+        name: 'one_euro', 'kalman', atau None (tanpa filter)
+
+    Returns:
+        Objek filter dengan method update(value, timestamp) dan reset(), atau None
+    """
+    if name is None or name == 'none':
+        return None
+    if name == 'one_euro':
+        return OneEuroFilter()
+    if name == 'kalman':
+        return ConstantVelocityKalman()
+    raise ValueError(f"Filter tidak dikenal: {name}")
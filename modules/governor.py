@@ -0,0 +1,195 @@
+"""
+Modul governor anggaran CPU / FPS
+Menyesuaikan resolusi capture, ukuran crop inferensi dan interval deteksi
+agar pemakaian CPU tetap dalam anggaran
+"""
+
+import json
+import time
+from config import settings
+
+class BudgetGovernor:
+    """
+    Kelas untuk menjaga pemakaian CPU proses dan FPS loop dalam anggaran
+
+    Setiap GOVERNOR_INTERVAL detik diukur:
+    - CPU proses: selisih time.process_time() (semua thread) / waktu wall,
+      dalam pecahan satu core
+    - FPS dan latensi rata-rata loop deteksi (waktu tidur idle, misalnya saat
+      kursi kosong, tidak dihitung; jendela yang sebagian besar idle dilewati)
+
+    Lalu dipilih level pada GOVERNOR_LEVELS (level 0 = kualitas tertinggi):
+    - turun satu level jika CPU > anggaran atau FPS < target × GOVERNOR_FPS_TOLERANCE
+    - naik satu level jika CPU < anggaran × GOVERNOR_HEADROOM dan FPS >= target
+    Setelah perubahan, pengukuran diulang dan ditunggu GOVERNOR_COOLDOWN detik.
+    Setiap perubahan dicetak dan ditulis ke GOVERNOR_LOG_FILE (JSON per baris).
+
+    Interval re-check scheduler hanya berlaku saat jarak jauh dari threshold,
+    jadi level rendah tidak memperlambat reaksi di dekat batas aman.
+
+    Ukuran crop ROI hanya diterapkan jika ROI aktif (mode IMAGE); pada mode
+    VIDEO / LIVE_STREAM level dibedakan oleh resolusi dan interval re-check.
+
+    CPU thread compositor blur (capture + blur layar) dikurangkan dari CPU proses,
+    dan level tidak diubah selama blur aktif: saat pengguna terlalu dekat akurasi
+    jarak paling dibutuhkan.
+    """
+
+    def __init__(self, camera, face_detector, scheduler, distance_calc, enabled=None,
+                 levels=None, metrics=None, blur_compositor=None):
+        """
+        Args:
+            camera: Objek Camera (set_resolution)
+            face_detector: Objek FaceDetector (roi_target_size, reset_tracking)
+            scheduler: InferenceScheduler (min/max_recheck_interval)
+            distance_calc: DistanceCalculator (rescale saat resolusi berubah)
+            enabled: Aktifkan governor (default settings.GOVERNOR_ENABLED)
+            levels: Daftar level (default settings.GOVERNOR_LEVELS)
+            metrics: Metrics (opsional, gauge level & CPU)
+            blur_compositor: BlurCompositor (opsional, cpu_seconds & active)
+        """
+        if enabled is None:
+            enabled = settings.GOVERNOR_ENABLED
+        if levels is None:
+            levels = settings.GOVERNOR_LEVELS
+
+        self.camera = camera
+        self.face_detector = face_detector
+        self.scheduler = scheduler
+        self.distance_calc = distance_calc
+        self.enabled = enabled
+        # IPD dalam pixel sebanding dengan lebar frame: resolusi terlalu kecil
+        # memperbesar error kuantisasi jarak, level seperti itu tidak dipakai
+        self.levels = [level for level in levels
+                       if level['resolution'][0] >= settings.GOVERNOR_MIN_CAPTURE_WIDTH] or levels[:1]
+        self.metrics = metrics
+        self.blur_compositor = blur_compositor
+
+        self.level = 0
+        self.cpu = None      # Pecahan satu core pada jendela terakhir
+        self.fps = None
+        self.latency_ms = None
+        self.adjustments = 0
+
+        self.frame_width = None  # Lebar frame terakhir yang benar-benar diterima
+        self._cooldown_until = 0.0
+        self._reset_window(time.monotonic())
+
+    def _excluded_cpu(self):
+        """CPU (detik) thread yang tidak termasuk anggaran deteksi"""
+        return self.blur_compositor.cpu_seconds if self.blur_compositor is not None else 0.0
+
+    def _reset_window(self, now):
+        self._window_start = now
+        self._cpu_start = time.process_time() - self._excluded_cpu()
+        self._frames = 0
+        self._busy = 0.0
+        self._idle = 0.0
+
+    def observe_frame(self, frame):
+        """
+        Dipanggil setelah setiap read: mendeteksi resolusi yang benar-benar
+        diterapkan kamera, lalu menyesuaikan kalibrasi dan ROI
+
+        Args:
+            frame: Frame dari kamera
+        """
+        width = frame.shape[1]
+        if self.frame_width is not None and width != self.frame_width:
+            self.distance_calc.rescale(width / self.frame_width)
+            self.face_detector.reset_tracking()
+            self.scheduler.reset()
+            print(f"Governor: resolusi capture sekarang {width}x{frame.shape[0]}")
+        self.frame_width = width
+
+    def tick(self, loop_seconds, idle_seconds=0.0, now=None):
+        """
+        Mencatat satu iterasi loop dan mengevaluasi anggaran jika jendela selesai
+
+        Args:
+            loop_seconds: Durasi iterasi loop (tanpa tidur idle)
+            idle_seconds: Waktu tidur idle pada iterasi ini
+            now: Waktu saat ini (default time.monotonic())
+        """
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.monotonic()
+        self._frames += 1
+        self._busy += loop_seconds
+        self._idle += idle_seconds
+
+        elapsed = now - self._window_start
+        if elapsed < settings.GOVERNOR_INTERVAL:
+            return
+
+        active = elapsed - self._idle
+        self.cpu = (time.process_time() - self._excluded_cpu() - self._cpu_start) / elapsed
+        self.fps = self._frames / active if active > 0 else 0.0
+        self.latency_ms = self._busy / self._frames * 1000
+        self._reset_window(now)
+        if active < elapsed / 2:
+            # Sebagian besar idle (kursi kosong): tidak representatif
+            return
+
+        if self.metrics is not None:
+            self.metrics.gauge('governor_level', self.level)
+            self.metrics.gauge('process_cpu_fraction', round(self.cpu, 4))
+
+        if now < self._cooldown_until:
+            return
+        if self.blur_compositor is not None and self.blur_compositor.active:
+            # Pengguna terlalu dekat: pertahankan resolusi / ROI
+            return
+
+        over_budget = (self.cpu > settings.GOVERNOR_CPU_BUDGET or
+                       self.fps < settings.GOVERNOR_TARGET_FPS * settings.GOVERNOR_FPS_TOLERANCE)
+        headroom = (self.cpu < settings.GOVERNOR_CPU_BUDGET * settings.GOVERNOR_HEADROOM and
+                    self.fps >= settings.GOVERNOR_TARGET_FPS)
+
+        if over_budget and self.level < len(self.levels) - 1:
+            reason = 'cpu' if self.cpu > settings.GOVERNOR_CPU_BUDGET else 'fps'
+            self._set_level(self.level + 1, f'over_budget_{reason}', now)
+        elif headroom and self.level > 0:
+            self._set_level(self.level - 1, 'headroom', now)
+
+    def _set_level(self, level, reason, now):
+        """Menerapkan level baru dan mencatatnya ke audit log"""
+        previous = self.level
+        config = self.levels[level]
+        self.level = level
+        self.adjustments += 1
+        self._cooldown_until = now + settings.GOVERNOR_COOLDOWN
+
+        width, height = config['resolution']
+        if tuple(config['resolution']) != tuple(self.levels[previous]['resolution']):
+            self.camera.set_resolution(width, height)
+        roi_enabled = getattr(self.face_detector, 'roi_enabled', False)
+        if roi_enabled:
+            self.face_detector.roi_target_size = config['roi_size']
+        self.scheduler.min_recheck_interval, self.scheduler.max_recheck_interval = config['recheck']
+
+        entry = {
+            'time': time.time(),
+            'from_level': previous,
+            'to_level': level,
+            'reason': reason,
+            'cpu': round(self.cpu, 4),
+            'fps': round(self.fps, 2),
+            'latency_ms': round(self.latency_ms, 2),
+            'resolution': [width, height],
+            'recheck': list(config['recheck']),
+        }
+        roi_text = ""
+        if roi_enabled:
+            entry['roi_size'] = config['roi_size']
+            roi_text = f", ROI {config['roi_size']}"
+        print(f"Governor: level {previous} -> {level} ({reason}, CPU {self.cpu * 100:.0f}%, "
+              f"{self.fps:.1f} FPS): {width}x{height}{roi_text}, "
+              f"re-check {config['recheck'][0]}-{config['recheck'][1]} s")
+        if settings.GOVERNOR_LOG_FILE:
+            try:
+                with open(settings.GOVERNOR_LOG_FILE, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"Gagal menulis log governor: {e}")
@@ -1,8 +1,45 @@
 import cv2
+import numpy as np
 from config import settings
 
+def _kernel_sigma(ksize):
+    """Sigma Gaussian yang dipakai OpenCV untuk kernel berukuran ksize (sigma=0)"""
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def _box_blur_integral(frame, radius):
+    """
+    Box blur satu pass menggunakan integral image
+    Biaya konstan per pixel, tidak bergantung pada ukuran kernel
+
+    Args:
+        frame: Image array uint8
+        radius: Radius box (ukuran box = 2r + 1)
+
+    Returns:
+        Image array uint8
+    """
+    size = 2 * radius + 1
+    padded = cv2.copyMakeBorder(frame, radius, radius, radius, radius, cv2.BORDER_REPLICATE)
+
+    # Integral 32-bit cukup selama total seluruh gambar tidak overflow
+    rows, cols = padded.shape[:2]
+    sdepth = cv2.CV_32S if 255 * (rows + 1) * (cols + 1) < 2 ** 31 else cv2.CV_64F
+    integral = cv2.integral(padded, sdepth=sdepth)
+    if integral.ndim == 2:
+        integral = integral[:, :, None]
+
+    box_sum = (integral[size:, size:] - integral[:-size, size:]
+               - integral[size:, :-size] + integral[:-size, :-size])
+    blurred = (box_sum + (size * size) // 2) // (size * size)
+    return blurred.astype(np.uint8).reshape(frame.shape)
+
+
 class ImageProcessor:
     
+    # Backend blur yang tersedia untuk apply_blur (lihat settings.BLUR_BACKEND)
+    BLUR_BACKENDS = ('gaussian', 'pyramid', 'box', 'stack')
+    
     @staticmethod
     def apply_gaussian_blur(frame):
         """
@@ -23,6 +60,116 @@ class ImageProcessor:
         
         return blurred
     
+    @staticmethod
+    def blur_pyramid(frame, ksize, levels=None, dst=None):
+        """
+        Blur pada level pyramid: pyrDown -> Gaussian kernel kecil -> upscale
+        Kernel diskalakan 1/2^levels sehingga radius blur efektif setara
+
+        Args:
+            frame: Input image array (BGR)
+            ksize: Ukuran kernel (w, h) pada resolusi penuh
+            levels: Jumlah level pyrDown (default dari settings)
+            dst: Buffer output resolusi penuh yang dipakai ulang (opsional)
+
+        Returns:
+            Blurred image array
+        """
+        if levels is None:
+            levels = settings.BLUR_PYRAMID_LEVELS
+
+        small = frame
+        for _ in range(levels):
+            small = cv2.pyrDown(small)
+
+        factor = 2 ** levels
+        small_ksize = tuple(max(3, (k // factor) | 1) for k in ksize)
+        small = cv2.GaussianBlur(small, small_ksize, 0)
+
+        height, width = frame.shape[:2]
+        return cv2.resize(small, (width, height), dst=dst, interpolation=cv2.INTER_LINEAR)
+
+    @staticmethod
+    def blur_box(frame, ksize, passes=3, dst=None):
+        """
+        Aproksimasi Gaussian dengan box blur berulang via integral image
+        (Central Limit Theorem: box blur n kali mendekati Gaussian)
+
+        Args:
+            frame: Input image array (BGR)
+            ksize: Ukuran kernel Gaussian (w, h) yang didekati
+            passes: Jumlah pass box blur
+            dst: Buffer output yang dipakai ulang (opsional)
+
+        Returns:
+            Blurred image array
+        """
+        sigma = _kernel_sigma(max(ksize))
+        # Lebar box ideal untuk n pass: w = sqrt(12σ²/n + 1)
+        width = np.sqrt(12 * sigma * sigma / passes + 1)
+        radius = max(1, int(round((width - 1) / 2)))
+
+        blurred = frame
+        for _ in range(passes):
+            blurred = _box_blur_integral(blurred, radius)
+        if dst is not None and dst.shape == blurred.shape and dst.dtype == blurred.dtype:
+            np.copyto(dst, blurred)
+            return dst
+        return blurred
+
+    @staticmethod
+    def blur_stack(frame, ksize, dst=None):
+        """
+        Stack blur (OpenCV >= 4.7), fallback ke box blur jika tidak tersedia
+
+        Args:
+            frame: Input image array (BGR)
+            ksize: Ukuran kernel (w, h), harus ganjil
+            dst: Buffer output yang dipakai ulang (opsional)
+
+        Returns:
+            Blurred image array
+        """
+        if hasattr(cv2, 'stackBlur'):
+            return cv2.stackBlur(frame, ksize, dst=dst)
+        return ImageProcessor.blur_box(frame, ksize, dst=dst)
+
+    @staticmethod
+    def apply_blur(frame, backend=None, ksize=None, dst=None):
+        """
+        Blur dengan backend yang bisa dipilih (trade-off kecepatan vs kualitas)
+
+        Backend:
+            'gaussian': cv2.GaussianBlur exact (referensi)
+            'pyramid': downsample - blur - upsample
+            'box': box blur berulang via integral image
+            'stack': stack blur
+
+        Args:
+            frame: Input image array (BGR)
+            backend: Nama backend (default settings.BLUR_BACKEND)
+            ksize: Ukuran kernel (default settings.BLUR_KERNEL_SIZE)
+            dst: Buffer output yang dipakai ulang (opsional, ukuran sama dengan frame;
+                 jika tidak cocok dialokasikan array baru)
+
+        Returns:
+            Blurred image array (dst jika dipakai)
+        """
+        if backend is None:
+            backend = settings.BLUR_BACKEND
+        if ksize is None:
+            ksize = settings.BLUR_KERNEL_SIZE
+
+        if backend == 'gaussian':
+            return cv2.GaussianBlur(frame, ksize, 0, dst=dst)
+        if backend == 'pyramid':
+            return ImageProcessor.blur_pyramid(frame, ksize, dst=dst)
+        if backend == 'box':
+            return ImageProcessor.blur_box(frame, ksize, dst=dst)
+        if backend == 'stack':
+            return ImageProcessor.blur_stack(frame, ksize, dst=dst)
+        raise ValueError(f"Backend blur tidak dikenal: {backend}")
+    
     @staticmethod
     def add_warning_text(frame, text, position=(50, 100), color=None):
         """
@@ -84,4 +231,23 @@ class ImageProcessor:
                  tuple(right_center.astype(int)), 
                  settings.LINE_COLOR, 2)
         
+        return frame
+    
+    @staticmethod
+    def add_metrics_overlay(frame, fps, latency_ms=None):
+        """
+        Menambahkan overlay FPS dan latensi inferensi (pojok kanan atas)
+        
+        Args:
+            frame: Input frame
+            fps: FPS efektif loop
+            latency_ms: Latensi p50 detect_face dalam ms (opsional)
+        """
+        text = f'FPS: {fps:.1f}'
+        if latency_ms is not None:
+            text += f' | Inferensi: {latency_ms:.1f} ms'
+        
+        cv2.putText(frame, text, (frame.shape[1] - 330, 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.55, settings.LINE_COLOR, 1)
+        
         return frame
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Modul untuk menjadwalkan inferensi landmark
+Melewati inferensi yang redundan saat pengguna diam dan jauh dari threshold
+"""
+
+import time
+import cv2
+import numpy as np
+from config import settings
+
+class InferenceScheduler:
+    """
+    Kelas untuk memutuskan apakah FaceDetector perlu dijalankan pada frame ini
+
+    Sinyal yang dipakai:
+    - Gerakan: selisih absolut rata-rata frame grayscale yang di-downsample
+      terhadap frame referensi (frame saat inferensi terakhir)
+    - Margin: selisih jarak terakhir terhadap DISTANCE_THRESHOLD
+    - Interval re-check: inferensi dipaksa berjalan setelah interval tertentu,
+      semakin besar margin semakin panjang interval (dibatasi MAX)
+    """
+
+    def __init__(self, enabled=None):
+        """
+        Inisialisasi scheduler
+
+        Args:
+            enabled: True untuk mengaktifkan scheduler (default dari settings)
+        """
+        if enabled is None:
+            enabled = settings.SCHEDULER_ENABLED
+        self.enabled = enabled
+
+        # Batas interval re-check, bisa diubah saat runtime (governor)
+        self.min_recheck_interval = settings.SCHEDULER_MIN_RECHECK_INTERVAL
+        self.max_recheck_interval = settings.SCHEDULER_MAX_RECHECK_INTERVAL
+
+        self._reference = None       # Frame kecil saat inferensi terakhir
+        self._last_run_time = None
+        self.last_motion = 0.0
+
+        # Statistik
+        self.runs = 0
+        self.skips = 0
+
+    def _downsample(self, frame):
+        """Frame grayscale berukuran SCHEDULER_MOTION_SIZE (sangat murah)"""
+        small = cv2.resize(frame, settings.SCHEDULER_MOTION_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def recheck_interval(self, distance):
+        """
+        Interval maksimal antar inferensi untuk jarak tertentu
+
+        Args:
+            distance: Jarak terakhir dalam cm
+
+        Returns:
+            Interval dalam detik, atau 0 jika harus selalu inferensi
+        """
+        margin = distance - settings.DISTANCE_THRESHOLD
+        if margin < settings.SCHEDULER_SAFE_MARGIN:
+            # Dekat threshold (atau sudah terlalu dekat): selalu inferensi
+            return 0.0
+
+        # Interpolasi linear dari MIN (di batas margin aman) ke MAX (2x margin aman)
+        ratio = min(1.0, (margin - settings.SCHEDULER_SAFE_MARGIN) / settings.SCHEDULER_SAFE_MARGIN)
+        return (self.min_recheck_interval +
+                ratio * (self.max_recheck_interval - self.min_recheck_interval))
+
+    def should_run(self, frame, last_distance, now=None):
+        """
+        Memutuskan apakah inferensi perlu dijalankan
+
+        Args:
+            frame: Frame BGR dari kamera
+            last_distance: Jarak terakhir dalam cm, atau None jika belum ada
+                           (belum kalibrasi / wajah tidak terdeteksi)
+            now: Waktu saat ini (default time.monotonic())
+
+        Returns:
+            Boolean: True jika inferensi harus dijalankan
+        """
+        if not self.enabled:
+            self.runs += 1
+            return True
+
+        if now is None:
+            now = time.monotonic()
+
+        small = self._downsample(frame)
+
+        run = True
+        if last_distance is not None and self._reference is not None:
+            self.last_motion = float(np.mean(cv2.absdiff(small, self._reference)))
+            interval = self.recheck_interval(last_distance)
+            run = (self.last_motion > settings.SCHEDULER_MOTION_THRESHOLD or
+                   now - self._last_run_time >= interval)
+
+        if run:
+            self._reference = small
+            self._last_run_time = now
+            self.runs += 1
+        else:
+            self.skips += 1
+
+        return run
+
+    def reset(self):
+        """Paksa inferensi pada frame berikutnya"""
+        self._reference = None
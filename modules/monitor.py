@@ -0,0 +1,75 @@
+"""
+Modul state machine monitor jarak
+Satu sumber kebenaran untuk state aplikasi; komponen lain (blur, alert)
+berlangganan perubahan state alih-alih menjalankan loop sendiri
+"""
+
+import time
+
+CALIBRATING = 'calibrating'
+SAFE = 'safe'
+TOO_CLOSE = 'too_close'
+NO_FACE = 'no_face'
+PAUSED = 'paused'
+
+STATES = (CALIBRATING, SAFE, TOO_CLOSE, NO_FACE, PAUSED)
+
+
+class MonitorStateMachine:
+    """
+    Kelas state machine monitor
+
+    State diturunkan dari hasil pipeline deteksi setiap frame (hysteresis
+    terlalu dekat sudah ditangani DistanceCalculator), sehingga di sini hanya
+    transisi yang dicatat dan diteruskan ke listener:
+        listener(old_state, new_state, now)
+    """
+
+    def __init__(self):
+        self.state = None
+        self.since = None        # Waktu masuk state saat ini
+        self.transitions = 0
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Mendaftarkan callback perubahan state
+
+        Args:
+            listener: Callable(old_state, new_state, now)
+        """
+        self._listeners.append(listener)
+
+    def update(self, state, now=None):
+        """
+        Memperbarui state dari hasil frame terbaru
+
+        Args:
+            state: Salah satu STATES
+            now: Waktu saat ini (default time.monotonic())
+
+        Returns:
+            Boolean: True jika state berubah
+        """
+        if state not in STATES:
+            raise ValueError(f"State monitor tidak dikenal: {state}")
+        if state == self.state:
+            return False
+        if now is None:
+            now = time.monotonic()
+
+        old_state = self.state
+        self.state = state
+        self.since = now
+        self.transitions += 1
+        for listener in self._listeners:
+            listener(old_state, state, now)
+        return True
+
+    def duration(self, now=None):
+        """Lama berada di state saat ini (detik)"""
+        if self.since is None:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        return now - self.since
@@ -0,0 +1,216 @@
+"""
+Modul monitoring multi-kamera dengan satu proses per kamera
+Frame dibagikan lewat shared memory, hasil diagregasi menjadi satu status stream
+"""
+
+import multiprocessing as mp_proc
+import queue
+import time
+
+import cv2
+import numpy as np
+from config import settings
+from utils.shared_frame import SharedFrameBuffer
+
+
+def camera_worker(camera_index, shm_name, frame_shape, result_queue, stop_event):
+    """
+    Proses worker: capture + inferensi + jarak untuk satu kamera
+    Setiap worker memiliki FaceDetector, DistanceCalculator, dan kalibrasi sendiri
+
+    Args:
+        camera_index: Index kamera
+        shm_name: Nama SharedFrameBuffer untuk frame terbaru
+        frame_shape: Bentuk frame di shared memory (height, width, 3)
+        result_queue: multiprocessing.Queue untuk status (dict kecil)
+        stop_event: multiprocessing.Event untuk berhenti
+    """
+    # Import di dalam proses worker (tidak perlu di-pickle)
+    from modules import FaceDetector, DistanceCalculator, InferenceScheduler
+    from utils import Camera, CalibrationStore
+
+    frame_buffer = SharedFrameBuffer(frame_shape, name=shm_name)
+    camera = None
+    face_detector = None
+
+    def send(status):
+        try:
+            result_queue.put_nowait(status)
+        except queue.Full:
+            pass  # Supervisor tertinggal: buang status lama, jangan blokir worker
+
+    try:
+        camera = Camera(camera_index)
+        face_detector = FaceDetector()
+        distance_calc = DistanceCalculator()
+        scheduler = InferenceScheduler()
+
+        calibration_store = CalibrationStore()
+        width, height = camera.get_frame_dimensions()
+        calibration_key = CalibrationStore.make_key(camera_index, camera.get_device_id(), width, height)
+        cached = calibration_store.load(calibration_key) if settings.CALIBRATION_CACHE_ENABLED else None
+        if cached is not None:
+            distance_calc.load_calibration(cached['focal_length'])
+
+        resized = None
+        measurement = None
+        last_distance = None
+        frames = 0
+        fps_since = time.monotonic()
+        fps = 0.0
+
+        while not stop_event.is_set() and camera.is_opened():
+            success, frame = camera.read_frame()
+            if not success:
+                break
+
+            # Frame terbaru ke shared memory (disesuaikan dengan ukuran buffer)
+            if frame.shape != frame_buffer.shape:
+                if resized is None:
+                    resized = np.empty(frame_buffer.shape, dtype=np.uint8)
+                cv2.resize(frame, (frame_buffer.shape[1], frame_buffer.shape[0]), dst=resized)
+                frame_buffer.write(resized)
+            else:
+                frame_buffer.write(frame)
+
+            h, w = frame.shape[:2]
+            if scheduler.should_run(frame, last_distance):
+                results = face_detector.detect_face(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                if not face_detector.result_is_new:
+                    pass  # LIVE_STREAM: belum ada hasil baru, pakai measurement sebelumnya
+                elif results is not None:
+                    # Semua wajah sekaligus: blur jika wajah mana pun terlalu dekat
+                    measurement = results.iris_positions(w, h)
+                else:
+                    last_distance = None
+                    distance_calc.reset_filter()
+
+            status = {'camera': camera_index, 'state': 'no_face', 'distance_cm': None,
+                      'too_close': distance_calc.too_close}
+            if measurement is not None:
+                iris_distances_px, left_centers, right_centers = measurement
+                if not distance_calc.is_calibrated:
+                    # Kalibrasi dengan wajah terdekat (IPD terbesar)
+                    distance_calc.calibrate(float(iris_distances_px.max()))
+                    status['state'] = 'calibrating'
+                    if distance_calc.is_calibrated and settings.CALIBRATION_CACHE_ENABLED:
+                        calibration_store.save(calibration_key, distance_calc.focal_length)
+                else:
+                    face_distances, too_close, tracks = distance_calc.update_faces(
+                        iris_distances_px, (left_centers + right_centers) / 2
+                    )
+                    if face_distances is None:
+                        # Drift terhadap focal length cache: kalibrasi ulang
+                        last_distance = None
+                        status['state'] = 'calibrating'
+                    else:
+                        # Wajah terdekat menentukan jarak yang dilaporkan dan scheduling
+                        distance = float(face_distances.min())
+                        last_distance = distance
+                        status.update(state='measuring', distance_cm=distance, too_close=too_close,
+                                      faces=len(tracks))
+
+            frames += 1
+            now = time.monotonic()
+            if now - fps_since >= 1.0:
+                fps = frames / (now - fps_since)
+                frames = 0
+                fps_since = now
+            status['fps'] = round(fps, 1)
+            status['timestamp'] = time.time()
+            send(status)
+
+    except Exception as e:
+        send({'camera': camera_index, 'state': 'error', 'error': str(e), 'timestamp': time.time()})
+
+    finally:
+        if camera is not None:
+            camera.release()
+        if face_detector is not None:
+            face_detector.close()
+        frame_buffer.close()
+
+
+class MultiCameraSupervisor:
+    """
+    Kelas supervisor: menjalankan satu proses worker per kamera dan
+    mengagregasi status semua kamera
+    """
+
+    def __init__(self, camera_indices, frame_shape=None):
+        """
+        Args:
+            camera_indices: List index kamera
+            frame_shape: Bentuk frame shared memory (default FRAME_HEIGHT x FRAME_WIDTH x 3)
+        """
+        if frame_shape is None:
+            frame_shape = (settings.FRAME_HEIGHT, settings.FRAME_WIDTH, 3)
+        self.camera_indices = list(camera_indices)
+        self.frame_shape = frame_shape
+
+        self._result_queue = mp_proc.Queue(maxsize=settings.MULTI_CAMERA_QUEUE_SIZE)
+        self._stop_event = mp_proc.Event()
+        self.buffers = {}
+        self.processes = {}
+        self.status = {}
+
+    def start(self):
+        """Membuat shared memory dan menjalankan proses worker"""
+        for index in self.camera_indices:
+            buffer = SharedFrameBuffer(self.frame_shape, create=True)
+            process = mp_proc.Process(
+                target=camera_worker, name=f'CameraWorker-{index}',
+                args=(index, buffer.name, self.frame_shape, self._result_queue, self._stop_event),
+                daemon=True,
+            )
+            process.start()
+            self.buffers[index] = buffer
+            self.processes[index] = process
+            self.status[index] = {'camera': index, 'state': 'starting'}
+
+    def poll_status(self):
+        """
+        Mengambil semua status baru dari worker (non-blocking)
+
+        Returns:
+            Dict status agregat: per kamera dan apakah ada yang terlalu dekat
+        """
+        while True:
+            try:
+                status = self._result_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.status[status['camera']] = status
+
+        for index, process in self.processes.items():
+            if not process.is_alive() and self.status[index].get('state') != 'error':
+                self.status[index] = {'camera': index, 'state': 'stopped'}
+
+        return {
+            'timestamp': time.time(),
+            'cameras': dict(self.status),
+            'any_too_close': any(s.get('too_close') for s in self.status.values()),
+            'alive': sum(p.is_alive() for p in self.processes.values()),
+        }
+
+    def latest_frame(self, camera_index, out=None):
+        """
+        Frame terbaru kamera dari shared memory
+
+        Returns:
+            Image array BGR atau None
+        """
+        _, frame = self.buffers[camera_index].read(out)
+        return frame
+
+    def stop(self, timeout=3.0):
+        """Menghentikan worker dan membersihkan shared memory"""
+        self._stop_event.set()
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for buffer in self.buffers.values():
+            buffer.close()
+        self.buffers.clear()
+        self.processes.clear()
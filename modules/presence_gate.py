@@ -0,0 +1,156 @@
+"""
+OBJECT DETECTION (PRESENCE CHECK)
+Modul gerbang kehadiran wajah yang murah di depan face landmarker
+"""
+
+import time
+import cv2
+import numpy as np
+from config import settings
+
+class PresenceGate:
+    """
+    Kelas untuk menahan inferensi landmark saat tidak ada orang di depan kamera
+
+    - Selama wajah terlihat (landmarker menemukan wajah), gate terbuka dan tidak
+      menambah biaya apa pun
+    - Setelah landmarker kehilangan wajah PRESENCE_LOST_FRAMES kali berturut-turut,
+      pemeriksaan kehadiran memakai Haar cascade OpenCV pada frame grayscale
+      kecil (PRESENCE_DOWNSCALE_WIDTH)
+    - Selama kursi kosong, interval pemeriksaan digandakan dari
+      PRESENCE_MIN_INTERVAL hingga PRESENCE_MAX_INTERVAL (back-off)
+    - Landmarker tetap dicoba setiap PRESENCE_LANDMARKER_PROBE_INTERVAL, karena
+      Haar frontal bisa gagal pada wajah menyamping yang masih terbaca landmarker
+    """
+
+    def __init__(self, enabled=None):
+        """
+        Args:
+            enabled: Aktifkan gate (default settings.PRESENCE_GATE_ENABLED)
+        """
+        if enabled is None:
+            enabled = settings.PRESENCE_GATE_ENABLED
+        self.enabled = enabled
+
+        self.present = True          # Mulai dengan asumsi ada wajah (landmarker langsung jalan)
+        self.interval = settings.PRESENCE_MIN_INTERVAL
+        self._next_check = 0.0
+        self._next_probe = 0.0
+        self._misses = 0             # Inferensi berturut-turut tanpa wajah
+        self._cascade = None         # Di-load saat pemeriksaan pertama
+        self._small = None           # Buffer frame kecil
+        self._gray = None
+
+        # Statistik
+        self.checks = 0
+        self.skips = 0
+
+    def _load_cascade(self):
+        """Memuat Haar cascade wajah frontal bawaan OpenCV"""
+        path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            print(f"Haar cascade tidak ditemukan ({path}), presence gate dinonaktifkan")
+            self.enabled = False
+            return None
+        return cascade
+
+    def _face_visible(self, frame):
+        """
+        Deteksi wajah murah pada frame yang diperkecil
+
+        Returns:
+            Boolean: True jika minimal satu wajah terdeteksi
+        """
+        h, w = frame.shape[:2]
+        width = settings.PRESENCE_DOWNSCALE_WIDTH
+        size = (width, max(1, round(h * width / w)))
+        if self._small is None or self._small.shape[:2] != (size[1], size[0]):
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        faces = self._cascade.detectMultiScale(
+            self._gray, scaleFactor=1.2, minNeighbors=3,
+            minSize=(settings.PRESENCE_MIN_FACE_SIZE, settings.PRESENCE_MIN_FACE_SIZE)
+        )
+        return len(faces) > 0
+
+    def should_run(self, frame, now=None):
+        """
+        Memutuskan apakah landmarker perlu dijalankan pada frame ini
+
+        Args:
+            frame: Frame BGR dari kamera
+            now: Waktu saat ini (default time.monotonic())
+
+        Returns:
+            Boolean: True jika landmarker boleh dijalankan
+        """
+        if not self.enabled or self.present:
+            return True
+        if now is None:
+            now = time.monotonic()
+
+        if now >= self._next_probe:
+            # Sesekali biarkan landmarker mencoba sendiri
+            self._next_probe = now + settings.PRESENCE_LANDMARKER_PROBE_INTERVAL
+            return True
+
+        if now < self._next_check:
+            self.skips += 1
+            return False
+
+        if self._cascade is None:
+            self._cascade = self._load_cascade()
+            if self._cascade is None:
+                return True
+
+        self.checks += 1
+        if self._face_visible(frame):
+            self.present = True
+            self.interval = settings.PRESENCE_MIN_INTERVAL
+            return True
+
+        # Kursi masih kosong: perpanjang interval pemeriksaan
+        self._next_check = now + self.interval
+        self.interval = min(self.interval * 2, settings.PRESENCE_MAX_INTERVAL)
+        return False
+
+    def idle_delay(self, now=None):
+        """
+        Waktu tunggu hingga pemeriksaan berikutnya (untuk tidur di loop utama)
+
+        Returns:
+            Detik, 0 jika gate terbuka
+        """
+        if not self.enabled or self.present:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, min(self._next_check, self._next_probe) - now)
+
+    def face_seen(self):
+        """Dipanggil saat landmarker menemukan wajah"""
+        self._misses = 0
+        self.present = True
+        self.interval = settings.PRESENCE_MIN_INTERVAL
+
+    def face_lost(self, now=None):
+        """Dipanggil saat landmarker kehilangan wajah: mulai pemeriksaan murah"""
+        if not self.enabled or not self.present:
+            return
+        self._misses += 1
+        if self._misses < settings.PRESENCE_LOST_FRAMES:
+            return
+        if now is None:
+            now = time.monotonic()
+        self.present = False
+        self.interval = settings.PRESENCE_MIN_INTERVAL
+        self._next_check = now + self.interval
+        self._next_probe = now + settings.PRESENCE_LANDMARKER_PROBE_INTERVAL
+
+    def reset(self):
+        """Buka gate (misalnya setelah kalibrasi ulang atau resume)"""
+        self.face_seen()
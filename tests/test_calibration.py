@@ -0,0 +1,43 @@
+"""
+Test kalibrasi focal length: berhenti lebih awal dengan timestamp realistis
+"""
+
+import numpy as np
+from config import settings
+from modules.distance_calculator import DistanceCalculator
+
+
+def _run_calibration(fps, noise, seed=0):
+    """
+    Memberi sampel IPD ber-noise pada laju fps sampai kalibrasi selesai
+
+    Returns:
+        Tuple: (DistanceCalculator, rentang waktu sampel dalam detik)
+    """
+    rng = np.random.default_rng(seed)
+    calc = DistanceCalculator()
+    ipd_px = 64.0
+    start = 1000.0
+    for frame in range(settings.CALIBRATION_FRAMES):
+        timestamp = start + frame / fps
+        pixel_width = ipd_px * (1 + rng.normal(0, noise))
+        if calc.calibrate(pixel_width, timestamp):
+            break
+    return calc, timestamp - start
+
+
+def test_early_stop_at_30_fps():
+    calc, span = _run_calibration(fps=30, noise=0.005)
+
+    assert calc.is_calibrated
+    assert calc.calibration_count < settings.CALIBRATION_FRAMES
+    assert calc.calibration_precision <= settings.CALIBRATION_TOLERANCE
+    # Tidak berhenti sebelum rentang waktu minimal tercapai
+    assert span >= settings.CALIBRATION_MIN_SECONDS
+
+
+def test_noisy_samples_use_frame_cap():
+    calc, _ = _run_calibration(fps=30, noise=0.1)
+
+    assert calc.is_calibrated
+    assert calc.calibration_count == settings.CALIBRATION_FRAMES
@@ -2,5 +2,12 @@
 Package initialization untuk utils
 """
 from .camera import Camera
+from .metrics import Metrics
+from .control import ControlChannel
+from .calibration_store import CalibrationStore
+from .preprocess import FramePreprocessor
+from .event_log import EventLog, read_event_log
+from .distance_history import DistanceHistory
 
-__all__ = ['Camera']
\ No newline at end of file
+__all__ = ['Camera', 'Metrics', 'ControlChannel', 'CalibrationStore', 'FramePreprocessor',
+           'EventLog', 'read_event_log', 'DistanceHistory']
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Modul penyimpanan hasil kalibrasi focal length di disk
+Kunci: index kamera + identitas device + resolusi capture
+"""
+
+import json
+import os
+import time
+from config import settings
+
+class CalibrationStore:
+    """
+    Kelas untuk menyimpan dan memuat focal length hasil kalibrasi (file JSON kecil)
+    sehingga monitoring langsung aktif sejak frame pertama
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Path file cache (default settings.CALIBRATION_CACHE_FILE)
+        """
+        self.path = settings.CALIBRATION_CACHE_FILE if path is None else path
+
+    @staticmethod
+    def make_key(camera_index, device_id, width, height):
+        """
+        Membuat kunci cache
+
+        Returns:
+            String kunci, contoh "0|HD Webcam|640x480"
+        """
+        return f"{camera_index}|{device_id}|{width}x{height}"
+
+    def _read(self):
+        """Membaca seluruh isi cache (dict kosong jika belum ada / rusak)"""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        """Menulis cache secara atomik"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def load(self, key):
+        """
+        Args:
+            key: Kunci dari make_key()
+
+        Returns:
+            Dict {'focal_length', 'saved_at'} atau None jika tidak ada
+        """
+        return self._read().get(key)
+
+    def save(self, key, focal_length):
+        """
+        Menyimpan focal length untuk kunci tertentu
+
+        Args:
+            key: Kunci dari make_key()
+            focal_length: Focal length dalam pixel
+        """
+        entries = self._read()
+        entries[key] = {
+            'focal_length': float(focal_length),
+            'known_distance': settings.KNOWN_DISTANCE,
+            'known_width': settings.KNOWN_WIDTH,
+            'saved_at': time.time(),
+        }
+        self._write(entries)
+
+    def invalidate(self, key=None):
+        """
+        Menghapus entry cache
+
+        Args:
+            key: Kunci yang dihapus, None untuk menghapus semua
+        """
+        if key is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        entries = self._read()
+        if entries.pop(key, None) is not None:
+            self._write(entries)
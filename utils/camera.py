@@ -3,70 +3,336 @@ Modul untuk handling webcam operations
 Abstraksi untuk memudahkan testing dan maintenance
 """
 
+import os
+import threading
 import cv2
+import numpy as np
 from config import settings
 
 class Camera:
     """
     Kelas untuk mengelola operasi webcam
     Wrapping OpenCV VideoCapture untuk kemudahan penggunaan
+
+    Mode threaded: thread produser membaca frame ke ring buffer yang sudah
+    dialokasikan di awal, consumer selalu mendapat frame terbaru (frame lama dibuang)
     """
-    
-    def __init__(self, camera_index=None):
+
+    def __init__(self, camera_index=None, threaded=None, buffer_size=None, mirror=True):
         """
         Inisialisasi kamera
-        
+
         Args:
             camera_index: Index kamera (default dari settings)
+            threaded: True untuk capture di background thread (default dari settings)
+            buffer_size: Jumlah slot ring buffer (default dari settings, minimal 3)
+            mirror: True untuk flip horizontal (efek cermin) saat read_frame
         """
         if camera_index is None:
             camera_index = settings.CAMERA_INDEX
-        
+        if threaded is None:
+            threaded = settings.CAMERA_THREADED
+        if buffer_size is None:
+            buffer_size = settings.CAMERA_BUFFER_SIZE
+
         # Inisialisasi VideoCapture dengan index kamera
+        self.camera_index = camera_index
         self.cap = cv2.VideoCapture(camera_index)
-        
+
         # Set resolusi kamera untuk performa optimal
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.FRAME_WIDTH)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.FRAME_HEIGHT)
-        
+
         # Validasi apakah kamera berhasil dibuka
         if not self.cap.isOpened():
             raise RuntimeError("Gagal membuka kamera!")
-    
-    def read_frame(self):
+
+        # Statistik frame (hanya bermakna pada mode threaded)
+        self.dropped_frames = 0    # Frame yang ditimpa sebelum sempat dibaca consumer
+        self.duplicate_frames = 0  # Frame yang sama dikembalikan lebih dari sekali
+
+        self.mirror = mirror
+        self.threaded = threaded
+        self._thread = None
+        if self.threaded:
+            self._start_capture_thread(max(3, buffer_size))
+
+    def _start_capture_thread(self, buffer_size):
+        """
+        Menyiapkan ring buffer dan menjalankan thread produser
+
+        Frame pertama dibaca secara sinkron untuk mengetahui dimensi buffer
+
+        Args:
+            buffer_size: Jumlah slot ring buffer
+        """
+        # Antrian driver cukup 1 frame, sisanya ditangani ring buffer
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        success, frame = self.cap.read()
+        if not success:
+            raise RuntimeError("Gagal membaca frame pertama dari kamera!")
+
+        self._buffer = np.empty((buffer_size,) + frame.shape, dtype=frame.dtype)
+        self._buffer[0] = frame
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._latest_slot = 0      # Slot berisi frame terbaru
+        self._held_slot = None     # Slot yang sedang dibaca consumer
+        self._write_slot = 0
+        self._latest_seq = 1       # Nomor urut frame terbaru
+        self._consumed_seq = 0     # Nomor urut frame terakhir yang diambil consumer
+        self._capture_failed = False
+        self._pending_resolution = None  # (w, h) yang diterapkan thread capture
+        self._running = True
+        self._exited = False             # Thread capture sudah keluar dari loop
+        self._release_on_exit = False    # release() diserahkan ke thread capture
+        self._active = threading.Event()  # Di-clear oleh pause(): thread capture berhenti membaca
+        self._active.set()
+
+        self._thread = threading.Thread(target=self._capture_loop,
+                                        name='CameraCapture', daemon=True)
+        self._thread.start()
+
+    def _next_free_slot(self):
+        """
+        Memilih slot berikutnya yang tidak sedang dipakai
+        (bukan frame terbaru dan bukan slot yang dibaca consumer)
+
+        Returns:
+            Index slot ring buffer
+        """
+        n = len(self._buffer)
+        slot = self._write_slot
+        for _ in range(n):
+            slot = (slot + 1) % n
+            if slot != self._latest_slot and slot != self._held_slot:
+                break
+        self._write_slot = slot
+        return slot
+
+    def _capture_loop(self):
+        """Loop thread produser: baca frame langsung ke slot ring buffer"""
+        try:
+            self._capture_frames()
+        finally:
+            with self._lock:
+                self._exited = True
+                release = self._release_on_exit
+            if release:
+                # release() tidak bisa menunggu read() selesai: lepas dari sini
+                self.cap.release()
+
+    def _capture_frames(self):
+        while self._running:
+            if not self._active.is_set():
+                # Di-pause: tidak ada grab/decode sampai resume()
+                self._active.wait()
+                if not self._running:
+                    break
+                # Frame di antrian driver sudah basi selama pause, buang
+                self.cap.grab()
+
+            with self._lock:
+                resolution = self._pending_resolution
+                self._pending_resolution = None
+                slot = self._next_free_slot()
+                view = self._buffer[slot]
+
+            if resolution is not None:
+                # VideoCapture tidak thread-safe: set dari thread yang membaca
+                self._apply_resolution(*resolution)
+
+            success, frame = self.cap.read(view)
+
+            if not success:
+                with self._cond:
+                    self._capture_failed = True
+                    self._cond.notify_all()
+                break
+
+            with self._cond:
+                if frame is not view:
+                    # Backend mengalokasikan array sendiri, salin ke slot
+                    if frame.shape != view.shape:
+                        # Resolusi berubah: alokasi ulang ring buffer
+                        self._buffer = np.empty((len(self._buffer),) + frame.shape,
+                                                dtype=frame.dtype)
+                        view = self._buffer[slot]
+                    np.copyto(view, frame)
+
+                # Frame terbaru sebelumnya belum dibaca -> dibuang
+                if self._latest_seq > self._consumed_seq:
+                    self.dropped_frames += 1
+
+                self._latest_slot = slot
+                self._latest_seq += 1
+                self._cond.notify_all()
+
+    def read_frame(self, out=None):
         """
         Membaca frame dari webcam
-        
+
+        Pada mode threaded, menunggu frame yang lebih baru dari pembacaan
+        sebelumnya (maksimal CAMERA_READ_TIMEOUT), lalu mengembalikan frame terbaru
+
+        Args:
+            out: Buffer tujuan yang dipakai ulang (opsional, harus sesuai ukuran frame).
+                 Flip (jika mirror) ditulis langsung ke buffer ini tanpa alokasi
+
         Returns:
             Tuple: (success, frame)
             - success: Boolean, True jika berhasil
             - frame: Image array atau None
         """
-        success, frame = self.cap.read()
-        
-        if success:
-            # Flip horizontal untuk efek mirror (user experience)
-            frame = cv2.flip(frame, 1)
-        
-        return success, frame
-    
+        if not self.threaded:
+            if self.mirror:
+                success, frame = self.cap.read()
+                if success:
+                    # Flip horizontal untuk efek mirror (user experience)
+                    frame = cv2.flip(frame, 1, dst=out)
+            else:
+                success, frame = self.cap.read(out)
+
+            return success, frame
+
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest_seq > self._consumed_seq or self._capture_failed,
+                timeout=settings.CAMERA_READ_TIMEOUT
+            )
+
+            if self._latest_seq == self._consumed_seq:
+                if self._capture_failed:
+                    return False, None
+                # Tidak ada frame baru dalam batas waktu, pakai ulang frame terakhir
+                self.duplicate_frames += 1
+
+            self._consumed_seq = self._latest_seq
+            self._held_slot = self._latest_slot
+            source = self._buffer[self._held_slot]
+
+        # Flip horizontal untuk efek mirror, sekaligus menyalin keluar dari ring buffer
+        if self.mirror:
+            frame = cv2.flip(source, 1, dst=out)
+        elif out is not None and out.shape == source.shape:
+            np.copyto(out, source)
+            frame = out
+        else:
+            frame = source.copy()
+
+        with self._lock:
+            self._held_slot = None
+
+        return True, frame
+
+    def pause(self):
+        """
+        Menghentikan capture sementara (mode threaded), misalnya saat kursi kosong,
+        agar tidak ada grab + decode pada FPS penuh. Tidak berpengaruh pada mode
+        non-threaded (frame hanya dibaca saat read_frame dipanggil)
+        """
+        if self.threaded:
+            self._active.clear()
+
+    def resume(self):
+        """Melanjutkan capture; read_frame berikutnya menunggu frame baru"""
+        if self.threaded:
+            self._active.set()
+
+    @property
+    def paused(self):
+        return self.threaded and not self._active.is_set()
+
+    def _apply_resolution(self, width, height):
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def set_resolution(self, width, height):
+        """
+        Mengubah resolusi capture saat runtime
+
+        Pada mode threaded perubahan diterapkan oleh thread capture sebelum
+        pembacaan berikutnya; ring buffer dialokasikan ulang saat frame
+        berukuran baru pertama kali diterima
+
+        Args:
+            width, height: Resolusi yang diminta (driver bisa memilih yang terdekat)
+        """
+        if self.threaded:
+            with self._lock:
+                self._pending_resolution = (width, height)
+        else:
+            self._apply_resolution(width, height)
+
+    def get_stats(self):
+        """
+        Mendapatkan statistik capture
+
+        Returns:
+            Dict: jumlah frame yang ditangkap, dibuang, dan duplikat
+        """
+        captured = self._latest_seq if self.threaded else None
+        return {
+            'captured': captured,
+            'dropped': self.dropped_frames,
+            'duplicate': self.duplicate_frames,
+        }
+
     def is_opened(self):
         """
         Cek apakah kamera masih terbuka
-        
+
         Returns:
             Boolean
         """
+        if self.threaded and self._capture_failed:
+            return False
         return self.cap.isOpened()
-    
+
     def release(self):
-        """Release camera resource"""
+        """
+        Release camera resource
+
+        VideoCapture tidak boleh dilepas selagi thread capture masih di dalam
+        cap.read(); jika thread belum keluar dalam batas waktu, pelepasan
+        dilakukan oleh thread capture itu sendiri setelah read() kembali
+        """
+        if self._thread is not None:
+            self._running = False
+            self._active.set()  # Bangunkan thread yang sedang di-pause
+            self._thread.join(timeout=1.0)
+            self._thread = None
+            with self._lock:
+                if not self._exited:
+                    self._release_on_exit = True
+                    return
         self.cap.release()
-    
+
+    def get_device_id(self):
+        """
+        Identitas device kamera (untuk kunci cache kalibrasi)
+
+        Returns:
+            String nama device (Linux: /sys/class/video4linux), atau nama backend
+        """
+        sysfs_name = f"/sys/class/video4linux/video{self.camera_index}/name"
+        if os.path.exists(sysfs_name):
+            try:
+                with open(sysfs_name) as f:
+                    return f.read().strip()
+            except OSError:
+                pass
+        try:
+            return self.cap.getBackendName()
+        except cv2.error:
+            return 'unknown'
+
     def get_frame_dimensions(self):
         """
         Mendapatkan dimensi frame
-        
+
         Returns:
             Tuple: (width, height)
         """
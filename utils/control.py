@@ -0,0 +1,127 @@
+"""
+Modul kanal kontrol untuk mode daemon
+Perintah diterima lewat signal atau socket lokal (TCP 127.0.0.1),
+lalu diambil oleh loop utama secara non-blocking
+"""
+
+import json
+import queue
+import signal
+import socket
+import threading
+from config import settings
+
+# Perintah yang dikenali loop utama
+COMMANDS = ('status', 'pause', 'resume', 'recalibrate', 'preview on', 'preview off',
+            'preview toggle', 'stop')
+
+
+class ControlChannel:
+    """
+    Kelas untuk menerima perintah kontrol dari luar proses
+
+    - Signal: SIGTERM/SIGINT -> 'stop', SIGUSR1 -> 'preview toggle' (POSIX)
+    - Socket: satu perintah per baris, contoh:
+        echo status | nc 127.0.0.1 8765
+    """
+
+    def __init__(self, listen=True, host=None, port=None):
+        """
+        Args:
+            listen: True untuk membuka socket kontrol
+            host: Alamat bind (default settings.CONTROL_HOST)
+            port: Port TCP (default settings.CONTROL_PORT)
+        """
+        self.host = settings.CONTROL_HOST if host is None else host
+        self.port = settings.CONTROL_PORT if port is None else port
+
+        self._commands = queue.SimpleQueue()
+        self._status = {}
+        self._status_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+        if listen:
+            self._start_server()
+
+    def _start_server(self):
+        """Membuka socket kontrol dan menjalankan thread accept"""
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(4)
+
+        self._thread = threading.Thread(target=self._accept_loop,
+                                        name='ControlServer', daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self):
+        """Thread: menerima koneksi dan memproses perintah per baris"""
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                # Socket ditutup oleh close()
+                break
+            with conn:
+                conn.settimeout(2.0)
+                try:
+                    for line in conn.makefile('r'):
+                        conn.sendall((self._handle(line.strip().lower()) + "\n").encode())
+                except OSError:
+                    pass
+
+    def _handle(self, command):
+        """
+        Memproses satu perintah dari socket
+
+        Returns:
+            String balasan
+        """
+        if command == 'status':
+            with self._status_lock:
+                return json.dumps(self._status)
+        if command not in COMMANDS:
+            return f"error: perintah tidak dikenal '{command}'"
+        self._commands.put(command)
+        return "ok"
+
+    def install_signal_handlers(self):
+        """Memetakan signal ke perintah (dipanggil dari main thread)"""
+        def on_stop(signum, frame):
+            self._commands.put('stop')
+
+        signal.signal(signal.SIGTERM, on_stop)
+        signal.signal(signal.SIGINT, on_stop)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self._commands.put('preview toggle'))
+
+    def poll(self):
+        """
+        Mengambil semua perintah yang menunggu (non-blocking)
+
+        Returns:
+            List perintah
+        """
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def update_status(self, status):
+        """
+        Memperbarui status yang dilaporkan perintah 'status'
+
+        Args:
+            status: Dict berisi nilai sederhana (angka / string / bool)
+        """
+        with self._status_lock:
+            self._status = status
+
+    def close(self):
+        """Menutup socket kontrol"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
@@ -0,0 +1,325 @@
+"""
+Modul riwayat jarak jangka panjang berbasis memory-mapped file
+Ring buffer sampel mentah + rollup per detik, per menit dan per jam
+yang diperbarui secara inkremental
+"""
+
+import math
+import os
+import time
+import numpy as np
+from config import settings
+from .event_log import STATE_CODES, status_fields
+
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', '<f8'),   # Waktu epoch (detik)
+    ('ipd', '<f4'),         # IPD wajah terdekat (pixel)
+    ('distance', '<f4'),    # Jarak wajah terdekat (cm)
+    ('state', 'u1'),        # Index di event_log.STATES
+    ('reserved', 'u1', (7,)),
+])
+
+AGGREGATE_DTYPE = np.dtype([
+    ('start', '<f8'),             # Awal bucket (epoch, kelipatan resolusi)
+    ('samples', '<u4'),           # Jumlah sampel
+    ('measured', '<u4'),          # Jumlah sampel dengan jarak valid
+    ('observed_s', '<f4'),        # Detik monitoring aktif (selain paused)
+    ('measured_s', '<f4'),        # Detik dengan jarak terukur (safe / too_close)
+    ('too_close_s', '<f4'),       # Detik terlalu dekat
+    ('distance_sum', '<f8'),      # Jumlah jarak (untuk rata-rata)
+    ('distance_min', '<f4'),
+    ('distance_max', '<f4'),
+])
+
+# Resolusi rollup dalam detik
+RESOLUTIONS = (1, 60, 3600)
+
+_MAGIC = 0x4559454849535431  # 'EYEHIST1'
+_HEADER_FIELDS = 8           # magic, versi, 4 kapasitas, head & jumlah sampel mentah
+_VERSION = 1
+
+_SAFE = STATE_CODES['safe']
+_TOO_CLOSE = STATE_CODES['too_close']
+_PAUSED = STATE_CODES['paused']
+
+
+class DistanceHistory:
+    """
+    Kelas untuk menyimpan riwayat jarak sesi panjang dengan memori tetap
+
+    Layout file: header int64, ring sampel mentah, lalu satu tabel per resolusi.
+    Tabel agregat dipetakan langsung: bucket dengan awal t disimpan di baris
+    (t // resolusi) % kapasitas, sehingga tulis dan baca O(1) tanpa pencarian.
+    Sampel diakumulasi per detik di memori; saat detik berganti, totalnya
+    ditulis ke tabel detik dan ditambahkan ke baris menit dan jam.
+
+    Contoh:
+        history.summary(now - 3600, now)['too_close_s'] / 60   # menit terlalu dekat, 1 jam terakhir
+        history.series(day_start, day_end, 3600)                # satu baris per jam
+    """
+
+    def __init__(self, enabled=None, path=None, raw_capacity=None, capacities=None,
+                 flush_interval=None):
+        """
+        Args:
+            enabled: Aktifkan riwayat (default settings.HISTORY_ENABLED)
+            path: File memory-mapped (default settings.HISTORY_FILE)
+            raw_capacity: Jumlah sampel mentah di ring buffer (default dari settings)
+            capacities: Jumlah bucket per resolusi (detik, menit, jam), default dari settings
+            flush_interval: Detik antar msync ke disk (default dari settings)
+        """
+        self.enabled = settings.HISTORY_ENABLED if enabled is None else enabled
+        self.path = settings.HISTORY_FILE if path is None else path
+        if raw_capacity is None:
+            raw_capacity = settings.HISTORY_RAW_CAPACITY
+        if capacities is None:
+            capacities = settings.HISTORY_AGGREGATE_CAPACITIES
+        self.flush_interval = (settings.HISTORY_FLUSH_INTERVAL
+                               if flush_interval is None else flush_interval)
+
+        self._last_flush = time.monotonic()
+        self._last_timestamp = None
+        self._last_code = None  # State sampel sebelumnya (pemilik selang waktu berikutnya)
+        self._second = None  # Akumulator detik berjalan (dict) atau None
+        self._mm = None
+        if self.enabled:
+            self._open(raw_capacity, tuple(capacities))
+
+    def _open(self, raw_capacity, capacities):
+        """Membuka file (atau membuat ulang jika layout berbeda) dan memetakan tabel"""
+        expected = [_MAGIC, _VERSION, raw_capacity, *capacities]
+        header_bytes = _HEADER_FIELDS * 8
+        size = (header_bytes + raw_capacity * SAMPLE_DTYPE.itemsize +
+                sum(capacities) * AGGREGATE_DTYPE.itemsize)
+
+        reuse = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) == size:
+            header = np.fromfile(self.path, dtype='<i8', count=_HEADER_FIELDS)
+            reuse = list(header[:len(expected)]) == expected
+
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode='r+' if reuse else 'w+',
+                             shape=(size,))
+        self._header = self._mm[:header_bytes].view('<i8')
+        if not reuse:
+            # File baru: memmap 'w+' sudah berisi nol (start bucket 0 = kosong)
+            self._header[:len(expected)] = expected
+
+        offset = header_bytes
+        end = offset + raw_capacity * SAMPLE_DTYPE.itemsize
+        self._raw = self._mm[offset:end].view(SAMPLE_DTYPE)
+        offset = end
+
+        self._tables = {}
+        for resolution, capacity in zip(RESOLUTIONS, capacities):
+            end = offset + capacity * AGGREGATE_DTYPE.itemsize
+            self._tables[resolution] = self._mm[offset:end].view(AGGREGATE_DTYPE)
+            offset = end
+
+    @property
+    def sample_count(self):
+        """Jumlah sampel mentah yang tersimpan (maksimal kapasitas ring)"""
+        return int(self._header[7]) if self._mm is not None else 0
+
+    def record(self, state, ipd=np.nan, distance=np.nan, timestamp=None):
+        """
+        Menambahkan satu sampel
+
+        Args:
+            state: Nama state (lihat event_log.STATES)
+            ipd: IPD wajah terdekat dalam pixel
+            distance: Jarak wajah terdekat dalam cm
+            timestamp: Waktu epoch (default time.time())
+        """
+        if not self.enabled:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        code = STATE_CODES[state]
+
+        # Ring buffer sampel mentah
+        head = int(self._header[6])
+        row = self._raw[head]
+        row['timestamp'] = timestamp
+        row['ipd'] = ipd
+        row['distance'] = distance
+        row['state'] = code
+        self._header[6] = (head + 1) % len(self._raw)
+        self._header[7] = min(int(self._header[7]) + 1, len(self._raw))
+
+        # Selang sejak sampel sebelumnya (dibatasi untuk celah panjang) adalah durasi
+        # state sampel sebelumnya: dikreditkan ke state itu, pada detik tempat selang dimulai
+        if self._last_timestamp is not None and self._second is not None:
+            dt = min(max(timestamp - self._last_timestamp, 0.0), settings.HISTORY_MAX_SAMPLE_GAP)
+            self._credit(self._second, self._last_code, dt)
+        self._last_timestamp = timestamp
+        self._last_code = code
+
+        second = math.floor(timestamp)
+        if self._second is not None and self._second['start'] != second:
+            self._close_second()
+        if self._second is None:
+            self._second = {'start': second, 'samples': 0, 'measured': 0, 'observed_s': 0.0,
+                            'measured_s': 0.0, 'too_close_s': 0.0, 'distance_sum': 0.0,
+                            'distance_min': math.inf, 'distance_max': -math.inf}
+
+        acc = self._second
+        acc['samples'] += 1
+        if code == _SAFE or code == _TOO_CLOSE:
+            acc['measured'] += 1
+            acc['distance_sum'] += distance
+            acc['distance_min'] = min(acc['distance_min'], distance)
+            acc['distance_max'] = max(acc['distance_max'], distance)
+
+    @staticmethod
+    def _credit(acc, code, dt):
+        """Menambahkan durasi dt detik dengan state code ke akumulator detik"""
+        if code != _PAUSED:
+            acc['observed_s'] += dt
+        if code == _SAFE or code == _TOO_CLOSE:
+            acc['measured_s'] += dt
+            if code == _TOO_CLOSE:
+                acc['too_close_s'] += dt
+
+    def record_status(self, status, timestamp=None):
+        """Menambahkan sampel dari dict status pipeline (lihat EventLog.record_status)"""
+        if not self.enabled:
+            return
+        state, ipd, distance, _ = status_fields(status)
+        self.record(state, ipd, distance, timestamp)
+
+    def _close_second(self):
+        """Menulis detik yang selesai ke tabel detik dan menambahkannya ke menit & jam"""
+        acc = self._second
+        self._second = None
+        for resolution, table in self._tables.items():
+            start = acc['start'] - acc['start'] % resolution
+            row = table[(start // resolution) % len(table)]
+            if row['start'] != start:
+                # Baris berisi bucket lama (sudah lewat kapasitas) atau kosong: reset
+                row['start'] = start
+                row['samples'] = 0
+                row['measured'] = 0
+                row['observed_s'] = 0.0
+                row['measured_s'] = 0.0
+                row['too_close_s'] = 0.0
+                row['distance_sum'] = 0.0
+                row['distance_min'] = np.inf
+                row['distance_max'] = -np.inf
+            row['samples'] += acc['samples']
+            row['measured'] += acc['measured']
+            row['observed_s'] += acc['observed_s']
+            row['measured_s'] += acc['measured_s']
+            row['too_close_s'] += acc['too_close_s']
+            row['distance_sum'] += acc['distance_sum']
+            row['distance_min'] = min(row['distance_min'], acc['distance_min'])
+            row['distance_max'] = max(row['distance_max'], acc['distance_max'])
+
+    def series(self, start, end, resolution):
+        """
+        Baris agregat per bucket untuk rentang waktu (misalnya grafik per jam)
+
+        Args:
+            start, end: Rentang waktu epoch [start, end)
+            resolution: 1, 60 atau 3600 detik
+
+        Returns:
+            Structured array AGGREGATE_DTYPE, satu baris per bucket (bucket tanpa
+            data atau di luar retensi berisi nol)
+        """
+        table = self._tables[resolution]
+        first = math.floor(start / resolution) * resolution
+        starts = np.arange(first, end, resolution, dtype=np.float64)
+        rows = table[(starts // resolution).astype(np.int64) % len(table)]
+        valid = rows['start'] == starts
+
+        result = np.zeros(len(starts), dtype=AGGREGATE_DTYPE)
+        result[valid] = rows[valid]
+        result['start'] = starts
+        result['distance_min'][~valid] = np.nan
+        result['distance_max'][~valid] = np.nan
+        return result
+
+    def summary(self, start, end):
+        """
+        Ringkasan rentang waktu dari sesedikit mungkin baris agregat
+
+        Rentang dipecah menjadi detik di tepi, menit, lalu jam penuh di tengah,
+        jadi query 8 jam membaca paling banyak ~8 baris jam + ~240 baris tepi.
+        Rentang dibulatkan ke detik penuh; detik yang sedang berjalan belum termasuk.
+
+        Returns:
+            Dict: samples, measured, observed_s, measured_s, too_close_s,
+                  mean_distance, min_distance, max_distance
+        """
+        if not self.enabled:
+            return None
+        rows = self._cover(math.floor(start), math.ceil(end), len(RESOLUTIONS) - 1)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=AGGREGATE_DTYPE)
+
+        measured = int(rows['measured'].sum())
+        return {
+            'samples': int(rows['samples'].sum()),
+            'measured': measured,
+            'observed_s': float(rows['observed_s'].sum()),
+            'measured_s': float(rows['measured_s'].sum()),
+            'too_close_s': float(rows['too_close_s'].sum()),
+            'mean_distance': float(rows['distance_sum'].sum() / measured) if measured else None,
+            'min_distance': float(np.nanmin(rows['distance_min'])) if measured else None,
+            'max_distance': float(np.nanmax(rows['distance_max'])) if measured else None,
+        }
+
+    def _cover(self, start, end, level):
+        """
+        Daftar potongan baris agregat yang menutupi [start, end) dengan bucket
+        sekasar mungkin (RESOLUTIONS[level] di tengah, resolusi lebih halus di tepi)
+        """
+        if start >= end:
+            return []
+        resolution = RESOLUTIONS[level]
+        if level == 0:
+            return [self.series(start, end, resolution)]
+
+        first = math.ceil(start / resolution) * resolution
+        last = math.floor(end / resolution) * resolution
+        if first >= last:
+            return self._cover(start, end, level - 1)
+        return (self._cover(start, first, level - 1) +
+                [self.series(first, last, resolution)] +
+                self._cover(last, end, level - 1))
+
+    def samples(self, start, end):
+        """
+        Sampel mentah dalam rentang waktu (hanya yang masih ada di ring buffer)
+
+        Returns:
+            Structured array SAMPLE_DTYPE urut waktu
+        """
+        count = self.sample_count
+        head = int(self._header[6])
+        if count < len(self._raw):
+            ordered = self._raw[:count]
+        else:
+            ordered = np.concatenate((self._raw[head:], self._raw[:head]))
+        mask = (ordered['timestamp'] >= start) & (ordered['timestamp'] < end)
+        return np.array(ordered[mask])
+
+    def maybe_flush(self, now=None):
+        """msync berkala agar data bertahan jika proses berhenti mendadak"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._last_flush = now
+            self._mm.flush()
+
+    def close(self):
+        """Tutup detik berjalan, msync, lalu lepas mapping"""
+        if self._mm is None:
+            return
+        if self._second is not None:
+            self._close_second()
+        self._mm.flush()
+        self._mm = None
+        self._raw = None
+        self._tables = {}
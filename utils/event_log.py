@@ -0,0 +1,230 @@
+"""
+Modul log event sesi dalam format biner record tetap
+Sampel jarak per frame dan transisi state dikumpulkan di buffer NumPy,
+ditulis ke file secara berkala, dan file dirotasi berdasarkan ukuran
+"""
+
+import os
+import struct
+import time
+import numpy as np
+from config import settings
+
+# Satu record = 24 byte
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),   # Waktu epoch (detik)
+    ('ipd', '<f4'),         # Jarak iris wajah terdekat (pixel), NaN jika tidak ada
+    ('distance', '<f4'),    # Jarak wajah terdekat (cm), NaN jika tidak ada
+    ('kind', 'u1'),         # KIND_SAMPLE atau KIND_TRANSITION
+    ('state', 'u1'),        # Index di STATES
+    ('faces', 'u1'),        # Jumlah wajah terdeteksi
+    ('reserved', 'u1', (5,)),
+])
+
+KIND_SAMPLE = 0
+KIND_TRANSITION = 1
+
+STATES = ('paused', 'calibrating', 'safe', 'too_close', 'no_face')
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+# Header file: magic, versi, ukuran record
+_MAGIC = b'EYELOG'
+_HEADER = struct.Struct('<6sHI4x')
+_VERSION = 1
+
+
+def status_fields(status):
+    """
+    Memetakan dict status pipeline (format main.py / AsyncPipeline) ke field record
+
+    Returns:
+        Tuple: (state, ipd, distance, faces) - state 'measuring' menjadi 'safe' / 'too_close'
+    """
+    state = status['state']
+    if state == 'measuring':
+        return (('safe' if status['is_safe'] else 'too_close'), status['ipd'],
+                status['distance'], len(status['track_ids']))
+    return state, status.get('ipd', np.nan), np.nan, int('ipd' in status)
+
+
+class EventLog:
+    """
+    Kelas untuk mencatat sampel jarak dan transisi state
+
+    record() hanya mengisi satu baris buffer yang sudah dialokasikan; I/O terjadi
+    saat buffer penuh atau flush_interval lewat, sebagai satu write berurutan
+    """
+
+    def __init__(self, enabled=None, path=None, buffer_records=None, flush_interval=None,
+                 max_bytes=None, backup_count=None):
+        """
+        Args:
+            enabled: Aktifkan log (default settings.EVENT_LOG_ENABLED)
+            path: File log (default settings.EVENT_LOG_FILE)
+            buffer_records: Jumlah record di buffer memori (default dari settings)
+            flush_interval: Detik antar flush ke file (default dari settings)
+            max_bytes: Ukuran file maksimal sebelum dirotasi (default dari settings)
+            backup_count: Jumlah file rotasi yang disimpan (path.1 ... path.N)
+        """
+        self.enabled = settings.EVENT_LOG_ENABLED if enabled is None else enabled
+        self.path = settings.EVENT_LOG_FILE if path is None else path
+        if buffer_records is None:
+            buffer_records = settings.EVENT_LOG_BUFFER_RECORDS
+        self.flush_interval = (settings.EVENT_LOG_FLUSH_INTERVAL
+                               if flush_interval is None else flush_interval)
+        self.max_bytes = settings.EVENT_LOG_MAX_BYTES if max_bytes is None else max_bytes
+        self.backup_count = (settings.EVENT_LOG_BACKUP_COUNT
+                             if backup_count is None else backup_count)
+
+        self._buffer = np.zeros(buffer_records, dtype=RECORD_DTYPE)
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self._last_state = None
+        self._file = None
+
+        # Statistik
+        self.records_written = 0
+        self.rotations = 0
+
+    def _append(self, timestamp, kind, state, ipd, distance, faces):
+        row = self._buffer[self._count]
+        row['timestamp'] = timestamp
+        row['kind'] = kind
+        row['state'] = state
+        row['ipd'] = ipd
+        row['distance'] = distance
+        row['faces'] = faces
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def record(self, state, ipd=np.nan, distance=np.nan, faces=0, timestamp=None):
+        """
+        Mencatat satu sampel; jika state berubah, transisi juga dicatat
+
+        Args:
+            state: Nama state (lihat STATES)
+            ipd: IPD wajah terdekat dalam pixel
+            distance: Jarak wajah terdekat dalam cm
+            faces: Jumlah wajah
+            timestamp: Waktu epoch (default time.time())
+        """
+        if not self.enabled:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        code = STATE_CODES[state]
+
+        if code != self._last_state:
+            self._last_state = code
+            self._append(timestamp, KIND_TRANSITION, code, ipd, distance, faces)
+        self._append(timestamp, KIND_SAMPLE, code, ipd, distance, faces)
+
+    def record_status(self, status, timestamp=None):
+        """
+        Mencatat dict status pipeline (format status main.py / AsyncPipeline)
+
+        Args:
+            status: Dict status, state 'measuring' dipetakan ke 'safe' / 'too_close'
+            timestamp: Waktu epoch (default time.time())
+        """
+        if not self.enabled:
+            return
+        self.record(*status_fields(status), timestamp)
+
+    def _open(self):
+        """Membuka file log (header ditulis jika file baru)"""
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, RECORD_DTYPE.itemsize))
+
+    def _rotate(self):
+        """Rotasi file: path -> path.1 -> ... -> path.N (yang tertua dihapus)"""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def flush(self):
+        """Menulis isi buffer ke file (rotasi dulu jika ukuran akan melewati max_bytes)"""
+        self._last_flush = time.monotonic()
+        if not self.enabled or self._count == 0:
+            return
+
+        if self._file is None:
+            self._open()
+        size = self._count * RECORD_DTYPE.itemsize
+        if self.max_bytes and self._file.tell() > _HEADER.size and \
+                self._file.tell() + size > self.max_bytes:
+            self._rotate()
+            self._open()
+
+        self._file.write(self._buffer[:self._count].tobytes())
+        self._file.flush()
+        self.records_written += self._count
+        self._count = 0
+
+    def maybe_flush(self, now=None):
+        """Flush jika flush_interval sudah lewat"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def close(self):
+        """Flush sisa buffer dan tutup file"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_event_log(path, include_rotated=True):
+    """
+    Membaca log event menjadi structured array NumPy
+
+    Args:
+        path: File log
+        include_rotated: Sertakan file rotasi (path.N ... path.1), urut dari yang tertua
+
+    Returns:
+        Structured array dengan dtype RECORD_DTYPE
+
+    Contoh:
+        events = read_event_log('session_events.bin')
+        samples = events[events['kind'] == KIND_SAMPLE]
+        too_close = samples['state'] == STATE_CODES['too_close']
+    """
+    paths = []
+    if include_rotated:
+        index = 1
+        while os.path.exists(f"{path}.{index}"):
+            paths.append(f"{path}.{index}")
+            index += 1
+        paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+
+    chunks = []
+    for file_path in paths:
+        with open(file_path, 'rb') as f:
+            magic, version, record_size = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or record_size != RECORD_DTYPE.itemsize:
+                raise ValueError(f"Format log event tidak dikenal: {file_path}")
+            data = f.read()
+        # Abaikan record terakhir yang terpotong (misalnya proses dihentikan paksa)
+        usable = len(data) - len(data) % RECORD_DTYPE.itemsize
+        chunks.append(np.frombuffer(data[:usable], dtype=RECORD_DTYPE))
+
+    if not chunks:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.concatenate(chunks)
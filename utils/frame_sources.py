@@ -0,0 +1,78 @@
+"""
+Modul sumber frame dari rekaman (video file atau direktori gambar)
+Dipakai mode analisis batch tanpa kamera dan tanpa display
+"""
+
+import os
+import cv2
+from config import settings
+
+def iter_video_frames(path):
+    """
+    Membaca frame dari file video
+
+    Args:
+        path: Path file video
+
+    Yields:
+        Tuple: (index_frame, timestamp_detik, frame_bgr)
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Gagal membuka video: {path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or settings.BATCH_IMAGE_FPS
+    index = 0
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if timestamp <= 0 and index > 0:
+                # Beberapa backend tidak mengisi POS_MSEC, hitung dari FPS
+                timestamp = index / fps
+            yield index, timestamp, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def iter_image_dir(path, fps=None):
+    """
+    Membaca gambar dari direktori (urut nama file) sebagai rangkaian frame
+
+    Args:
+        path: Path direktori
+        fps: Frame rate untuk menghitung timestamp (default dari settings)
+
+    Yields:
+        Tuple: (index_file, timestamp_detik, frame_bgr) - index dan timestamp mengikuti
+        posisi file dalam direktori, sehingga file yang tidak terbaca tidak menggeser
+        frame berikutnya
+    """
+    if fps is None:
+        fps = settings.BATCH_IMAGE_FPS
+
+    names = sorted(name for name in os.listdir(path)
+                   if os.path.splitext(name)[1].lower() in settings.IMAGE_EXTENSIONS)
+    for index, name in enumerate(names):
+        frame = cv2.imread(os.path.join(path, name))
+        if frame is None:
+            continue
+        yield index, index / fps, frame
+
+
+def iter_frames(path):
+    """
+    Memilih pembaca frame berdasarkan jenis path
+
+    Args:
+        path: File video atau direktori gambar
+
+    Yields:
+        Tuple: (index_frame, timestamp_detik, frame_bgr)
+    """
+    if os.path.isdir(path):
+        return iter_image_dir(path)
+    return iter_video_frames(path)
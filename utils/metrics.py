@@ -0,0 +1,292 @@
+"""
+Modul instrumentasi hot path dengan overhead rendah
+Timer per tahap, histogram streaming untuk persentil, counter, gauge,
+dan flush periodik ke file JSON atau Prometheus text
+"""
+
+import json
+import math
+import os
+import time
+import numpy as np
+from config import settings
+
+class StreamingHistogram:
+    """
+    Histogram dengan bucket logaritmik tetap (memori konstan)
+
+    Persentil rolling: dua histogram (jendela sekarang dan sebelumnya) yang
+    dirotasi setiap `window` detik, sehingga persentil mencerminkan 1-2 jendela terakhir
+    """
+
+    # Bucket 0.01 ms .. ~100 s dengan rasio 1.1 (error relatif persentil <= 5%)
+    MIN_VALUE = 0.01
+    RATIO = 1.1
+    NUM_BUCKETS = 170
+
+    def __init__(self, window=None):
+        if window is None:
+            window = settings.METRICS_WINDOW
+        self.window = window
+        self._current = np.zeros(self.NUM_BUCKETS, dtype=np.int64)
+        self._previous = np.zeros(self.NUM_BUCKETS, dtype=np.int64)
+        self._rotated_at = time.monotonic()
+        self._log_ratio = math.log(self.RATIO)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value):
+        """Mencatat satu sampel (ms)"""
+        if value <= self.MIN_VALUE:
+            index = 0
+        else:
+            index = min(self.NUM_BUCKETS - 1,
+                        int(math.log(value / self.MIN_VALUE) / self._log_ratio) + 1)
+        self._current[index] += 1
+        self.count += 1
+        self.total += value
+
+    def rotate(self, now):
+        """Geser jendela rolling jika sudah lewat `window` detik"""
+        if now - self._rotated_at >= self.window:
+            self._previous, self._current = self._current, self._previous
+            self._current[:] = 0
+            self._rotated_at = now
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        """
+        Persentil dari jendela rolling
+
+        Returns:
+            List nilai (ms) per quantile, None jika belum ada sampel
+        """
+        counts = self._current + self._previous
+        total = counts.sum()
+        if total == 0:
+            return [None] * len(quantiles)
+        cumulative = np.cumsum(counts)
+        values = []
+        for q in quantiles:
+            index = int(np.searchsorted(cumulative, q * total))
+            # Nilai tengah (geometrik) bucket
+            values.append(self.MIN_VALUE * self.RATIO ** max(0, index - 0.5))
+        return values
+
+
+class _Timer:
+    """Context manager timer yang dipakai ulang per nama tahap"""
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.record((time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class _NullTimer:
+    """Timer kosong saat instrumentasi dimatikan"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Registry metrik aplikasi
+
+    Contoh:
+        with metrics.timer('detect_face'):
+            results = face_detector.detect_face(rgb_frame)
+        metrics.count('frames')
+        metrics.maybe_flush()
+    """
+
+    def __init__(self, enabled=None, path=None, fmt=None, flush_interval=None):
+        """
+        Args:
+            enabled: Aktifkan instrumentasi (default settings.METRICS_ENABLED)
+            path: File output metrik (default settings.METRICS_FILE)
+            fmt: 'json' atau 'prometheus' (default settings.METRICS_FORMAT)
+            flush_interval: Detik antar flush ke file (default dari settings)
+        """
+        self.enabled = settings.METRICS_ENABLED if enabled is None else enabled
+        self.path = settings.METRICS_FILE if path is None else path
+        self.format = settings.METRICS_FORMAT if fmt is None else fmt
+        self.flush_interval = (settings.METRICS_FLUSH_INTERVAL
+                               if flush_interval is None else flush_interval)
+
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._timers = {}
+
+        self._started_at = time.monotonic()
+        self._last_flush = self._started_at
+        self._fps_frames = 0
+        self._fps_since = self._started_at
+        self.fps = 0.0
+
+    def timer(self, name):
+        """
+        Timer untuk satu tahap (hasil dicatat ke histogram `name`, dalam ms)
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = _Timer(self._histogram(name))
+            self._timers[name] = timer
+        return timer
+
+    def _histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = StreamingHistogram()
+            self.histograms[name] = histogram
+        return histogram
+
+    def observe(self, name, value_ms):
+        """Mencatat sampel latensi yang diukur di luar timer()"""
+        if self.enabled:
+            self._histogram(name).record(value_ms)
+
+    def count(self, name, amount=1):
+        """Menambah counter"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """Mengatur nilai gauge"""
+        if self.enabled:
+            self.gauges[name] = value
+
+    def tick_frame(self, now=None):
+        """Menandai satu iterasi loop selesai (untuk FPS efektif)"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.monotonic()
+        self._fps_frames += 1
+        self.counters['frames_total'] = self.counters.get('frames_total', 0) + 1
+        elapsed = now - self._fps_since
+        if elapsed >= 1.0:
+            self.fps = self._fps_frames / elapsed
+            self._fps_frames = 0
+            self._fps_since = now
+            self.gauges['fps'] = self.fps
+
+    def latency(self, name, quantile=0.5):
+        """Persentil latensi tahap tertentu (ms), None jika belum ada data"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            return None
+        return histogram.percentiles((quantile,))[0]
+
+    def snapshot(self):
+        """
+        Returns:
+            Dict: semua metrik saat ini (siap ditulis sebagai JSON)
+        """
+        stages = {}
+        for name, histogram in self.histograms.items():
+            p50, p95, p99 = histogram.percentiles()
+            stages[name] = {
+                'count': histogram.count,
+                'mean_ms': histogram.total / histogram.count if histogram.count else None,
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99,
+            }
+        return {
+            'timestamp': time.time(),
+            'uptime_s': time.monotonic() - self._started_at,
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'latency': stages,
+        }
+
+    def _format_prometheus(self, snapshot):
+        """Format Prometheus text exposition"""
+        lines = []
+        for name, value in snapshot['counters'].items():
+            lines.append(f"# TYPE eye_monitor_{name} counter")
+            lines.append(f"eye_monitor_{name} {value}")
+        for name, value in snapshot['gauges'].items():
+            lines.append(f"# TYPE eye_monitor_{name} gauge")
+            lines.append(f"eye_monitor_{name} {value}")
+        lines.append("# TYPE eye_monitor_stage_latency_ms summary")
+        for stage, stats in snapshot['latency'].items():
+            for q, key in ((0.5, 'p50_ms'), (0.95, 'p95_ms'), (0.99, 'p99_ms')):
+                if stats[key] is not None:
+                    lines.append(f'eye_monitor_stage_latency_ms{{stage="{stage}",quantile="{q}"}} '
+                                 f'{stats[key]:.4f}')
+            lines.append(f'eye_monitor_stage_latency_ms_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Menulis metrik saat ini ke file"""
+        if not self.enabled or not self.path:
+            return
+        self.write(self.snapshot())
+
+    def write(self, snapshot):
+        """
+        Menulis snapshot ke file secara atomik (tulis ke .tmp lalu rename)
+
+        Hanya menyentuh snapshot (bukan registry), sehingga aman dijalankan di
+        thread lain selagi metrik terus dicatat
+
+        Args:
+            snapshot: Dict dari snapshot() / prepare_flush()
+        """
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            if self.format == 'prometheus':
+                f.write(self._format_prometheus(snapshot))
+            else:
+                json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def prepare_flush(self, now=None):
+        """
+        Rotasi jendela histogram dan ambil snapshot jika sudah waktunya flush
+        (dipanggil dari thread yang mencatat metrik)
+
+        Returns:
+            Dict snapshot untuk write(), atau None jika belum waktunya
+        """
+        if not self.enabled:
+            return None
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_flush < self.flush_interval:
+            return None
+        self._last_flush = now
+        for histogram in self.histograms.values():
+            histogram.rotate(now)
+        return self.snapshot()
+
+    def maybe_flush(self, now=None):
+        """Rotasi jendela histogram dan flush jika sudah waktunya"""
+        snapshot = self.prepare_flush(now)
+        if snapshot is not None:
+            self.write(snapshot)
@@ -0,0 +1,88 @@
+"""
+Modul preprocessing frame tanpa alokasi (buffer output dipakai ulang)
+Mirror + konversi warna dalam pass sesedikit mungkin
+"""
+
+import cv2
+import numpy as np
+from config import settings
+
+class FramePreprocessor:
+    """
+    Kelas untuk membaca frame kamera dan menyiapkan input MediaPipe ke buffer
+    yang dialokasikan sekali (steady state tanpa alokasi array frame baru)
+
+    Strategi mirror (settings.MIRROR_STRATEGY):
+    - 'frame': flip dilakukan saat menyalin keluar dari ring buffer kamera
+      (flip + copy dalam satu pass), lalu BGR->RGB (pass kedua)
+    - 'landmarks': frame tidak di-flip sama sekali; koordinat x landmark
+      dibalik setelah inferensi (x -> 1 - x) dan preview yang membalik
+      gambar hanya saat dirender
+    """
+
+    def __init__(self, camera, strategy=None):
+        """
+        Args:
+            camera: Objek Camera (atribut mirror diatur sesuai strategi)
+            strategy: 'frame' atau 'landmarks' (default settings.MIRROR_STRATEGY)
+        """
+        if strategy is None:
+            strategy = settings.MIRROR_STRATEGY
+        if strategy not in ('frame', 'landmarks'):
+            raise ValueError(f"Strategi mirror tidak dikenal: {strategy}")
+
+        self.camera = camera
+        self.strategy = strategy
+        self.camera.mirror = strategy == 'frame'
+
+        self._frame = None  # Buffer BGR (tampilan / scheduler)
+        self._rgb = None    # Buffer RGB (input MediaPipe)
+
+    @property
+    def display_mirrored(self):
+        """True jika preview harus membalik frame sendiri sebelum ditampilkan"""
+        return self.strategy == 'landmarks'
+
+    def read(self):
+        """
+        Membaca frame kamera ke buffer BGR yang dipakai ulang
+
+        Returns:
+            Tuple: (success, frame) - frame adalah buffer internal, isinya
+                   ditimpa pada pemanggilan read() berikutnya
+        """
+        success, frame = self.camera.read_frame(out=self._frame)
+        if success and frame is not self._frame:
+            # Pemanggilan pertama / resolusi berubah: simpan buffer baru
+            self._frame = frame
+        return success, frame
+
+    def to_rgb(self, frame):
+        """
+        Konversi BGR -> RGB ke buffer yang dipakai ulang
+
+        Returns:
+            Buffer RGB contiguous (siap untuk mp.Image)
+        """
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    def fix_landmarks(self, results):
+        """
+        Membalik koordinat x landmark pada strategi 'landmarks' agar hasilnya
+        sama dengan inferensi pada frame yang di-mirror
+
+        Args:
+            results: FaceLandmarksResult atau None
+
+        Returns:
+            FaceLandmarksResult dalam koordinat mirror (objek baru, hasil
+            async yang sama bisa dikembalikan detector lebih dari sekali)
+        """
+        if results is None or self.strategy != 'landmarks':
+            return results
+        landmarks = results.landmarks.copy()
+        np.subtract(1.0, landmarks[..., 0], out=landmarks[..., 0])
+        return type(results)(landmarks)
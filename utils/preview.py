@@ -0,0 +1,123 @@
+"""
+Modul preview jendela kamera sebagai subscriber opsional
+Menggambar overlay dan memanggil imshow/waitKey hanya pada laju PREVIEW_FPS,
+sehingga loop deteksi tidak terbebani GUI
+"""
+
+import time
+import cv2
+from config import settings
+from modules import ImageProcessor
+
+class PreviewSubscriber:
+    """
+    Kelas untuk menampilkan preview dengan laju sendiri
+
+    Loop utama memanggil publish() setiap frame (murah: hanya menyimpan referensi),
+    lalu render_if_due() yang hanya menggambar jika interval preview sudah lewat
+    """
+
+    WINDOW_NAME = 'Monitor Jarak Mata - Informatika'
+
+    def __init__(self, fps=None, mirror=False):
+        """
+        Args:
+            fps: Laju render preview (default settings.PREVIEW_FPS)
+            mirror: True jika frame yang dipublish belum di-flip
+                    (strategi mirror 'landmarks'), flip dilakukan saat render
+        """
+        if fps is None:
+            fps = settings.PREVIEW_FPS
+        self.interval = 1.0 / fps
+        self.show_metrics = settings.SHOW_METRICS_OVERLAY
+        self.mirror = mirror
+
+        self._frame = None
+        self._display = None  # Buffer flip, dipakai ulang antar render
+        self._status = None
+        self._last_render = None
+
+    def publish(self, frame, status):
+        """
+        Menerima frame terbaru dan status pipeline
+
+        Args:
+            frame: Frame BGR (tidak disalin; buffer boleh dipakai ulang pemanggil
+                   setelah render_if_due)
+            status: Dict status (state, distance, is_safe, iris, kalibrasi, fps, ...)
+        """
+        self._frame = frame
+        self._status = status
+
+    def _draw(self, frame, status):
+        """Menggambar overlay sesuai state pipeline"""
+        state = status['state']
+
+        if state == 'calibrating':
+            current, total, percentage = status['calibration']
+            cv2.putText(frame, f'Kalibrasi: {current}/{total} ({percentage:.0f}%)',
+                        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7,
+                        (255, 255, 0), 2)
+        elif state == 'measuring':
+            # Jarak wajah terdekat di pojok kiri atas
+            frame = ImageProcessor.add_distance_info(frame, status['distance'], status['is_safe'])
+            
+            # Iris dan label jarak setiap wajah yang dilacak
+            for left, right, distance, track_id in zip(status['left_centers'], status['right_centers'],
+                                                       status['face_distances'], status['track_ids']):
+                frame = ImageProcessor.draw_iris_visualization(frame, left, right)
+                if len(status['track_ids']) > 1:
+                    x, y = left.astype(int)
+                    cv2.putText(frame, f'#{track_id} {distance:.0f} cm', (x, max(15, y - 15)),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, settings.LINE_COLOR, 1)
+        elif state == 'no_face':
+            cv2.putText(frame, 'Wajah tidak terdeteksi', (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        elif state == 'paused':
+            cv2.putText(frame, 'Monitoring dijeda', (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+        if self.show_metrics:
+            frame = ImageProcessor.add_metrics_overlay(frame, status['fps'], status['latency_ms'])
+
+        return frame
+
+    def render_if_due(self, now=None):
+        """
+        Render preview jika interval sudah lewat
+
+        Args:
+            now: Waktu saat ini (default time.monotonic())
+
+        Returns:
+            Kode tombol dari waitKey (0xFF jika tidak ada), atau None jika tidak render
+        """
+        if self._frame is None:
+            return None
+        if now is None:
+            now = time.monotonic()
+        if self._last_render is not None and now - self._last_render < self.interval:
+            return None
+        self._last_render = now
+
+        frame = self._frame
+        if self.mirror:
+            if self._display is None or self._display.shape != frame.shape:
+                self._display = frame.copy()
+            frame = cv2.flip(frame, 1, dst=self._display)
+        frame = self._draw(frame, self._status)
+        self._frame = None
+
+        cv2.imshow(self.WINDOW_NAME, frame)
+        key = cv2.waitKey(1) & 0xFF
+
+        if key == ord('m'):
+            self.show_metrics = not self.show_metrics
+        return key
+
+    def close(self):
+        """Menutup jendela preview"""
+        try:
+            cv2.destroyWindow(self.WINDOW_NAME)
+        except cv2.error:
+            pass
@@ -0,0 +1,103 @@
+"""
+Modul buffer frame di shared memory antar proses
+Frame tidak di-pickle: writer menyalin ke shared memory, reader menyalin keluar
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedFrameBuffer:
+    """
+    Ring buffer frame di multiprocessing.shared_memory dengan seqlock per slot
+
+    Layout: header int64 [latest_slot, latest_seq, seq_slot_0..seq_slot_n-1]
+            diikuti n slot frame uint8 berukuran `shape`
+
+    Writer tunggal menulis ke slot berikutnya (seq ganjil = sedang ditulis),
+    reader mengulang salinan jika seq slot berubah selama menyalin
+    """
+
+    def __init__(self, shape, name=None, create=False, num_slots=3):
+        """
+        Args:
+            shape: Bentuk frame (height, width, 3)
+            name: Nama shared memory (wajib jika create=False)
+            create: True untuk membuat segmen baru (proses supervisor)
+            num_slots: Jumlah slot ring buffer
+        """
+        self.shape = tuple(shape)
+        self.num_slots = num_slots
+        frame_bytes = int(np.prod(self.shape))
+        header_bytes = 8 * (2 + num_slots)
+
+        if create:
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=header_bytes + frame_bytes * num_slots
+            )
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._owner = create
+
+        self._header = np.ndarray((2 + num_slots,), dtype=np.int64, buffer=self.shm.buf)
+        self._frames = np.ndarray((num_slots,) + self.shape, dtype=np.uint8,
+                                  buffer=self.shm.buf, offset=header_bytes)
+        if create:
+            self._header[:] = 0
+            self._header[0] = -1  # Belum ada frame
+
+    def write(self, frame):
+        """
+        Menulis frame ke slot berikutnya (hanya dari satu proses writer)
+
+        Args:
+            frame: Image array uint8 dengan bentuk `shape`
+        """
+        slot = (int(self._header[0]) + 1) % self.num_slots
+        seq_index = 2 + slot
+
+        self._header[seq_index] += 1  # Ganjil: sedang ditulis
+        np.copyto(self._frames[slot], frame)
+        self._header[seq_index] += 1  # Genap: selesai
+
+        self._header[0] = slot
+        self._header[1] += 1
+
+    def read(self, out=None, retries=5):
+        """
+        Menyalin frame terbaru
+
+        Args:
+            out: Array tujuan (opsional, dipakai ulang)
+            retries: Jumlah percobaan jika slot sedang ditulis
+
+        Returns:
+            Tuple: (seq, frame) atau (0, None) jika belum ada frame
+        """
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+
+        for _ in range(retries):
+            slot = int(self._header[0])
+            if slot < 0:
+                return 0, None
+            seq = int(self._header[1])
+            seq_index = 2 + slot
+
+            before = int(self._header[seq_index])
+            if before % 2:
+                continue
+            np.copyto(out, self._frames[slot])
+            if int(self._header[seq_index]) == before:
+                return seq, out
+
+        return 0, None
+
+    def close(self):
+        """Melepas mapping (dan menghapus segmen jika pemilik)"""
+        # Lepas view NumPy sebelum menutup shared memory
+        del self._header
+        del self._frames
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
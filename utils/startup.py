@@ -0,0 +1,96 @@
+"""
+Modul untuk mempercepat dan mengukur startup aplikasi
+Model dimuat di background thread paralel dengan pembukaan kamera
+"""
+
+import contextlib
+import threading
+import time
+
+class StartupProfiler:
+    """
+    Kelas pencatat durasi setiap fase startup dan milestone
+    (misalnya waktu hingga jarak pertama)
+    """
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start: Waktu awal (time.perf_counter), default saat objek dibuat
+        """
+        self._start = time.perf_counter() if start is None else start
+        self._lock = threading.Lock()
+        self.phases = []      # (nama, durasi detik)
+        self.milestones = {}  # nama -> detik sejak start
+
+    def record(self, name, seconds):
+        """Mencatat durasi fase yang diukur sendiri (thread-safe)"""
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager untuk mengukur satu fase
+
+        Contoh:
+            with profiler.phase('buka kamera'):
+                camera = Camera()
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def mark(self, name):
+        """Mencatat milestone (sekali saja) relatif terhadap waktu start"""
+        if name not in self.milestones:
+            self.milestones[name] = time.perf_counter() - self._start
+
+    def report(self):
+        """Menampilkan rincian waktu startup"""
+        print("Rincian waktu startup:")
+        with self._lock:
+            phases = list(self.phases)
+        for name, seconds in phases:
+            print(f"   {name:<28} {seconds * 1000:8.1f} ms")
+        for name, seconds in self.milestones.items():
+            print(f"   {name:<28} {seconds * 1000:8.1f} ms (sejak start)")
+
+
+class BackgroundLoader:
+    """
+    Menjalankan fungsi pembuatan objek berat (misalnya FaceDetector) di
+    background thread, hasil diambil dengan result()
+    """
+
+    def __init__(self, factory, name='BackgroundLoader'):
+        """
+        Args:
+            factory: Fungsi tanpa argumen yang mengembalikan objek
+            name: Nama thread
+        """
+        self._factory = factory
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._result = self._factory()
+        except Exception as e:
+            self._error = e
+
+    def result(self):
+        """
+        Menunggu hingga selesai
+
+        Returns:
+            Objek hasil factory (exception di thread dilempar ulang di sini)
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result